@@ -0,0 +1,74 @@
+"""
+Benchmark "deliverables of task X" on a generated deliverables.yaml: the
+link index (`tracklet.data_access.links`) built cold, loaded from its
+sidecar and held in memory, and DeliverableStore.linked_to on an unloaded
+store (index lookup plus the snapshot chunks holding the matches), against
+scanning every deliverable.
+
+    python scripts/bench_links.py --deliverables 100000 --tasks 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["TRACKLET_SNAPSHOT"] = "1"  # linked_to reads only the snapshot chunks it needs
+
+from tracklet.data_access import codec, links
+from tracklet.data_access.file_io import iter_deliverables
+from tracklet.data_access.store import DeliverableStore
+
+
+def make_deliverables(count, tasks):
+    return {"deliverables": [{
+        "id": f"deliverable-{i}",
+        "title": f"Deliverable {i}",
+        "status": ("todo", "in_progress", "completed")[i % 3],
+        "due_date": None,
+        "related_task_id": f"task-{i % tasks}" if i % 5 else None,
+    } for i in range(count)]}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deliverables", type=int, default=100_000, help="Number of synthetic deliverables")
+    parser.add_argument("--tasks", type=int, default=20_000, help="Number of tasks they link to")
+    args = parser.parse_args()
+    task_id = "task-7"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "deliverables.yaml")
+        codec.dump_file(path, make_deliverables(args.deliverables, args.tasks))
+
+        scan_time, scanned = timed(lambda: sorted(
+            d["id"] for d in iter_deliverables(path) if d.get("related_task_id") == task_id))
+        cold_time, _ = timed(links.get_link_index, path)  # parses the file and writes the sidecar
+        links._link_cache.clear()
+        sidecar_time, index = timed(links.get_link_index, path)
+        memory_time, found = timed(lambda: sorted(links.get_link_index(path).deliverables_for(task_id)))
+        links._link_cache.clear()
+        store_time, records = timed(lambda: DeliverableStore(path).linked_to(task_id))
+
+    print(f"{args.deliverables} deliverables, {len(index)} linked")
+    print(f"scan deliverables:      {scan_time * 1000:9.1f} ms")
+    print(f"build link index:       {cold_time * 1000:9.1f} ms")
+    print(f"load link index:        {sidecar_time * 1000:9.1f} ms")
+    print(f"lookup (index in memory): {memory_time * 1000:7.3f} ms")
+    print(f"linked_to, cold store:  {store_time * 1000:9.1f} ms")
+    same = found == scanned == sorted(d["id"] for d in records)
+    print("results match" if same else "RESULTS DIFFER")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Benchmark `project search` filtering through the workspace index (postings
+and trigrams) against the per-project linear scan, on a generated
+workspace, and check that both return the same projects.
+
+    python scripts/bench_project_search.py --projects 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracklet.data_access import codec
+from tracklet.data_access.tracker import find_projects, search_projects
+
+WORDS = "alpha beta gamma delta omega python rust web mobile data api cli".split()
+QUERIES = [
+    ({"tag": ["python"]}, {}),
+    ({"tag": ["python", "rust"], "stage": ["Testing"]}, {"tag": ["web"]}),
+    ({"name": ["omega 1"]}, {"author": ["dan"]}),
+    ({"description": ["ta ga"]}, {}),
+    ({}, {"tag": ["api"]}),
+]
+
+
+def make_workspace(base, count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        path = os.path.join(base, f"p{i}")
+        os.makedirs(path)
+        codec.dump_file(os.path.join(path, ".projectmeta"), {
+            "name": f"Project {rng.choice(WORDS)} {i}",
+            "author": rng.choice(["Dan", "ann", "Bob Smith"]),
+            "description": " ".join(rng.choices(WORDS, k=6)),
+            "tags": rng.sample(WORDS, 3),
+            "progress": {"stage": rng.choice(["Planning", "Development", "Testing"])},
+        })
+
+
+def timed(base, projects, include, exclude, use_index):
+    os.environ["TRACKLET_NO_INDEX"] = "0" if use_index else "1"
+    start = time.perf_counter()
+    result = search_projects(base, projects, include, exclude)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base:
+        make_workspace(base, args.projects)
+        projects = find_projects(base)  # builds the index
+        print(f"{len(projects)} projects")
+        for include, exclude in QUERIES:
+            indexed, index_time = timed(base, projects, include, exclude, True)
+            scanned, scan_time = timed(base, projects, include, exclude, False)
+            if indexed != scanned:
+                sys.exit(f"Mismatch for {include} / {exclude}: {len(indexed)} vs {len(scanned)} projects")
+            print(f"{len(indexed):6d} matches  index {index_time * 1000:6.1f} ms  "
+                  f"scan {scan_time * 1000:6.1f} ms  {include} -{exclude}")
+    print("results match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark reading a generated tasks.yaml through its binary snapshot
+(`tracklet.data_access.snapshot`) against parsing the YAML, and check
+that both return the same document.
+
+    python scripts/bench_snapshot.py --tasks 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["TRACKLET_SNAPSHOT"] = "1"
+
+from tracklet.data_access import codec, snapshot
+
+
+def make_tasks(count):
+    return {"tasks": [{
+        "id": f"task-{i}",
+        "title": f"Task {i}",
+        "description": "Generated for the snapshot benchmark",
+        "status": ("todo", "in_progress", "completed")[i % 3],
+        "priority": ("low", "medium", "high")[i % 3],
+        "assignees": [f"user{i % 25}"],
+        "tags": [f"tag{i % 40}"],
+        "due_date": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+    } for i in range(count)]}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000, help="Number of synthetic tasks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.yaml")
+        codec.dump_file(path, make_tasks(args.tasks))
+
+        yaml_time, expected = timed(codec.load_file, path)
+        build_time, _ = timed(snapshot.load_file, path)  # no snapshot yet: parses and writes one
+        snap_time, result = timed(snapshot.load_file, path)
+        first_time, _ = timed(lambda: next(snapshot.iter_items(path, "tasks")))
+        yaml_size = os.path.getsize(path)
+        snap_size = os.path.getsize(snapshot.get_snapshot_path(path))
+
+    print(f"{args.tasks} tasks, YAML {yaml_size / 1e6:.1f} MB, snapshot {snap_size / 1e6:.1f} MB")
+    print(f"parse YAML:                  {yaml_time * 1000:9.1f} ms")
+    print(f"parse YAML + write snapshot: {build_time * 1000:9.1f} ms")
+    print(f"load snapshot:               {snap_time * 1000:9.1f} ms")
+    print(f"first task from snapshot:    {first_time * 1000:9.1f} ms")
+    same = result == expected
+    print("results match" if same else "RESULTS DIFFER")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Cold-start benchmark for the tracklet CLI.
+
+Runs common `--help` invocations, and non-interactive `task list` runs
+inside a generated project, in fresh interpreters. Measures their start-up
+overhead over a bare `python -c pass` and checks that none of the heavy
+dependencies (InquirerPy, prompt_toolkit, Rich, PyYAML) are imported,
+except PyYAML where a command reads tasks.yaml and Rich where it prints a
+table. A Rich command is measured over what printing a one-row Rich table
+costs on its own, so the budget covers tracklet's overhead rather than
+Rich's. Exits non-zero if a command is over budget or imports more than it
+needs, so it can gate CI.
+
+    python scripts/bench_startup.py --budget-ms 120
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["InquirerPy", "prompt_toolkit", "rich", "yaml"]
+
+COMMANDS = [
+    ["--help"],
+    ["project", "list", "--help"],
+    ["project", "search", "--help"],
+    ["task", "list", "--help"],
+    ["task", "add", "--help"],
+    ["deliverable", "list", "--help"],
+]
+
+# Run in a generated project; (argv, heavy modules the command needs).
+PROJECT_COMMANDS = [
+    (["task", "list", "--stream", "-n", "20"], ["yaml"]),
+    (["task", "list", "-n", "20"], ["rich", "yaml"]),
+]
+PROJECT_TASKS = 1000
+
+# Start-up cost of an allowed heavy dependency, measured on its own.
+FLOORS = {
+    "rich": "from rich.console import Console\n"
+            "from rich.table import Table\n"
+            "table = Table(title='t')\n"
+            "table.add_column('a', style='cyan')\n"
+            "table.add_row('b')\n"
+            "Console().print(table)",
+}
+
+PROBE = """
+import json, sys
+sys.path.insert(0, {root!r})
+from tracklet.cli.cli import main
+try:
+    main({argv!r})
+except SystemExit:
+    pass
+sys.stdout.flush()
+sys.stderr.write(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))
+"""
+
+
+def run(code, cwd=ROOT):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=cwd)
+    return time.perf_counter() - start, proc
+
+
+def best_of(code, repeat, cwd=ROOT):
+    best, proc = float("inf"), None
+    for _ in range(repeat):
+        elapsed, proc = run(code, cwd)
+        best = min(best, elapsed)
+    return best, proc
+
+
+def make_project(folder):
+    sys.path.insert(0, str(ROOT))
+    from tracklet.data_access import codec
+    from tracklet.data_access.metadata import META_FILENAME
+
+    codec.dump_file(folder / META_FILENAME, {"name": "bench", "tags": [], "progress": {"stage": "Planning"}})
+    codec.dump_file(folder / "tasks.yaml", {"tasks": [{
+        "id": f"task-{i}", "title": f"Task {i}", "status": ("todo", "in_progress", "completed")[i % 3],
+        "priority": ("low", "medium", "high")[i % 3], "assignees": [], "tags": [], "due_date": None,
+    } for i in range(PROJECT_TASKS)]})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=120.0, help="Allowed overhead over bare interpreter start")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (best is reported)")
+    args = parser.parse_args()
+
+    baseline, _ = best_of("pass", args.repeat)
+    print(f"bare interpreter: {baseline * 1000:.0f} ms (budget +{args.budget_ms:.0f} ms)")
+    floors = {}
+    for module in sorted({m for _, allowed in PROJECT_COMMANDS for m in allowed if m in FLOORS}):
+        floors[module], _ = best_of(FLOORS[module], args.repeat)
+        print(f"{module} floor: +{(floors[module] - baseline) * 1000:.0f} ms")
+
+    def check(argv, allowed=(), cwd=ROOT):
+        code = PROBE.format(root=str(ROOT), argv=argv)
+        run(code, cwd)  # warm-up (and the tasks.yaml snapshot, with TRACKLET_SNAPSHOT=1)
+        elapsed, proc = best_of(code, args.repeat, cwd)
+        floor = max([baseline] + [floors[m] for m in allowed if m in floors])
+        overhead_ms = (elapsed - floor) * 1000
+        loaded = set(json.loads(proc.stderr.strip().splitlines()[-1]))
+        heavy = [m for m in HEAVY_MODULES if m in loaded and m not in allowed]
+
+        ok = overhead_ms <= args.budget_ms and not heavy
+        note = f" imports {', '.join(heavy)}" if heavy else ""
+        if any(m in floors for m in allowed):
+            note += f" (over {', '.join(m for m in allowed if m in floors)} floor)"
+        print(f"{'ok  ' if ok else 'FAIL'} tracklet {' '.join(argv):<28} +{overhead_ms:6.0f} ms{note}")
+        return ok
+
+    failures = sum(not check(argv) for argv in COMMANDS)
+    with tempfile.TemporaryDirectory() as tmp:
+        make_project(Path(tmp))
+        failures += sum(not check(argv, allowed, Path(tmp)) for argv, allowed in PROJECT_COMMANDS)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
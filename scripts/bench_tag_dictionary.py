@@ -0,0 +1,81 @@
+"""
+Benchmark tag autocomplete on a generated workspace: building the tag
+dictionary cold, loading it from `.tracklet/cache/tags.json`, and prefix
+lookups through the trie against filtering the full sorted tag list.
+
+    python scripts/bench_tag_dictionary.py --projects 2000 --tags 50000
+"""
+
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracklet.data_access import codec
+from tracklet.data_access.tags import _dictionary_cache, get_tag_dictionary
+
+
+def make_workspace(base, projects, tags, seed=0):
+    rnd = random.Random(seed)
+    vocabulary = ["".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(3, 12))) for _ in range(tags)]
+    for i in range(projects):
+        folder = base / f"project{i:05d}"
+        folder.mkdir()
+        codec.dump_file(folder / ".projectmeta", {
+            "name": f"project {i}",
+            "tags": rnd.sample(vocabulary, rnd.randint(1, 30)),
+            "progress": {"stage": "Planning"},
+        })
+
+
+def timed(fn, *args, repeat=1):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=2000, help="Number of generated projects")
+    parser.add_argument("--tags", type=int, default=50_000, help="Size of the tag vocabulary")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        make_workspace(base, args.projects, args.tags)
+        schema = base / "no_schema.yaml"
+
+        cold, dictionary = timed(get_tag_dictionary, base, schema)
+        memory, _ = timed(get_tag_dictionary, base, schema)
+        _dictionary_cache.clear()
+        disk, dictionary = timed(get_tag_dictionary, base, schema)
+        trie_build, _ = timed(lambda: dictionary.trie)
+
+        prefixes = ["", "a", "ab", "abc", "q", "zz", "mno"]
+        trie_time, suggested = timed(lambda: [dictionary.suggest(p) for p in prefixes], repeat=20)
+        scan_time, scanned = timed(
+            lambda: [[t for t in dictionary.ranked if t.lower().startswith(p)][:10] for p in prefixes], repeat=5)
+
+    print(f"{args.projects} projects, {len(dictionary)} distinct tags")
+    print(f"build from metadata: {cold * 1000:8.1f} ms")
+    print(f"in-memory hit:       {memory * 1000:8.1f} ms (stat of every .projectmeta)")
+    print(f"disk cache hit:      {disk * 1000:8.1f} ms")
+    print(f"trie build:          {trie_build * 1000:8.1f} ms")
+    print(f"{len(prefixes)} lookups, trie: {trie_time * 1000:8.3f} ms")
+    print(f"{len(prefixes)} lookups, scan: {scan_time * 1000:8.3f} ms")
+    same = suggested == scanned
+    print("results match" if same else "RESULTS DIFFER")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Benchmark aggregate queries on the columnar TaskTable against plain
+per-dict iteration over the same synthetic tasks.
+
+    python scripts/bench_task_table.py --tasks 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracklet.core.task_table import TaskTable, _np
+
+
+def make_tasks(count, seed=0):
+    rnd = random.Random(seed)
+    people = [f"user{i}" for i in range(25)]
+    tags = [f"tag{i}" for i in range(40)]
+    return [{
+        "id": str(i),
+        "status": rnd.choice(["todo", "in_progress", "blocked", "completed"]),
+        "priority": rnd.choice(["low", "medium", "high"]),
+        "assignees": rnd.sample(people, rnd.randint(0, 2)),
+        "tags": rnd.sample(tags, rnd.randint(0, 3)),
+        "due_date": f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+    } for i in range(count)]
+
+
+def with_dicts(tasks):
+    selected = [t for t in tasks if t["status"] in ("todo", "blocked") and "tag1" in t["tags"]]
+    return (Counter(t["priority"] for t in selected),
+            Counter(a for t in selected for a in t["assignees"]),
+            sum(1 for t in tasks if t["status"] == "completed"))
+
+
+def with_table(table):
+    mask = table.where(status=["todo", "blocked"], tag="tag1")
+    return table.count_by("priority", mask), table.count_by("assignee", mask), table.completion()["completed"]
+
+
+def best(fn, *args, repeat=5):
+    result, times = None, []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200_000, help="Number of synthetic tasks")
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    start = time.perf_counter()
+    table = TaskTable.from_records(tasks)
+    build = time.perf_counter() - start
+
+    dict_time, expected = best(with_dicts, tasks)
+    table_time, result = best(with_table, table)
+    same = dict(expected[0]) == result[0] and \
+        {k: v for k, v in result[1].items() if k is not None} == dict(expected[1]) and expected[2] == result[2]
+
+    print(f"{args.tasks} tasks, backend: {'numpy' if _np() else 'int bitmaps'}; table built in {build * 1000:.0f} ms")
+    print(f"dict iteration: {dict_time * 1000:8.1f} ms")
+    print(f"TaskTable:      {table_time * 1000:8.1f} ms")
+    print("results match" if same else "RESULTS DIFFER")
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
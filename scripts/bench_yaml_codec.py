@@ -0,0 +1,90 @@
+"""
+Benchmark the YAML codec on a synthetic tasks.yaml.
+
+Compares PyYAML's pure-Python SafeLoader/SafeDumper with the libyaml
+backed loader/dumper picked by tracklet.data_access.codec, and checks
+that both backends emit identical output.
+
+    python scripts/bench_yaml_codec.py --tasks 50000
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracklet.data_access import codec
+
+
+def make_tasks(count):
+    rng = random.Random(42)
+    words = ["api", "fix", "refactor", "docs", "release", "cli", "parser", "cache", "ui", "test"]
+    tasks = []
+    for i in range(count):
+        tasks.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "title": " ".join(rng.choices(words, k=4)),
+            "description": " ".join(rng.choices(words, k=20)),
+            "priority": rng.choice(["low", "medium", "high"]),
+            "assignees": rng.sample(["alice", "bob", "carol", "dan"], k=2),
+            "due_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "status": rng.choice(["todo", "in_progress", "blocked", "completed"]),
+            "tags": rng.sample(words, k=3),
+        })
+    return {"tasks": tasks}
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50000, help="Number of tasks to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    if not codec.LIBYAML:
+        print("PyYAML was built without libyaml; the codec falls back to the pure-Python backend.")
+        return 1
+
+    data = make_tasks(args.tasks)
+
+    dump_py, text_py = timed(
+        lambda: yaml.dump(data, Dumper=yaml.SafeDumper, width=codec.DUMP_WIDTH), args.repeat
+    )
+    dump_c, text_c = timed(lambda: codec.dump(data), args.repeat)
+    if text_py != text_c:
+        print("ERROR: C and pure-Python dumpers produced different output.")
+        return 1
+
+    load_py, data_py = timed(lambda: yaml.load(io.StringIO(text_py), Loader=yaml.SafeLoader), args.repeat)
+    load_c, data_c = timed(lambda: codec.load(io.StringIO(text_c)), args.repeat)
+    if data_py != data_c or data_c != data:
+        print("ERROR: C and pure-Python loaders produced different data.")
+        return 1
+
+    size_mb = len(text_c.encode("utf-8")) / 1e6
+    print(f"tasks.yaml with {args.tasks} tasks ({size_mb:.1f} MB), best of {args.repeat}")
+    print(f"{'':8}{'pure-Python':>14}{'libyaml':>12}{'speedup':>10}")
+    print(f"{'load':8}{load_py:>13.2f}s{load_c:>11.2f}s{load_py / load_c:>9.1f}x")
+    print(f"{'dump':8}{dump_py:>13.2f}s{dump_c:>11.2f}s{dump_py / dump_c:>9.1f}x")
+    print("Output identical: yes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
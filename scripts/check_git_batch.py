@@ -0,0 +1,61 @@
+"""
+End-to-end check for coalesced git actions.
+
+Creates a throwaway repository with a local bare repository as its
+`origin`, fires `git_tag` and `push_tags` actions for N rule matches
+inside one command-scoped GitBatch, and verifies that every tag reached
+the remote using a constant number of git processes.
+
+    python scripts/check_git_batch.py --tags 200
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracklet.core.actions import create_git_tag, push_git_tags
+from tracklet.core.git_batch import collect_git_operations
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tags", type=int, default=200, help="Rule firings that each tag and push")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        remote, work = Path(tmp) / "remote.git", Path(tmp) / "work"
+        git("init", "--bare", "-q", str(remote), cwd=tmp)
+        git("init", "-q", str(work), cwd=tmp)
+        git("-c", "user.name=check", "-c", "user.email=check@example.com",
+            "commit", "-q", "--allow-empty", "-m", "init", cwd=work)
+        git("remote", "add", "origin", str(remote), cwd=work)
+
+        expected = {f"v0.{i}" for i in range(args.tags)}
+        start = time.perf_counter()
+        with collect_git_operations(cwd=work) as batch:
+            for i in range(args.tags):
+                create_git_tag({"task_id": f"t{i}"}, f"v0.{i}")
+                push_git_tags({"task_id": f"t{i}"}, "origin")
+        elapsed = time.perf_counter() - start
+
+        pushed = {line.split("refs/tags/")[1] for line in git("ls-remote", "--tags", str(remote), cwd=work).splitlines()}
+        print(f"{args.tags} tag + push actions in {elapsed:.2f}s using {batch.commands} git processes "
+              f"(unbatched: {2 * args.tags})")
+        if pushed != expected or batch.commands > 4:
+            print(f"FAILED: {len(pushed & expected)}/{len(expected)} tags on the remote.")
+            return 1
+    print("OK: all tags created and pushed once.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Check that codec.dump's built-in block emitter writes exactly what
+PyYAML's SafeDumper would, on randomly generated documents full of
+strings YAML treats specially (booleans, numbers, dates, indicators,
+quotes, non-ASCII). Documents the emitter declines go to PyYAML anyway.
+
+    python scripts/check_yaml_emitter.py --documents 20000
+"""
+
+import argparse
+import random
+import string
+import sys
+from datetime import date
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracklet.data_access import codec
+
+ALPHABET = string.ascii_letters + string.digits + " -_:#'\"!&*?|>%@`,[]{}.~/\\\t\n\xe9☃"
+SPECIAL = ["", " ", "yes", "no", "on", "off", "Y", "n", "null", "~", "true", "1", "1.5", "0x1f", "e1", "1e3",
+           ".5", "+1", "NaN", ".inf", "2026-01-01", "-", "- a", "a: b", "#x", "x #y", "'q'", "a'b", ":a", "?",
+           "!x", "*x", "&a", "%", "@x", "`x", "a ", "  a", "<<", "="]
+
+
+def make_document(rng):
+    def text():
+        if rng.random() < 0.3:
+            return rng.choice(SPECIAL)
+        return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+
+    def value(depth=0):
+        roll = rng.random()
+        if depth < 2 and roll < 0.15:
+            return {text() or "key": value(depth + 1) for _ in range(rng.randint(0, 3))}
+        if depth < 2 and roll < 0.3:
+            return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+        return rng.choice([text(), text(), text(), None, True, False, rng.randint(-5, 10 ** 6),
+                           rng.random() * 10 ** rng.randint(-8, 20), date(2026, 1, 2)])
+
+    return {"tasks": [{text() or "id": value() for _ in range(rng.randint(1, 5))} for _ in range(2)]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20_000, help="Random documents to compare")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    emitted = differ = 0
+    for _ in range(args.documents):
+        document = make_document(rng)
+        try:
+            text = codec._fast_dump(document)
+        except codec._Unsupported:
+            continue
+        emitted += 1
+        expected = yaml.dump(document, Dumper=yaml.SafeDumper, width=codec.DUMP_WIDTH)
+        if text != expected:
+            differ += 1
+            if differ <= 3:
+                print(f"DIFFERENT OUTPUT:\n{text!r}\n{expected!r}")
+
+    print(f"{args.documents} documents, {emitted} written by the emitter, {differ} different from SafeDumper")
+    print("OK: identical output." if not differ else "FAILED")
+    return 1 if differ else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Stress-test concurrent writers against one tasks.yaml and changelog.yaml.
+
+Starts N processes that each add M tasks (one save_task call per task,
+as parallel `tracklet task add` runs would) and append M changelog
+entries, then checks that every record made it to disk. Alongside them,
+reader processes keep dropping the binary snapshot of tasks.yaml and
+re-parsing the YAML, so snapshots are rebuilt while commits land; the
+snapshot must still match the YAML at the end.
+
+    python scripts/stress_concurrent_writes.py --writers 8 --tasks 25 --readers 2
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("TRACKLET_SNAPSHOT", "1")  # readers check the snapshot; workers inherit it
+
+from tracklet.core.changelog import append_entries, iter_changelog
+from tracklet.data_access import codec, snapshot
+from tracklet.data_access.file_io import load_tasks, save_task
+
+
+def writer(worker, count, tasks_file, changelog_file):
+    for i in range(count):
+        task_id = f"w{worker}-t{i}"
+        save_task({"id": task_id, "title": f"Task {i} from writer {worker}", "status": "todo"}, tasks_file)
+        append_entries([{"task_id": task_id, "summary": "stress"}], changelog_file)
+
+
+def reader(tasks_file, stop):
+    while not stop.is_set():
+        try:
+            os.unlink(snapshot.get_snapshot_path(tasks_file))
+        except FileNotFoundError:
+            pass
+        snapshot.load_file(tasks_file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8, help="Parallel writer processes")
+    parser.add_argument("--tasks", type=int, default=25, help="Tasks written by each writer")
+    parser.add_argument("--readers", type=int, default=2, help="Processes re-parsing tasks.yaml into its snapshot")
+    args = parser.parse_args()
+    if not snapshot.snapshots_enabled():
+        print("Note: TRACKLET_SNAPSHOT=0; the snapshot readers check nothing.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tasks_file = str(Path(tmp) / "tasks.yaml")
+        changelog_file = str(Path(tmp) / "changelog.yaml")
+
+        start = time.perf_counter()
+        stop = multiprocessing.Event()
+        readers = [multiprocessing.Process(target=reader, args=(tasks_file, stop)) for _ in range(args.readers)]
+        procs = [
+            multiprocessing.Process(target=writer, args=(w, args.tasks, tasks_file, changelog_file))
+            for w in range(args.writers)
+        ]
+        for p in readers + procs:
+            p.start()
+        for p in procs:
+            p.join()
+        stop.set()
+        for p in readers:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        expected = {f"w{w}-t{i}" for w in range(args.writers) for i in range(args.tasks)}
+        task_ids = [t["id"] for t in load_tasks(tasks_file)]
+        logged_ids = [e["task_id"] for e in iter_changelog(changelog_file)]
+        snapshot_matches = snapshot.load_file(tasks_file) == codec.load_file(tasks_file)
+
+        failed = any(p.exitcode != 0 for p in readers + procs)
+        print(f"{args.writers} writers x {args.tasks} records in {elapsed:.2f}s")
+        print(f"tasks.yaml:     {len(set(task_ids))}/{len(expected)} tasks, {len(task_ids) - len(set(task_ids))} duplicates")
+        print(f"changelog.yaml: {len(set(logged_ids))}/{len(expected)} entries")
+        print(f"snapshot:       {'matches' if snapshot_matches else 'STALE'} ({args.readers} reader(s))")
+
+        if failed or set(task_ids) != expected or len(task_ids) != len(expected) \
+                or sorted(logged_ids) != sorted(expected) or not snapshot_matches:
+            print("FAILED: records were lost or duplicated, or the snapshot is stale.")
+            return 1
+    print("OK: no records lost.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
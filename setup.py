@@ -16,6 +16,9 @@ setup(
         "PyYAML",
         "rich"
     ],
+    extras_require={
+        "fast": ["numpy"],
+    },
     entry_points={
         "console_scripts": [
             "tracklet=tracklet.cli.cli:main",
@@ -1,14 +1,23 @@
 # tracklet/__init__.py
 
 # Package initialization for project_tracker
-# Expose core modules for easy imports
+# Expose core modules for easy imports. They are resolved lazily (PEP 562)
+# so that `import tracklet` and CLI start-up don't pay for PyYAML, Rich or
+# InquirerPy until something actually uses them.
 
-from .data_access.metadata import read_metadata, write_metadata, create_default_metadata
-from .data_access.tracker import find_projects, filter_projects, summarize_progress
-from tracklet.cli.cli import main as cli_main
-from tracklet.utils.prompt import is_project_folder
+from importlib import import_module
 from tracklet._version import __version__
 
+_LAZY_EXPORTS = {
+    "read_metadata": "tracklet.data_access.metadata",
+    "write_metadata": "tracklet.data_access.metadata",
+    "create_default_metadata": "tracklet.data_access.metadata",
+    "find_projects": "tracklet.data_access.tracker",
+    "filter_projects": "tracklet.data_access.tracker",
+    "summarize_progress": "tracklet.data_access.tracker",
+    "is_project_folder": "tracklet.data_access.tracker",
+}
+
 __all__ = [
     "read_metadata",
     "write_metadata",
@@ -18,5 +27,13 @@ __all__ = [
     "summarize_progress",
     "cli_main",
     "is_project_folder",
-    "__verion__",
+    "__version__",
 ]
+
+
+def __getattr__(name):
+    if name == "cli_main":
+        return import_module("tracklet.cli.cli").main
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name]), name)
+    raise AttributeError(f"module 'tracklet' has no attribute '{name}'")
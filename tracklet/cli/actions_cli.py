@@ -0,0 +1,93 @@
+from tracklet.core.executor import ActionExecutor, ActionQueue, QueueBusy
+
+
+def handle_actions_run(args):
+    queue = ActionQueue()
+    try:
+        with queue.claim(limit=args.limit, retry_failed=args.retry_failed) as jobs:
+            if not jobs:
+                print("No queued actions.")
+                return
+            _run_jobs(queue, jobs, args)
+    except QueueBusy as e:
+        print(f"⚠️ {e}")
+    except KeyboardInterrupt:
+        print("\nInterrupted; the unfinished actions will be queued again by the next `tracklet actions run`.")
+
+
+def _run_jobs(queue, jobs, args):
+    from tracklet.core.actions import action_registry
+
+    executor = ActionExecutor(action_registry, timeout=args.timeout, concurrency=args.concurrency)
+    results = executor.run(jobs)
+    results = _git_results(jobs, results)
+
+    # Keep only the failed actions of each job so a retry doesn't repeat the ones that worked.
+    failed_jobs = []
+    position = 0
+    for job in jobs:
+        job_results = results[position:position + len(job.actions)]
+        position += len(job.actions)
+        failed = [action for action, result in zip(job.actions, job_results) if not result.ok]
+        if failed:
+            failed_jobs.append(job._replace(actions=failed))
+    queue.record_failed(failed_jobs)
+
+    for result in results:
+        if not result.ok:
+            print(f"❌ {result.rule_id}: {result.action} failed: {result.error}")
+    ok = sum(1 for result in results if result.ok)
+    print(f"Ran {len(results)} action(s) from {len(jobs)} rule firing(s): {ok} succeeded, {len(results) - ok} failed.")
+    if failed_jobs:
+        print("Failed actions were saved; retry with `tracklet actions run --retry-failed`.")
+
+
+def _git_results(jobs, results):
+    """
+    git_tag/push_tags actions only queue work in the command's GitBatch and
+    report ok. Flush it now and mark the actions whose tag or push failed.
+    """
+    from tracklet.core.git_batch import failure_of, get_git_batch
+
+    batch = get_git_batch()
+    if batch is None or not batch.pending:
+        return results
+    flushed = batch.flush()
+    if not flushed["failed_tags"] and not flushed["failed_remotes"]:
+        return results
+    actions = [action for job in jobs for action in job.actions]
+    checked = []
+    for (name, action_args, kwargs), result in zip(actions, results):
+        failure = failure_of(flushed, name, action_args, kwargs) if result.ok else None
+        checked.append(result._replace(ok=False, error=failure) if failure else result)
+    return checked
+
+
+def handle_actions_status(args):
+    queue = ActionQueue()
+    pending, failed, running = queue.pending(), queue.failed(), queue.running()
+    print(f"Queued: {len(pending)} rule firing(s), {sum(len(job.actions) for job in pending)} action(s).")
+    if running:
+        print(f"Running (or left by an interrupted run): {len(running)} rule firing(s).")
+    print(f"Failed: {len(failed)} rule firing(s), {sum(len(job.actions) for job in failed)} action(s).")
+    for job in pending[:args.show]:
+        names = ", ".join(name for name, _, _ in job.actions)
+        print(f"  - {job.rule_id} ({job.trigger or 'no trigger'}): {names}")
+
+
+def register_actions_commands(subparsers):
+    actions_parser = subparsers.add_parser("actions", help="Run queued rule actions")
+    actions_sub = actions_parser.add_subparsers(dest="actions_command", required=True)
+
+    # actions run
+    parser_run = actions_sub.add_parser("run", help="Run actions queued in deferred mode")
+    parser_run.add_argument("-n", "--limit", type=int, help="Run at most N queued rule firings")
+    parser_run.add_argument("-t", "--timeout", type=float, help="Per-action timeout in seconds")
+    parser_run.add_argument("-j", "--concurrency", type=int, help="Actions run at the same time")
+    parser_run.add_argument("--retry-failed", action="store_true", help="Also retry previously failed actions")
+    parser_run.set_defaults(func=handle_actions_run)
+
+    # actions status
+    parser_status = actions_sub.add_parser("status", help="Show queued and failed actions")
+    parser_status.add_argument("--show", type=int, default=10, help="Number of queued firings to list")
+    parser_status.set_defaults(func=handle_actions_status)
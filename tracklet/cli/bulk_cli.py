@@ -0,0 +1,78 @@
+from pathlib import Path
+from tracklet.utils import is_project_folder
+
+
+def _record_file(kind):
+    from tracklet.core.bulk import KINDS
+    return Path.cwd() / KINDS[kind].store.filename
+
+
+def handle_import(args):
+    if not is_project_folder(Path.cwd()):
+        print("Error: Not inside a valid project folder.")
+        return
+
+    from tracklet.core.bulk import import_file
+    from tracklet.data_access.transfer import detect_format
+    try:
+        fmt = detect_format(args.input, args.format)
+        summary = import_file(
+            args.kind, args.input, fmt, _record_file(args.kind),
+            batch_size=args.batch_size, keep_ids=not args.new_ids,
+            fire_rules=not args.no_rules, dry_run=args.dry_run,
+        )
+    except (OSError, ValueError) as e:
+        print(f"❌ Import failed: {e}")
+        return
+
+    for error in summary["errors"]:
+        print(f" - record {error['record']} ({error['id']}): {'; '.join(error['errors'])}")
+    if summary["invalid"] > len(summary["errors"]):
+        print(f" - ... and {summary['invalid'] - len(summary['errors'])} more invalid records")
+
+    verb = "Would import" if args.dry_run else "Imported"
+    print(f"{verb} {summary['created'] + summary['updated']} of {summary['read']} {args.kind}s "
+          f"({summary['created']} new, {summary['updated']} updated, {summary['invalid']} invalid).")
+    if summary["duplicates"]:
+        print(f"⚠️ {summary['duplicates']} row(s) repeated an id already imported; the last row for each id was kept.")
+    rules = summary["rules"]
+    if rules["passes"]:
+        print(f"Rules: {rules['passes']} batch pass(es), {rules['matched']} match(es), "
+              f"{rules['action_calls']} action call(s), {rules['errors']} error(s).")
+
+
+def handle_export(args):
+    if not is_project_folder(Path.cwd()):
+        print("Error: Not inside a valid project folder.")
+        return
+
+    from tracklet.core.bulk import export_records
+    from tracklet.data_access.transfer import detect_format
+    try:
+        fmt = detect_format(args.output, args.format)
+        count = export_records(args.kind, _record_file(args.kind), args.output, fmt, args.fields)
+    except BrokenPipeError:
+        return  # e.g. piped into `head`
+    except (OSError, ValueError) as e:
+        print(f"❌ Export failed: {e}")
+        return
+    if args.output != "-":
+        print(f"Exported {count} {args.kind}s to {args.output}.")
+
+
+def register_transfer_commands(kind_sub, kind):
+    """Adds `import` and `export` subcommands for kind ("task" or "deliverable")."""
+    parser_import = kind_sub.add_parser("import", help=f"Import {kind}s from CSV or JSON Lines")
+    parser_import.add_argument("input", help="Input file (.csv, .jsonl) or - for stdin")
+    parser_import.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from extension)")
+    parser_import.add_argument("--batch-size", type=int, default=1000, help="Records validated and passed to rules per batch")
+    parser_import.add_argument("--new-ids", action="store_true", help="Ignore ids in the input and generate new ones")
+    parser_import.add_argument("--no-rules", action="store_true", help="Don't fire create/update rules")
+    parser_import.add_argument("--dry-run", action="store_true", help="Validate only; don't write anything")
+    parser_import.set_defaults(func=handle_import, kind=kind)
+
+    parser_export = kind_sub.add_parser("export", help=f"Export {kind}s to CSV or JSON Lines")
+    parser_export.add_argument("output", help="Output file (.csv, .jsonl) or - for stdout")
+    parser_export.add_argument("--format", choices=["csv", "jsonl"], help="Output format (default: from extension)")
+    parser_export.add_argument("--fields", nargs="+", help="Fields/columns to export")
+    parser_export.set_defaults(func=handle_export, kind=kind)
@@ -0,0 +1,70 @@
+from pathlib import Path
+from tracklet.core.changelog import ChangelogIndex, compact_changelog
+
+
+def handle_changelog_compact(args):
+    if not Path(args.file).is_file():
+        print(f"Changelog {args.file} not found.")
+        return
+
+    if args.keep is not None and args.keep < 0:
+        print("--keep must be zero or a positive number of entries.")
+        return
+
+    before, after = compact_changelog(args.file, keep=args.keep)
+    print(f"Changelog compacted: {before} entries read, {after} kept ({args.file}).")
+
+
+def handle_changelog_tail(args):
+    if not Path(args.file).is_file():
+        print(f"Changelog {args.file} not found.")
+        return
+
+    with ChangelogIndex(args.file).open(rebuild=args.reindex) as index:
+        try:
+            entries = index.tail(args.lines, since=args.since, until=args.until, task_id=args.task_id)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+
+    if args.json:
+        import json
+        print(json.dumps(entries, indent=2, default=str))
+        return
+    if not entries:
+        print("No changelog entries found.")
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    table = Table(title=f"Changelog ({args.file})")
+    table.add_column("Timestamp", style="cyan", no_wrap=True)
+    table.add_column("Task", no_wrap=True)
+    table.add_column("Status", style="green")
+    table.add_column("Author", style="magenta")
+    table.add_column("Summary")
+    for entry in entries:
+        table.add_row(*(str(entry.get(key) or "-") for key in ("timestamp", "task_id", "status", "author", "summary")))
+    Console().print(table)
+
+
+def register_changelog_commands(subparsers):
+    changelog_parser = subparsers.add_parser("changelog", help="Changelog maintenance")
+    changelog_sub = changelog_parser.add_subparsers(dest="changelog_command", required=True)
+
+    # changelog compact
+    parser_compact = changelog_sub.add_parser("compact", help="Rewrite the changelog in canonical form")
+    parser_compact.add_argument("-f", "--file", default="changelog.yaml", help="Changelog file")
+    parser_compact.add_argument("-k", "--keep", type=int, help="Keep only the newest N entries")
+    parser_compact.set_defaults(func=handle_changelog_compact)
+
+    # changelog tail
+    parser_tail = changelog_sub.add_parser("tail", help="Show the newest entries, optionally in a time window or for one task")
+    parser_tail.add_argument("-f", "--file", default="changelog.yaml", help="Changelog file")
+    parser_tail.add_argument("-n", "--lines", type=int, default=10, help="Number of entries (default 10)")
+    parser_tail.add_argument("--since", help="Only entries at or after this date/time (YYYY-MM-DD[THH:MM:SS], UTC)")
+    parser_tail.add_argument("--until", help="Only entries up to this date/time (a date includes the whole day)")
+    parser_tail.add_argument("-t", "--task-id", help="Only entries for this task")
+    parser_tail.add_argument("--reindex", action="store_true", help="Rebuild the offset index first")
+    parser_tail.add_argument("--json", action="store_true", help="Print entries as JSON")
+    parser_tail.set_defaults(func=handle_changelog_tail)
@@ -1,21 +1,45 @@
 import argparse
-from tracklet.cli.project_cli import register_project_commands
-from tracklet.cli.task_cli import register_task_commands
-from tracklet.cli.deliverable_cli import register_deliverable_commands
+import sys
+from importlib import import_module
 
-def main():
+# Command name -> (module, register function, help). Only the module for the
+# command being run is imported, so `tracklet task list --help` doesn't pay
+# for the other command groups or their dependencies.
+COMMANDS = {
+    "project": ("tracklet.cli.project_cli", "register_project_commands", "Project commands"),
+    "task": ("tracklet.cli.task_cli", "register_task_commands", "Manage tasks"),
+    "deliverable": ("tracklet.cli.deliverable_cli", "register_deliverable_commands", "Deliverable operations"),
+    "index": ("tracklet.cli.index_cli", "register_index_commands", "Manage the workspace index"),
+    "changelog": ("tracklet.cli.changelog_cli", "register_changelog_commands", "Changelog maintenance"),
+    "actions": ("tracklet.cli.actions_cli", "register_actions_commands", "Run queued rule actions"),
+    "report": ("tracklet.cli.report_cli", "register_report_commands", "Portfolio report across all projects"),
+    "find": ("tracklet.cli.find_cli", "register_find_commands", "Ranked full-text search over projects and tasks"),
+    "daemon": ("tracklet.cli.daemon_cli", "register_daemon_commands", "Background daemon keeping the workspace in memory"),
+}
+
+def _requested_command(argv):
+    return next((arg for arg in argv if not arg.startswith("-")), None)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
     parser = argparse.ArgumentParser(prog="tracklet")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    register_project_commands(subparsers)
-    register_task_commands(subparsers)
-    register_deliverable_commands(subparsers)
+    requested = _requested_command(argv)
+    for name, (module, register, help_text) in COMMANDS.items():
+        if name == requested:
+            getattr(import_module(module), register)(subparsers)
+        else:
+            subparsers.add_parser(name, help=help_text)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     if hasattr(args, 'func'):
-        args.func(args)
+        # Git work requested by rule actions is applied once, after the command.
+        from tracklet.core.git_batch import collect_git_operations
+        with collect_git_operations():
+            args.func(args)
     else:
         parser.print_help()
 
 if __name__ == "__main__":
-    main()    
\ No newline at end of file
+    main()    
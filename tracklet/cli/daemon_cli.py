@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import time
+from tracklet.data_access.cache import get_tracklet_dir
+from tracklet.data_access.daemon_client import DaemonError, find_socket, get_socket_path, send_request
+
+LOG_FILENAME = "daemon.log"
+START_TIMEOUT = 30.0
+
+
+def _ping(socket_path):
+    try:
+        return send_request(socket_path, "ping", timeout=2) if socket_path else None
+    except (OSError, ValueError, DaemonError):
+        return None
+
+
+def handle_daemon_start(args):
+    base_path = os.getcwd()
+    socket_path = get_socket_path(base_path)
+    if _ping(socket_path):
+        print(f"ℹ️ A daemon is already running for {base_path}.")
+        return
+
+    if args.foreground:
+        from tracklet.core.daemon import TrackletDaemon
+        daemon = TrackletDaemon(base_path, poll_interval=args.poll_interval, depth=args.depth, recursive=args.recursive)
+        try:
+            daemon.serve()
+        except KeyboardInterrupt:
+            pass
+        except (RuntimeError, OSError) as e:
+            print(f"❌ {e}")
+        return
+
+    command = [sys.executable, "-c", "from tracklet.cli.cli import main; main()",
+               "daemon", "start", "--foreground", "--depth", str(args.depth)]
+    if args.recursive:
+        command.append("--recursive")
+    if args.poll_interval is not None:
+        command += ["--poll-interval", str(args.poll_interval)]
+    log_path = os.path.join(get_tracklet_dir(base_path, create=True), LOG_FILENAME)
+    with open(log_path, "a", encoding="utf-8") as log:
+        process = subprocess.Popen(command, cwd=base_path, stdin=subprocess.DEVNULL, stdout=log,
+                                   stderr=subprocess.STDOUT, start_new_session=True)
+
+    # Wait until the daemon has parsed the workspace and answers.
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = _ping(socket_path)
+        if status:
+            print(f"🟢 Daemon started (pid {status['pid']}, {status['files']} files cached, {status['watcher']} watcher).")
+            return
+        if process.poll() is not None:
+            print(f"❌ Daemon exited during start-up; see {log_path}.")
+            return
+        time.sleep(0.1)
+    print(f"⚠️ Daemon is still starting (pid {process.pid}); see {log_path}.")
+
+
+def handle_daemon_stop(args):
+    # Like other commands, stop/status find the daemon of the enclosing workspace.
+    socket_path = find_socket(os.getcwd())
+    try:
+        if socket_path is None:
+            raise FileNotFoundError(socket_path)
+        send_request(socket_path, "shutdown", timeout=5)
+    except (OSError, ValueError, DaemonError):
+        print("ℹ️ No daemon is running here.")
+        return
+    print("🔴 Daemon stopped.")
+
+
+def handle_daemon_status(args):
+    status = _ping(find_socket(os.getcwd()))
+    if not status:
+        print("No daemon is running here; commands read files directly.")
+        return
+    print(f"🟢 Daemon pid {status['pid']} serving {status['base_path']}")
+    print(f"   up {status['uptime']}s, {status['watcher']} watcher, {status['files']} files cached, "
+          f"{status['hits']} cache hits, {status['loads']} parses")
+
+
+def register_daemon_commands(subparsers):
+    daemon_parser = subparsers.add_parser("daemon", help="Background daemon keeping the workspace in memory")
+    daemon_sub = daemon_parser.add_subparsers(dest="daemon_command", required=True)
+
+    # daemon start
+    parser_start = daemon_sub.add_parser("start", help="Start the daemon for the current workspace")
+    parser_start.add_argument("--foreground", action="store_true", help="Run in this terminal instead of the background")
+    parser_start.add_argument("--poll-interval", type=float, help="Poll for changes every N seconds instead of using inotify")
+    parser_start.add_argument("--depth", type=int, default=1, help="Folder levels to search for projects (default 1)")
+    parser_start.add_argument("-r", "--recursive", action="store_true", help="Search for projects at any depth")
+    parser_start.set_defaults(func=handle_daemon_start)
+
+    # daemon stop
+    parser_stop = daemon_sub.add_parser("stop", help="Stop the daemon")
+    parser_stop.set_defaults(func=handle_daemon_stop)
+
+    # daemon status
+    parser_status = daemon_sub.add_parser("status", help="Show whether a daemon is running")
+    parser_status.set_defaults(func=handle_daemon_status)
@@ -2,15 +2,11 @@ import argparse
 import os
 from pathlib import Path
 from tracklet.core.rules_engine import validate_deliverable 
-from tracklet.data_access import load_deliverables, save_deliverables, generate_deliverable_id
+from tracklet.data_access import load_deliverables, save_deliverables, generate_deliverable_id, DeliverableStore
+from tracklet.data_access.file_io import get_deliverables_file, iter_deliverables, select_from_daemon
 from tracklet.utils.prompt import is_project_folder
-from tracklet.utils.format import print_colored
-
-from InquirerPy import inquirer
-from rich.console import Console
-from rich.table import Table
-
-console = Console()
+from tracklet.utils.format import print_colored, get_console
+from tracklet.cli.bulk_cli import register_transfer_commands
 
 def handle_deliverable_add(args):
     project_path = Path.cwd()
@@ -18,7 +14,7 @@ def handle_deliverable_add(args):
         print("Error: Not inside a valid project folder.")
         return
 
-    deliverables = load_deliverables(project_path)
+    store = DeliverableStore.for_project(project_path)
 
     new_deliverable = {
         "id": generate_deliverable_id(),
@@ -33,13 +29,14 @@ def handle_deliverable_add(args):
     valid, errors = validate_deliverable(new_deliverable)
     
     if not valid:
+        console = get_console()
         console.print("[bold red]Deliverable validation failed with errors:[/]")
         for err in errors:
             console.print(f" - [red]{err}[/]")
         return
 
-    deliverables.append(new_deliverable)
-    save_deliverables(project_path, deliverables)
+    store.put(new_deliverable)
+    store.commit()
     print_colored(f"Deliverable '{new_deliverable['title']}' added successfully with ID {new_deliverable['id']}",color="green", bold=True)
 
 def handle_deliverable_list(args):
@@ -48,7 +45,13 @@ def handle_deliverable_list(args):
         print("Error: Not inside a valid project folder.")
         return
 
-    deliverables = load_deliverables(project_path)
+    if args.task_id:
+        deliverables = DeliverableStore.for_project(project_path).linked_to(args.task_id)
+    else:
+        deliverables_file = get_deliverables_file(project_path)
+        deliverables = select_from_daemon(deliverables_file, {"equals": {"status": args.status}})
+        if deliverables is None:
+            deliverables = list(iter_deliverables(deliverables_file))
     if not deliverables:
         print_colored("No deliverables found.",color="red")
         return
@@ -57,10 +60,9 @@ def handle_deliverable_list(args):
     filtered = deliverables
     if args.status:
         filtered = [d for d in filtered if d.get("status") == args.status]
-    if args.task_id:
-        filtered = [d for d in filtered if d.get("related_task_id") == args.task_id]
 
-    console = Console()
+    from rich.table import Table
+    console = get_console()
     table = Table(title="Deliverables")
     table.add_column("ID", style="cyan", no_wrap=True)
     table.add_column("Title", style="green")
@@ -69,7 +71,7 @@ def handle_deliverable_list(args):
     table.add_column("Related Task ID", style="magenta")
 
     for d in filtered:
-        table.add_row(d["id"], d["title"], d["status"], d.get("due_date", "-"), d.get("related_task_id", "-"))
+        table.add_row(d["id"], d["title"], d["status"], str(d.get("due_date") or "-"), str(d.get("related_task_id") or "-"))
 
     console.print(table)
 
@@ -79,8 +81,8 @@ def handle_deliverable_update(args):
         print("Error: Not inside a valid project folder.")
         return
 
-    deliverables = load_deliverables(project_path)
-    deliverable = next((d for d in deliverables if d["id"] == args.id), None)
+    store = DeliverableStore.for_project(project_path)
+    deliverable = store.get(args.id)
     if not deliverable:
         print(f"Deliverable with ID {args.id} not found.")
         return
@@ -106,7 +108,8 @@ def handle_deliverable_update(args):
             print(f" - {err}")
         return
 
-    save_deliverables(project_path, deliverables)
+    store.put(deliverable)
+    store.commit()
     print_colored(f"Deliverable '{deliverable['title']}' updated successfully.",color="green")
 
 def handle_deliverable_remove(args):
@@ -115,14 +118,12 @@ def handle_deliverable_remove(args):
         print("Error: Not inside a valid project folder.")
         return
 
-    deliverables = load_deliverables(project_path)
-    new_deliverables = [d for d in deliverables if d["id"] != args.id]
-
-    if len(new_deliverables) == len(deliverables):
+    store = DeliverableStore.for_project(project_path)
+    if not store.delete(args.id):
         print_colored(f"No deliverable with ID {args.id} found.",color="red")
         return
 
-    save_deliverables(project_path, new_deliverables)
+    store.commit()
     print(f"Deliverable with ID {args.id} removed successfully.")
 
 def handle_validate(args):
@@ -155,6 +156,7 @@ def register_deliverable_commands(subparsers):
 
     # deliverable list
     parser_deliverable_list = deliverable_sub.add_parser("list", help="List deliverables")
+    parser_deliverable_list.add_argument("-s", "--status", help="Filter by status")
     parser_deliverable_list.add_argument("--task-id", help="Filter deliverables by linked task")
     parser_deliverable_list.set_defaults(func=handle_deliverable_list)
 
@@ -162,3 +164,6 @@ def register_deliverable_commands(subparsers):
     parser_deliverable_remove = deliverable_sub.add_parser("remove", help="Remove a deliverable")
     parser_deliverable_remove.add_argument("id", help="Deliverable ID to remove")
     parser_deliverable_remove.set_defaults(func=handle_deliverable_remove)
+
+    # deliverable import / deliverable export
+    register_transfer_commands(deliverable_sub, "deliverable")
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+from tracklet.data_access.fulltext import FullTextIndex
+from tracklet.data_access.tracker import discover_project_dirs
+
+
+def handle_find(args):
+    base_path = os.getcwd()
+    try:
+        with FullTextIndex(base_path) as index:
+            if not args.no_refresh:
+                paths = discover_project_dirs(base_path, depth=args.depth, recursive=args.recursive, exclude=args.exclude)
+                index.refresh(paths)
+            hits = index.search(args.text, limit=args.limit, kind=args.kind, prefix=args.prefix)
+    except (sqlite3.Error, OSError) as e:
+        print(f"❌ Search index unavailable: {e}")
+        return
+
+    if args.json:
+        import json
+        print(json.dumps(hits, indent=2))
+        return
+    if not hits:
+        print("No matches found.")
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    console = Console()
+    table = Table(title=f"Results for '{args.text}'")
+    table.add_column("#", justify="right")
+    table.add_column("Score", justify="right", style="magenta")
+    table.add_column("Kind", style="yellow")
+    table.add_column("Title", style="green")
+    table.add_column("Project", style="cyan")
+    table.add_column("ID", no_wrap=True)
+    for rank, hit in enumerate(hits, start=1):
+        table.add_row(str(rank), f"{hit['score']:.2f}", hit["kind"], hit["title"] or "-",
+                      os.path.relpath(hit["project"], base_path), hit["id"] or "-")
+    console.print(table)
+
+
+def register_find_commands(subparsers):
+    from tracklet.cli.project_cli import add_discovery_arguments
+    parser_find = subparsers.add_parser("find", help="Ranked full-text search over projects and tasks")
+    parser_find.add_argument("text", help="Words to search for")
+    parser_find.add_argument("-k", "--limit", type=int, default=10, help="Number of results (default 10)")
+    parser_find.add_argument("--kind", choices=["project", "task"], help="Only return projects or tasks")
+    parser_find.add_argument("--prefix", action="store_true", help="Let the last word match longer words (search as you type)")
+    parser_find.add_argument("--no-refresh", action="store_true", help="Query the index as it is, without checking for changed files")
+    parser_find.add_argument("--json", action="store_true", help="Print results as JSON")
+    add_discovery_arguments(parser_find)
+    parser_find.set_defaults(func=handle_find)
@@ -0,0 +1,52 @@
+import os
+from tracklet.data_access.index import WorkspaceIndex
+from tracklet.data_access.tracker import discover_project_dirs
+
+
+def _project_dirs(base_path, args):
+    return discover_project_dirs(base_path, depth=args.depth, recursive=args.recursive, exclude=args.exclude)
+
+
+def handle_index_rebuild(args):
+    base_path = os.getcwd()
+    with WorkspaceIndex(base_path) as index:
+        count = index.rebuild(_project_dirs(base_path, args), jobs=args.jobs)
+    print(f"Workspace index rebuilt with {count} projects ({index.path}).")
+
+
+def handle_index_status(args):
+    base_path = os.getcwd()
+    with WorkspaceIndex(base_path) as index:
+        status = index.status(_project_dirs(base_path, args))
+
+    from rich.console import Console
+    from rich.table import Table
+    console = Console()
+    table = Table(title=f"Workspace index for {base_path}")
+    table.add_column("Property", style="cyan", no_wrap=True)
+    table.add_column("Value", style="green")
+
+    table.add_row("Index file", status["path"])
+    table.add_row("Size", f"{status['size'] / 1024:.1f} KiB")
+    table.add_row("Indexed projects", str(status["indexed"]))
+    table.add_row("Up to date", str(status["fresh"]))
+    table.add_row("Stale (will be re-parsed)", str(status["stale"]))
+    table.add_row("Not yet indexed", str(status["missing"]))
+    table.add_row("Orphaned rows", str(status["orphaned"]))
+    console.print(table)
+
+
+def register_index_commands(subparsers):
+    from tracklet.cli.project_cli import add_discovery_arguments
+    index_parser = subparsers.add_parser("index", help="Manage the workspace index")
+    index_sub = index_parser.add_subparsers(dest="index_command", required=True)
+
+    # index rebuild
+    parser_rebuild = index_sub.add_parser("rebuild", help="Re-parse every project into the index")
+    add_discovery_arguments(parser_rebuild)
+    parser_rebuild.set_defaults(func=handle_index_rebuild)
+
+    # index status
+    parser_status = index_sub.add_parser("status", help="Show index freshness")
+    add_discovery_arguments(parser_status)
+    parser_status.set_defaults(func=handle_index_status)
@@ -2,12 +2,18 @@ import argparse
 import os
 from pathlib import Path
 from tracklet.data_access.metadata import create_default_metadata, read_metadata, write_metadata, STAGES, delete_metadata
-from tracklet.data_access.tracker import find_projects, filter_projects, summarize_progress, list_projects, collect_all_tags
+from tracklet.data_access.tracker import find_projects, filter_projects, summarize_progress, list_projects, collect_all_tags, search_projects
 from tracklet.utils.prompt import prompt_text_list,prompt_multi_select, prompt_tags_with_autocomplete, prompt_text, is_project_folder,prompt_select
 
-from InquirerPy import inquirer
-from rich.console import Console
-from rich.table import Table
+
+def _scan_options(args):
+    """Discovery options shared by list/search."""
+    return {
+        "jobs": args.jobs,
+        "depth": args.depth,
+        "recursive": args.recursive,
+        "exclude": args.exclude,
+    }
 
 
 def handle_search(args):
@@ -18,8 +24,17 @@ def handle_search(args):
         print("Please run 'tracklet search' from the main projects directory, not inside a project folder.")
         return
 
+    query = None
+    if args.query:
+        from tracklet.core.query import Query, QueryError
+        try:
+            query = Query(args.query, "project")
+        except QueryError as e:
+            print(f"Invalid query: {e}")
+            return
+
     # Find all projects
-    projects = find_projects(base_path)
+    projects = find_projects(base_path, **_scan_options(args))
     if not projects:
         print("No projects found.")
         return
@@ -32,7 +47,7 @@ def handle_search(args):
     flags_provided = any([
         args.name, args.author, args.description,
         args.stage, args.stage_add, args.stage_remove,
-        args.tag, args.tag_add, args.tag_remove
+        args.tag, args.tag_add, args.tag_remove, args.query
     ])
 
     # If no flags, prompt user interactively to choose filters
@@ -94,8 +109,8 @@ def handle_search(args):
         "stage", args.stage_remove, args.stage_remove, args.stage_remove, STAGES
     )
 
-    #from .tracker import collect_all_tags
-    all_tags = collect_all_tags(base_path)
+    # Tags come from the projects already scanned above
+    all_tags = sorted({tag for _, meta in projects for tag in meta.get("tags", [])})
     include_filters['tag'] = get_filter_values(
         "tag", args.tag_add or args.tag, args.tag_add, args.tag_remove, all_tags
     )
@@ -103,38 +118,18 @@ def handle_search(args):
         "tag", args.tag_remove, args.tag_remove, args.tag_remove, all_tags
     )
 
-    # Filter projects based on include filters
-    filtered = projects
-    for prop, values in include_filters.items():
-        if values:
-            filtered = [
-                (path, meta) for path, meta in filtered
-                if any(
-                    (prop == "tag" and v in meta.get("tags", [])) or
-                    (prop == "stage" and v == meta.get("progress", {}).get("stage")) or
-                    (prop in meta and v.lower() in str(meta[prop]).lower())
-                    for v in values
-                )
-            ]
-
-    # Apply exclude filters
-    for prop, values in exclude_filters.items():
-        if values:
-            filtered = [
-                (path, meta) for path, meta in filtered
-                if all(
-                    (prop == "tag" and v not in meta.get("tags", [])) and
-                    (prop == "stage" and v != meta.get("progress", {}).get("stage")) and
-                    (prop not in meta or v.lower() not in str(meta[prop]).lower())
-                    for v in values
-                )
-            ]
+    # Includes are intersected and excludes subtracted using the index postings
+    filtered = search_projects(base_path, projects, include_filters, exclude_filters)
+    if query is not None:
+        filtered = [(path, meta) for path, meta in filtered if query(meta)]
 
     if not filtered:
         print("No projects matched the search criteria.")
         return
 
     # Display results in Rich table
+    from rich.console import Console
+    from rich.table import Table
     console = Console()
     table = Table(title=f"Search Results ({len(filtered)} projects)")
 
@@ -163,11 +158,13 @@ def handle_list(args):
         print("Please run 'tracklet list' from the main projects directory, not inside a project folder.")
         return
 
-    projects = list_projects(base_path)
+    projects = list_projects(base_path, **_scan_options(args))
     if not projects:
         print("No projects found.")
         return
 
+    from rich.console import Console
+    from rich.table import Table
     console = Console()
 
     if args.detailed:
@@ -196,13 +193,41 @@ def handle_list(args):
         console.print(table)
 
 
-def select_project(base_path):
+def handle_tags(args):
+    from tracklet.data_access.tags import get_tag_dictionary
+    dictionary = get_tag_dictionary(os.getcwd(), jobs=args.jobs, refresh=args.refresh)
+    tags = dictionary.suggest(args.prefix or "", limit=args.limit) if args.limit else [
+        tag for tag in dictionary.ranked if tag.lower().startswith((args.prefix or "").lower())
+    ]
+    entries = [{"tag": tag, "count": dictionary.counts.get(tag, 0), "categories": dictionary.categories(tag)} for tag in tags]
+
+    if args.json:
+        import json
+        print(json.dumps(entries, indent=2))
+        return
+    if not entries:
+        print("No tags found.")
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    table = Table(title=f"Tags ({len(entries)} of {len(dictionary)})")
+    table.add_column("Tag", style="yellow")
+    table.add_column("Projects", justify="right", style="cyan")
+    table.add_column("Categories", style="magenta")
+    for entry in entries:
+        table.add_row(entry["tag"], str(entry["count"]), ", ".join(entry["categories"]) or "-")
+    Console().print(table)
+
+
+def select_project(base_path, jobs=None):
     """Prompt user to select a project folder from base_path."""
-    projects = find_projects(base_path)
+    projects = find_projects(base_path, jobs=jobs)
     if not projects:
         print("No projects found in the current directory.")
         return None
 
+    from InquirerPy import inquirer
     choices = [
         {"name": f"{meta['name']} ({os.path.basename(path)})", "value": path}
         for path, meta in projects
@@ -219,7 +244,7 @@ def handle_update(args):
     if is_project_folder(os.getcwd()):
         project_path = os.getcwd()
     else:
-        project_path = select_project(os.getcwd())
+        project_path = select_project(os.getcwd(), jobs=args.jobs)
         if not project_path:
             return
 
@@ -228,6 +253,7 @@ def handle_update(args):
         print("Could not read project metadata.")
         return
 
+    from InquirerPy import inquirer
     updated = False
 
     # Update name
@@ -353,6 +379,7 @@ def handle_uninit(args):
         return
 
     if not args.force:
+        from InquirerPy import inquirer
         confirm = inquirer.confirm(
             message="Are you sure you want to uninitialize this project? This will delete the .projectmeta file.",
             default=False
@@ -383,6 +410,7 @@ def handle_init(args):
     default_name = os.path.basename(project_path)
     name = args.name
     if name is None:
+        from InquirerPy import inquirer
         name = inquirer.text(
             message="Project name:",
             default=default_name
@@ -420,6 +448,12 @@ def handle_init(args):
 
     print(f"Project initialized successfully in {project_path}")
 
+def add_discovery_arguments(parser):
+    parser.add_argument("-j", "--jobs", type=int, help="Parallel metadata readers")
+    parser.add_argument("--depth", type=int, default=1, help="Folder levels to search for projects (default 1)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search for projects at any depth")
+    parser.add_argument("-x", "--exclude", action="append", metavar="GLOB", help="Skip folders matching GLOB (repeatable)")
+
 def register_project_commands(subparsers):
     project_parser = subparsers.add_parser("project", help="Project commands")
     project_sub = project_parser.add_subparsers(dest="command", required=True)
@@ -453,11 +487,13 @@ def register_project_commands(subparsers):
     parser_update.add_argument("-t", "--tag", nargs='?', const=None, help="Replace tags")
     parser_update.add_argument("-ta", "--tag-add", nargs='?', const=None, help="Add tags")
     parser_update.add_argument("-tr", "--tag-remove", nargs='?', const=None, help="Remove tags")
+    parser_update.add_argument("-j", "--jobs", type=int, help="Parallel metadata readers")
     parser_update.set_defaults(func=handle_update)
 
     # list command
     parser_list = project_sub.add_parser("list", help="List projects")
     parser_list.add_argument("-D", "--detailed", action="store_true", help="Show detailed info")
+    add_discovery_arguments(parser_list)
     parser_list.set_defaults(func=handle_list)
 
     # search command
@@ -475,4 +511,15 @@ def register_project_commands(subparsers):
     parser_search.add_argument("-t", "--tag", nargs='?', const=None, help="Search by tag")
     parser_search.add_argument("-ta", "--tag-add", nargs='?', const=None, help="Include tags")
     parser_search.add_argument("-tr", "--tag-remove", nargs='?', const=None, help="Exclude tags")
+    parser_search.add_argument("-q", "--query", help="Query, e.g. 'stage:Development tag:python -tag:ai author~dan'")
+    add_discovery_arguments(parser_search)
     parser_search.set_defaults(func=handle_search)
+
+    # tags command
+    parser_tags = project_sub.add_parser("tags", help="List tags in use and from the tag schema, most used first")
+    parser_tags.add_argument("prefix", nargs="?", help="Only tags starting with this text")
+    parser_tags.add_argument("-k", "--limit", type=int, default=20, help="Number of tags (0 for all, default 20)")
+    parser_tags.add_argument("--refresh", action="store_true", help="Rebuild the cached tag dictionary")
+    parser_tags.add_argument("--json", action="store_true", help="Print tags as JSON")
+    parser_tags.add_argument("-j", "--jobs", type=int, help="Parallel metadata readers")
+    parser_tags.set_defaults(func=handle_tags)
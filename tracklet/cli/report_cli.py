@@ -0,0 +1,71 @@
+import os
+from tracklet.data_access.tracker import discover_project_dirs
+
+
+def _ratio(counts):
+    return f"{counts['completed']}/{counts['total']} ({counts['percent']:.1f}%)"
+
+
+def handle_report(args):
+    base_path = os.getcwd()
+    paths = discover_project_dirs(base_path, depth=args.depth, recursive=args.recursive, exclude=args.exclude)
+    if not paths:
+        print("No projects found.")
+        return
+
+    from tracklet.core.report import build_report
+    report = build_report(paths, jobs=args.jobs)
+
+    if args.json:
+        import json
+        print(json.dumps(report, indent=2))
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    console = Console()
+
+    projects = Table(title=f"Portfolio report for {base_path}")
+    projects.add_column("Project", style="cyan", no_wrap=True)
+    projects.add_column("Stage", style="magenta")
+    projects.add_column("Author", style="yellow")
+    projects.add_column("Tasks done", justify="right", style="green")
+    projects.add_column("Overdue", justify="right", style="red")
+    projects.add_column("Deliverables done", justify="right")
+    for p in report["projects"]:
+        projects.add_row(p["name"], p["stage"], p["author"], _ratio(p["tasks"]),
+                         str(p["tasks"]["overdue"] + p["deliverables"]["overdue"]), _ratio(p["deliverables"]))
+    console.print(projects)
+
+    stages = Table(title="Projects by stage")
+    stages.add_column("Stage", style="magenta")
+    stages.add_column("Projects", justify="right")
+    for stage, count in sorted(report["stages"].items(), key=lambda item: -item[1]):
+        stages.add_row(stage, str(count))
+    console.print(stages)
+
+    authors = Table(title="By author")
+    authors.add_column("Author", style="yellow")
+    authors.add_column("Projects", justify="right")
+    authors.add_column("Tasks done", justify="right", style="green")
+    authors.add_column("Overdue tasks", justify="right", style="red")
+    for author, counts in sorted(report["authors"].items()):
+        authors.add_row(author, str(counts["projects"]), _ratio(counts), str(counts["overdue"]))
+    console.print(authors)
+
+    tasks, deliverables = report["tasks"], report["deliverables"]
+    console.print(
+        f"[bold]{report['project_count']}[/] projects: tasks {_ratio(tasks)} completed, "
+        f"[red]{tasks['overdue']}[/] overdue; deliverables {_ratio(deliverables)} completed, "
+        f"[red]{deliverables['overdue']}[/] overdue"
+    )
+    for error in report["errors"]:
+        console.print(f"[red]Skipped {error['path']}: {error['error']}[/]")
+
+
+def register_report_commands(subparsers):
+    from tracklet.cli.project_cli import add_discovery_arguments
+    parser_report = subparsers.add_parser("report", help="Portfolio report across all projects")
+    parser_report.add_argument("--json", action="store_true", help="Print the report as JSON")
+    add_discovery_arguments(parser_report)
+    parser_report.set_defaults(func=handle_report)
@@ -1,12 +1,11 @@
 import argparse
 import os
 from pathlib import Path
-from tracklet.data_access import load_deliverables, save_deliverables, generate_deliverable_id, load_tasks, save_tasks, generate_task_id
-from tracklet.core.rules_engine import validate_task
+from tracklet.data_access import load_deliverables, save_deliverables, generate_deliverable_id, load_tasks, save_tasks, generate_task_id, get_tasks_file, TaskStore
+from tracklet.data_access.file_io import iter_tasks, select_from_daemon
+from tracklet.core.query import QueryError, select
 from tracklet.utils import is_project_folder, prompt_tags_with_autocomplete
-from InquirerPy import inquirer
-from rich.console import Console
-from rich.table import Table
+from tracklet.cli.bulk_cli import register_transfer_commands
 
 def handle_task_add(args):
     project_path = Path.cwd()
@@ -15,7 +14,7 @@ def handle_task_add(args):
         return
 
     # Load existing tasks
-    tasks = load_tasks(project_path)
+    store = TaskStore.for_project(project_path)
 
     # Create new task dict
     new_task = {
@@ -31,7 +30,7 @@ def handle_task_add(args):
     }
 
     # Run pre-task rules (example, assuming you have a validate_task function)
-    
+    from tracklet.core.rules_engine import validate_task
     valid, errors = validate_task(new_task)
     if not valid:
         print("Task validation failed with errors:")
@@ -40,8 +39,8 @@ def handle_task_add(args):
         return
 
     # Append and save
-    tasks.append(new_task)
-    save_tasks(project_path, tasks)
+    store.put(new_task)
+    store.commit()
     print(f"Task '{new_task['title']}' added successfully with ID {new_task['id']}")
 
 
@@ -51,8 +50,8 @@ def handle_task_update(args):
         print("Error: Not inside a valid project folder.")
         return
 
-    tasks = load_tasks(project_path)
-    task = next((t for t in tasks if t["id"] == args.id), None)
+    store = TaskStore.for_project(project_path)
+    task = store.get(args.id)
     if not task:
         print(f"Task with ID {args.id} not found.")
         return
@@ -82,31 +81,81 @@ def handle_task_update(args):
             print(f" - {err}")
         return
 
-    save_tasks(project_path, tasks)
+    store.put(task)
+    store.commit()
     print(f"Task '{task['title']}' updated successfully.")
 
 
+# (header, field, width) for --stream output
+STREAM_COLUMNS = [("ID", "id", 36), ("Title", "title", 40), ("Priority", "priority", 8), ("Status", "status", 11), ("Due Date", "due_date", 10)]
+
+
+def _selection(args):
+    """The list filters plus --sort, --offset and --limit, as core.query.select arguments."""
+    return {
+        "equals": {"status": args.status, "priority": args.priority},
+        "tag": args.tag,
+        "query": args.query,
+        "sort": args.sort.lstrip("-") if args.sort else None,
+        "descending": bool(args.sort) and (args.sort.startswith("-") or args.reverse),
+        "offset": args.offset or 0,
+        "limit": args.limit,
+    }
+
+
+def _cell(value):
+    return "-" if value is None or value == "" else str(value)
+
+
+def _print_stream(rows):
+    """Prints rows as they arrive, in fixed-width columns."""
+    def line(cells):
+        return "  ".join(cell[:width].ljust(width) for cell, (_, _, width) in zip(cells, STREAM_COLUMNS)).rstrip()
+
+    print(line([header for header, _, _ in STREAM_COLUMNS]))
+    print(line(["-" * width for _, _, width in STREAM_COLUMNS]))
+    count = 0
+    for t in rows:
+        print(line([_cell(t.get(field)) for _, field, _ in STREAM_COLUMNS]), flush=count < 50)
+        count += 1
+    return count
+
+
 def handle_task_list(args):
     project_path = Path.cwd()
     if not is_project_folder(project_path):
         print("Error: Not inside a valid project folder.")
         return
 
-    tasks = load_tasks(project_path)
-    if not tasks:
-        print("No tasks found.")
+    # A running daemon selects the page from its in-memory tasks. Otherwise
+    # tasks are parsed one at a time and filtered as they stream in, so the
+    # first page of a huge file never waits for (or holds) the whole list.
+    tasks_file = get_tasks_file(project_path)
+    selection = _selection(args)
+    try:
+        rows = select_from_daemon(tasks_file, selection)
+        if rows is None:
+            rows = select(iter_tasks(tasks_file), **selection)
+    except QueryError as e:
+        print(f"Invalid query: {e}")
         return
 
-    # Apply filters if any
-    filtered = tasks
-    if args.status:
-        filtered = [t for t in filtered if t.get("status") == args.status]
-    if args.priority:
-        filtered = [t for t in filtered if t.get("priority") == args.priority]
-    if args.tag:
-        filtered = [t for t in filtered if args.tag in t.get("tags", [])]
+    if args.stream:
+        try:
+            if not _print_stream(rows):
+                print("No tasks found.")
+        except BrokenPipeError:
+            pass  # e.g. piped into `head`
+        return
+
+    rows = list(rows)
+    if not rows:
+        print("No tasks found.")
+        return
 
     # Display tasks using rich Table
+    from rich.console import Console
+    from rich.table import Table
     console = Console()
     table = Table(title="Tasks")
     table.add_column("ID", style="cyan", no_wrap=True)
@@ -115,26 +164,93 @@ def handle_task_list(args):
     table.add_column("Status", style="yellow")
     table.add_column("Due Date", style="red")
 
-    for t in filtered:
-        table.add_row(t["id"], t["title"], t["priority"], t["status"], t.get("due_date", "-"))
+    for t in rows:
+        table.add_row(*(_cell(t.get(field)) for _, field, _ in STREAM_COLUMNS))
 
     console.print(table)
+    if args.limit is not None or args.offset:
+        first = (args.offset or 0) + 1
+        console.print(f"Showing tasks {first}-{first + len(rows) - 1}.")
 
-def handle_task_remove(args):
+def handle_task_stats(args):
     project_path = Path.cwd()
     if not is_project_folder(project_path):
         print("Error: Not inside a valid project folder.")
         return
 
-    tasks = load_tasks(project_path)
-    new_tasks = [t for t in tasks if t["id"] != args.id]
+    from tracklet.core.task_table import TaskTable
+    table = TaskTable.from_file(get_tasks_file(project_path))
+    if not len(table):
+        print("No tasks found.")
+        return
+
+    conditions = {name: value for name, value in (
+        ("status", args.status), ("priority", args.priority), ("tag", args.tag), ("assignee", args.assignee),
+    ) if value}
+    mask = table.where(**conditions) if conditions else None
+    summary = table.summary(by=args.by, mask=mask)
 
-    if len(new_tasks) == len(tasks):
+    if args.json:
+        import json
+        print(json.dumps({**summary, "by": {
+            name: {("(none)" if key is None else key): count for key, count in counts.items()}
+            for name, counts in summary["by"].items()
+        }}, indent=2))
+        return
+
+    from rich.console import Console
+    from rich.table import Table
+    console = Console()
+    console.print(
+        f"[bold]{summary['total']}[/] tasks, {summary['completed']} completed "
+        f"([green]{summary['percent']:.1f}%[/]), [red]{summary['overdue']}[/] overdue"
+    )
+    for name, counts in summary["by"].items():
+        grouped = Table(title=f"By {name}")
+        grouped.add_column(name.capitalize(), style="cyan")
+        grouped.add_column("Tasks", justify="right", style="magenta")
+        grouped.add_column("Share", justify="right")
+        for key, count in sorted(counts.items(), key=lambda item: -item[1]):
+            share = (count / summary["total"] * 100) if summary["total"] else 0
+            grouped.add_row("(none)" if key is None else str(key), str(count), f"{share:.1f}%")
+        console.print(grouped)
+
+
+def handle_task_remove(args):
+    project_path = Path.cwd()
+    if not is_project_folder(project_path):
+        print("Error: Not inside a valid project folder.")
+        return
+
+    from tracklet.core.task_op import remove_tasks
+    mode = "remove" if args.cascade else "unlink" if args.unlink else "keep"
+    removed = remove_tasks([args.id], project_path, deliverables=mode)
+    if not removed["tasks"]:
         print(f"No task with ID {args.id} found.")
         return
 
-    save_tasks(project_path, new_tasks)
     print(f"Task with ID {args.id} removed successfully.")
+    if removed["deliverables"]:
+        print(f"🗑️ Removed {len(removed['deliverables'])} linked deliverable(s).")
+    if removed["unlinked"]:
+        print(f"🔗 Unlinked {len(removed['unlinked'])} deliverable(s).")
+    if removed["kept"]:
+        print(f"ℹ️ Left {len(removed['kept'])} linked deliverable(s) in place "
+              f"(--cascade removes them, --unlink clears the link).")
+
+def handle_task_archive(args):
+    project_path = Path.cwd()
+    if not is_project_folder(project_path):
+        print("Error: Not inside a valid project folder.")
+        return
+
+    from tracklet.core.task_op import remove_tasks
+    removed = remove_tasks(args.ids, project_path, archive_to=args.changelog)
+    missing = [task_id for task_id in args.ids if task_id not in removed["tasks"]]
+    for task_id in missing:
+        print(f"No task with ID {task_id} found.")
+    if removed["tasks"]:
+        print(f"📦 Archived {len(removed['tasks'])} task(s) and {len(removed['deliverables'])} deliverable(s) to {args.changelog}")
 
 def register_task_commands(subparsers):
     parser_task = subparsers.add_parser("task", help="Manage tasks")
@@ -160,9 +276,38 @@ def register_task_commands(subparsers):
     parser_task_list.add_argument("-s", "--status", help="Filter by status")
     parser_task_list.add_argument("-p", "--priority", help="Filter by priority")
     parser_task_list.add_argument("-t", "--tag", help="Filter by tag")
+    parser_task_list.add_argument("-q", "--query", help="Filter with a query, e.g. 'status:todo priority>=high due<today -tag:ui'")
+    parser_task_list.add_argument("-n", "--limit", type=int, help="Show at most N tasks")
+    parser_task_list.add_argument("--offset", type=int, default=0, help="Skip the first N matching tasks")
+    parser_task_list.add_argument("--sort", help="Sort by field, e.g. due_date (--sort=-priority for descending)")
+    parser_task_list.add_argument("-r", "--reverse", action="store_true", help="Sort in descending order")
+    parser_task_list.add_argument("--stream", action="store_true", help="Print rows as they are read instead of a table")
     parser_task_list.set_defaults(func=handle_task_list)
 
+    # task stats
+    parser_task_stats = task_sub.add_parser("stats", help="Task counts, completion and overdue totals")
+    parser_task_stats.add_argument("--by", nargs="+", choices=["status", "priority", "assignee", "tag"],
+                                   default=["status", "priority", "assignee"], help="Group counts by these columns")
+    parser_task_stats.add_argument("-s", "--status", help="Only tasks with this status")
+    parser_task_stats.add_argument("-p", "--priority", help="Only tasks with this priority")
+    parser_task_stats.add_argument("-t", "--tag", help="Only tasks with this tag")
+    parser_task_stats.add_argument("-a", "--assignee", help="Only tasks assigned to this person")
+    parser_task_stats.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser_task_stats.set_defaults(func=handle_task_stats)
+
     # task remove
     parser_task_remove = task_sub.add_parser("remove", help="Remove a task")
     parser_task_remove.add_argument("id", help="Task ID to remove")
+    linked = parser_task_remove.add_mutually_exclusive_group()
+    linked.add_argument("--cascade", action="store_true", help="Also remove the deliverables linked to the task")
+    linked.add_argument("--unlink", action="store_true", help="Clear related_task_id on the task's deliverables")
     parser_task_remove.set_defaults(func=handle_task_remove)
+
+    # task archive
+    parser_task_archive = task_sub.add_parser("archive", help="Move tasks and their deliverables to the changelog")
+    parser_task_archive.add_argument("ids", nargs="+", help="Task IDs to archive")
+    parser_task_archive.add_argument("--changelog", default="changelog.yaml", help="Changelog file to archive into")
+    parser_task_archive.set_defaults(func=handle_task_archive)
+
+    # task import / task export
+    register_transfer_commands(task_sub, "task")
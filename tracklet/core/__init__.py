@@ -1,12 +1,58 @@
 # tracklet/core/__init__.py
 
-from .actions import create_git_tag, push_git_tags, notify_user, validate_file_schema, remove_task_from_file
-from .changelog import load_changelog, save_changelog, append_to_changelog
-from .rules_engine import evaluate_rules, validate_task, validate_deliverable
-from .task_op import create_task, load_task, save_task, update_task
-from .deliverable_op import (
-    create_deliverable,
-    save_deliverable,
-    update_deliverable
-)
-from .validators import validate_task, validate_deliverable
+# Resolved lazily (PEP 562), like the top-level package: importing one core
+# module (e.g. the rules engine for `task add`) doesn't load every other one.
+
+from importlib import import_module
+
+_LAZY_EXPORTS = {
+    "create_git_tag": "actions",
+    "push_git_tags": "actions",
+    "notify_user": "actions",
+    "validate_file_schema": "actions",
+    "remove_task_from_file": "actions",
+    "load_changelog": "changelog",
+    "iter_changelog": "changelog",
+    "save_changelog": "changelog",
+    "append_to_changelog": "changelog",
+    "append_contexts_to_changelog": "changelog",
+    "append_entries": "changelog",
+    "archive_entries": "changelog",
+    "migrate_changelog": "changelog",
+    "compact_changelog": "changelog",
+    "ChangelogIndex": "changelog",
+    "evaluate_rules": "rules_engine",
+    "evaluate_rules_batch": "rules_engine",
+    "get_ruleset": "rules_engine",
+    "RuleSet": "rules_engine",
+    "create_task": "task_op",
+    "create_tasks": "task_op",
+    "load_task": "task_op",
+    "save_task": "task_op",
+    "update_task": "task_op",
+    "update_tasks": "task_op",
+    "remove_tasks": "task_op",
+    "create_deliverable": "deliverable_op",
+    "save_deliverable": "deliverable_op",
+    "update_deliverable": "deliverable_op",
+    "validate_task": "validators",
+    "validate_deliverable": "validators",
+    "import_records": "bulk",
+    "import_file": "bulk",
+    "export_records": "bulk",
+    "TaskTable": "task_table",
+    "build_report": "report",
+    "project_report": "report",
+    "merge_reports": "report",
+    "Query": "query",
+    "QueryError": "query",
+    "compile_query": "query",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(f"{__name__}.{_LAZY_EXPORTS[name]}"), name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -1,31 +1,45 @@
 # tracklet/actions.py
 
-import subprocess
-import yaml
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
-from .changelog import append_to_changelog
+from typing import Dict, Any, List, Optional
+from tracklet.data_access import snapshot
+from tracklet.data_access.links import get_link_index
+from tracklet.data_access.locking import file_lock
+from tracklet.data_access.store import DeliverableStore, TaskStore
+from .changelog import append_entries, append_to_changelog, append_contexts_to_changelog, archive_entries
+from .git_batch import GitBatch, GitError, failure_of, get_git_batch
 
 
 # --- Git-related Actions ---
 
-def create_git_tag(context: Dict[str, Any], tag: str) -> None:
+# Inside a CLI command these only record the request; the command's GitBatch
+# creates all tags and pushes each remote once when the command finishes.
+
+def create_git_tag(context: Dict[str, Any], tag: str, ref: str = "HEAD") -> None:
     """Creates a Git tag for version tracking."""
-    try:
-        subprocess.run(["git", "tag", tag], check=True)
-        print(f"🏷️ Git tag '{tag}' created.")
-    except subprocess.CalledProcessError:
-        print("❌ Failed to create git tag.")
+    batch = get_git_batch()
+    if batch is None:
+        batch = GitBatch()
+        batch.tag(tag, ref)
+        failure = failure_of(batch.flush(), "git_tag", (tag,))
+        if failure:
+            raise GitError(failure)
+    else:
+        batch.tag(tag, ref)
 
 
-def push_git_tags(context: Dict[str, Any]) -> None:
+def push_git_tags(context: Dict[str, Any], remote: Optional[str] = None) -> None:
     """Pushes all local Git tags to remote."""
-    try:
-        subprocess.run(["git", "push", "--tags"], check=True)
-        print("🚀 Git tags pushed.")
-    except subprocess.CalledProcessError:
-        print("❌ Failed to push git tags.")
+    batch = get_git_batch()
+    if batch is None:
+        batch = GitBatch()
+        batch.push_tags(remote)
+        failure = failure_of(batch.flush(), "push_tags", (remote,))
+        if failure:
+            raise GitError(failure)
+    else:
+        batch.push_tags(remote)
 
 
 # --- Notification and Logging ---
@@ -43,31 +57,116 @@ def validate_file_schema(context: Dict[str, Any], file: str) -> None:
 # --- File Manipulation ---
 
 def remove_task_from_file(
-    context: Dict[str, Any], file: str, task_id_field: str = "id"
+    context: Dict[str, Any], *files: str, task_id_field: str = "id"
     ) -> None:
-    """Removes a task with matching task_id from a YAML file."""
+    """
+    Removes a task with matching task_id from each YAML file; from a
+    deliverables file, removes the deliverables linked to the task.
+    """
+    for file in files or (TaskStore.filename,):
+        removed = _remove_from(file, {context.get("task_id")}, task_id_field)
+        if removed == 0:
+            print(f"ℹ️ Task {context.get('task_id')} not found in {file}")
+        elif removed and Path(file).name == DeliverableStore.filename:
+            print(f"🗑️ Removed {removed} deliverable(s) of task {context.get('task_id')} from {file}")
+        elif removed:
+            print(f"🗑️ Removed task {context.get('task_id')} from {file}")
+
+
+def _remove_from(file: str, task_ids: set, task_id_field: str = "id"):
+    if Path(file).name == DeliverableStore.filename:
+        return _remove_linked_deliverables(file, task_ids)
+    return _remove_tasks(file, task_ids, task_id_field)
+
+
+def _remove_linked_deliverables(file: str, task_ids: set):
+    """Removes the deliverables linked to task_ids (found through the link index) with one write."""
+    if not Path(file).exists():
+        print(f"⚠️ File {file} not found.")
+        return None
+    links = get_link_index(file)
+    linked = [deliverable_id for task_id in task_ids for deliverable_id in links.deliverables_for(task_id)]
+    if not linked:
+        return 0
+    with DeliverableStore(file) as store:
+        return store.delete_many(linked)
+
+
+def _remove_tasks(file: str, task_ids: set, task_id_field: str = "id"):
+    """Removes every task whose id is in task_ids with one locked rewrite; None if nothing to edit."""
     path = Path(file)
     if not path.exists():
         print(f"⚠️ File {file} not found.")
-        return
+        return None
 
-    with open(path, "r") as f:
-        data = yaml.safe_load(f)
+    with file_lock(path):
+        data = snapshot.load_file(path) or {}
 
-    if not isinstance(data.get("tasks"), list):
-        print(f"❌ No tasks found in {file}")
-        return
+        if not isinstance(data.get("tasks"), list):
+            print(f"❌ No tasks found in {file}")
+            return None
 
-    before = len(data["tasks"])
-    data["tasks"] = [t for t in data["tasks"] if t.get(task_id_field) != context.get("task_id")]
-    after = len(data["tasks"])
+        before = len(data["tasks"])
+        data["tasks"] = [t for t in data["tasks"] if t.get(task_id_field) not in task_ids]
+        removed = before - len(data["tasks"])
+        if removed:
+            snapshot.dump_file(path, data)
+    return removed
 
-    if before == after:
-        print(f"ℹ️ Task {context.get('task_id')} not found in {file}")
-    else:
-        with open(path, "w") as f:
-            yaml.dump(data, f)
-        print(f"🗑️ Removed task {context.get('task_id')} from {file}")
+
+# --- Batched forms (one call per group of matched contexts) ---
+
+def notify_users(contexts: List[Dict[str, Any]], message: str = "Task notification") -> None:
+    """Prints one notification for a batch of contexts."""
+    ids = [str(c.get("task_id", "N/A")) for c in contexts]
+    shown = ", ".join(ids[:5]) + (f" (+{len(ids) - 5} more)" if len(ids) > 5 else "")
+    print(f"🔔 Notify: {message} | {len(ids)} context(s): {shown}")
+
+
+def push_git_tags_once(contexts: List[Dict[str, Any]], remote: Optional[str] = None) -> None:
+    """Pushes tags once for the whole batch."""
+    push_git_tags(contexts[0] if contexts else {}, remote)
+
+
+def remove_tasks_from_file(
+    contexts: List[Dict[str, Any]], *files: str, task_id_field: str = "id"
+    ) -> None:
+    """Removes every matched task (or its linked deliverables) from each YAML file in one write."""
+    for file in files or (TaskStore.filename,):
+        removed = _remove_from(file, {c.get("task_id") for c in contexts}, task_id_field)
+        if removed is not None:
+            print(f"🗑️ Removed {removed} record(s) for {len(contexts)} task(s) from {file}")
+
+
+def archive_tasks_to(contexts: List[Dict[str, Any]], file: str = "changelog.yaml") -> None:
+    """
+    Appends the matched tasks and their linked deliverables to a changelog
+    in one write (the `move_to` action); pair it with `remove_from`.
+    """
+    tasks = TaskStore()
+    deliverables = DeliverableStore()
+    records, linked = [], []
+    for context in contexts:
+        task_id = context.get("task_id")
+        records.append(tasks.get(task_id) or {"id": task_id, "title": context.get("title"), "status": context.get("status")})
+        linked.extend(deliverables.linked_to(task_id))
+    append_entries(archive_entries(records, linked), file)
+    print(f"📦 Archived {len(records)} task(s) and {len(linked)} deliverable(s) to {file}")
+
+
+def archive_task_to(context: Dict[str, Any], file: str = "changelog.yaml") -> None:
+    archive_tasks_to([context], file)
+
+
+# `rules/sync_rules.yaml` names for the same operations.
+
+def remove_corresponding_deliverables(context: Dict[str, Any], file: str = DeliverableStore.filename) -> None:
+    """Removes the deliverables linked to the task."""
+    remove_task_from_file(context, file)
+
+
+def remove_corresponding_deliverables_batch(contexts: List[Dict[str, Any]], file: str = DeliverableStore.filename) -> None:
+    remove_tasks_from_file(contexts, file)
 
 
 # --- Action Registry (used by rule engine) ---
@@ -77,6 +176,21 @@ action_registry: Dict[str, Any] = {
     "git_tag": create_git_tag,
     "push_tags": push_git_tags,
     "remove_from": remove_task_from_file,
+    "move_to": archive_task_to,
     "append_changelog": append_to_changelog,
+    "remove_corresponding_deliverables": remove_corresponding_deliverables,
+    "log_to": append_to_changelog,
     "validate": validate_file_schema,
 }
+
+# Actions that can take all matched contexts at once (see evaluate_rules_batch);
+# actions missing here are called once per context.
+batch_action_registry: Dict[str, Any] = {
+    "notify": notify_users,
+    "push_tags": push_git_tags_once,
+    "remove_from": remove_tasks_from_file,
+    "move_to": archive_tasks_to,
+    "append_changelog": append_contexts_to_changelog,
+    "remove_corresponding_deliverables": remove_corresponding_deliverables_batch,
+    "log_to": append_contexts_to_changelog,
+}
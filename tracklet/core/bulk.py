@@ -0,0 +1,147 @@
+# tracklet/core/bulk.py
+
+"""
+Bulk import and export of tasks and deliverables.
+
+An import streams records from CSV or JSON Lines, fills defaults and ids,
+validates them batch by batch, writes the record file once and then fires
+the create/update rules through evaluate_rules_batch, one pass per batch.
+"""
+
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from tracklet.data_access.file_io import generate_deliverable_id, generate_task_id, iter_deliverables, iter_tasks
+from tracklet.data_access.store import DeliverableStore, RecordStore, TaskStore
+from tracklet.data_access.transfer import iter_records, write_records
+# The same validators as `task add` / `deliverable add`, so an import accepts what the CLI accepts.
+from .rules_engine import evaluate_rules_batch, validate_deliverable, validate_task
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 20
+
+
+class RecordKind(NamedTuple):
+    name: str
+    store: type
+    iterate: Callable[[Any], Iterator[Dict[str, Any]]]  # streams the record file
+    validate: Callable[[Dict[str, Any]], Any]
+    generate_id: Callable[[], str]
+    defaults: Dict[str, Any]
+    fields: List[str]  # default export columns
+    created_trigger: str
+    updated_trigger: str
+
+
+KINDS: Dict[str, RecordKind] = {
+    "task": RecordKind(
+        "task", TaskStore, iter_tasks, validate_task, generate_task_id,
+        {"description": "", "priority": "medium", "status": "todo", "assignees": [], "tags": []},
+        ["id", "title", "description", "priority", "status", "assignees", "due_date", "tags"],
+        "on_task_created", "on_task_updated",
+    ),
+    "deliverable": RecordKind(
+        "deliverable", DeliverableStore, iter_deliverables, validate_deliverable, generate_deliverable_id,
+        {"description": "", "status": "todo"},
+        ["id", "title", "description", "type", "status", "due_date", "related_task_id"],
+        "on_deliverable_created", "on_deliverable_updated",
+    ),
+}
+
+
+def _batches(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _prepare(kind: RecordKind, record: Dict[str, Any], keep_ids: bool) -> Dict[str, Any]:
+    prepared = {key: (list(value) if isinstance(value, list) else value) for key, value in kind.defaults.items()}
+    prepared.update(record)
+    if not keep_ids or not prepared.get("id"):
+        prepared["id"] = kind.generate_id()
+    else:
+        prepared["id"] = str(prepared["id"])
+    return prepared
+
+
+def _context(kind: RecordKind, record: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    return {**context, f"{kind.name}_id": record["id"], **record}
+
+
+def import_records(
+    kind_name: str,
+    records: Iterable[Dict[str, Any]],
+    file,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    keep_ids: bool = True,
+    fire_rules: bool = True,
+    dry_run: bool = False,
+    context: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Imports records into `file`. Records whose id already exists replace
+    the stored record (and fire the update trigger); records without an id,
+    or every record when keep_ids is False, get a new id. Invalid records
+    are skipped and reported. An id repeated within the import is imported
+    once, from its last row, and counted in "duplicates". Returns a summary
+    dict.
+    """
+    kind = KINDS[kind_name]
+    context = context or {}
+    store: RecordStore = kind.store(file)
+    store.load()
+    existing = set(store.ids())  # ids before the import; rows put below don't count
+    summary: Dict[str, Any] = {
+        "read": 0, "created": 0, "updated": 0, "invalid": 0, "duplicates": 0, "errors": [],
+        "rules": {"passes": 0, "matched": 0, "action_calls": 0, "errors": 0},
+    }
+    created: Dict[str, Dict[str, Any]] = {}
+    updated: Dict[str, Dict[str, Any]] = {}
+
+    for batch in _batches(records, batch_size):
+        for record in batch:
+            summary["read"] += 1
+            prepared = _prepare(kind, record, keep_ids)
+            is_valid, errors = kind.validate(prepared)
+            if not is_valid:
+                summary["invalid"] += 1
+                if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                    summary["errors"].append({"record": summary["read"], "id": prepared["id"], "errors": errors})
+                continue
+            imported = updated if prepared["id"] in existing else created
+            if prepared["id"] in imported:
+                summary["duplicates"] += 1
+            imported[prepared["id"]] = prepared
+            store.put(prepared)
+
+    summary["created"], summary["updated"] = len(created), len(updated)
+    if dry_run:
+        return summary
+    store.commit()
+
+    if fire_rules:
+        for trigger, imported in ((kind.created_trigger, created), (kind.updated_trigger, updated)):
+            for batch in _batches(imported.values(), batch_size):
+                result = evaluate_rules_batch(trigger, [_context(kind, r, context) for r in batch])
+                rules = summary["rules"]
+                rules["passes"] += 1
+                rules["matched"] += sum(rule["matched"] for rule in result["rules"])
+                rules["action_calls"] += sum(action["calls"] for action in result["actions"])
+                rules["errors"] += result["errors"]
+    return summary
+
+
+def import_file(kind_name: str, path: str, fmt: str, file, **kwargs) -> Dict[str, Any]:
+    """Streams records from a CSV or JSON Lines file into import_records."""
+    return import_records(kind_name, iter_records(path, fmt), file, **kwargs)
+
+
+def export_records(kind_name: str, file, path: str, fmt: str, fields: Optional[List[str]] = None) -> int:
+    """Streams every record in `file` to path ("-" for stdout). Returns the count."""
+    kind = KINDS[kind_name]
+    if not fields and fmt == "csv":
+        fields = kind.fields
+    return write_records(kind.iterate(str(file)), path, fmt, fields)
@@ -1,37 +1,160 @@
 # tracklet/changelog.py
 
-import yaml
+import hashlib
+import json
+import marshal
+import math
+import mmap
+import os
+from array import array
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Sequence, Tuple
+from tracklet.data_access import codec
+from tracklet.data_access.cache import get_cache_dir
+from tracklet.data_access.locking import atomic_write, file_lock
 
-def load_changelog(file: str = "changelog.yaml") -> List[Dict[str, Any]]:
+# The changelog is an append-only YAML multi-document stream. Each entry is
+# written as a single `--- {...}` line (JSON flow mapping), so appending is
+# one buffered write and reading can stream entries line by line. Older
+# changelogs stored a single YAML list; they are migrated on first write.
+DOC_START = "---"
+
+
+def _encode_entry(entry: Dict[str, Any]) -> str:
+    return f"{DOC_START} {json.dumps(entry, ensure_ascii=False, default=str)}\n"
+
+
+def _decode_document(lines: List[str]) -> Optional[Dict[str, Any]]:
+    """Parses one document; single-line JSON entries skip the YAML parser."""
+    if len(lines) == 1 and lines[0].startswith(DOC_START + " {"):
+        try:
+            return json.loads(lines[0][len(DOC_START):])
+        except ValueError:
+            pass
+    try:
+        data = codec.load("".join(lines))
+    except codec.YAMLError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _is_doc_start(line: str) -> bool:
+    return line.startswith(DOC_START) and line[len(DOC_START):len(DOC_START) + 1] in ("", " ", "\n", "\r")
+
+
+def is_legacy_changelog(file: str = "changelog.yaml") -> bool:
+    """True if the file still uses the old single-list format."""
+    path = Path(file)
+    if not path.is_file():
+        return False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped and not stripped.startswith("#"):
+                return not _is_doc_start(line)
+    return False
+
+
+def iter_changelog(file: str = "changelog.yaml") -> Iterator[Dict[str, Any]]:
     """
-    Loads changelog entries from a YAML file.
-    Returns an empty list if file does not exist or is empty.
+    Lazily yields changelog entries in the order they were appended.
+    Legacy list-format files are parsed as a whole.
     """
     path = Path(file)
-    if path.exists():
-        with open(path, "r") as f:
-            return yaml.safe_load(f) or []
-    return []
+    if not path.is_file():
+        return
+    if is_legacy_changelog(file):
+        yield from (codec.load_file(path) or [])
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        doc: List[str] = []
+        for line in f:
+            if _is_doc_start(line):
+                if doc:
+                    entry = _decode_document(doc)
+                    if entry is not None:
+                        yield entry
+                doc = [line]
+            elif doc:
+                doc.append(line)
+        if doc:
+            entry = _decode_document(doc)
+            if entry is not None:
+                yield entry
 
 
-def save_changelog(entries: List[Dict[str, Any]], file: str = "changelog.yaml") -> None:
+def load_changelog(file: str = "changelog.yaml") -> Iterator[Dict[str, Any]]:
     """
-    Saves a list of changelog entries to the given YAML file.
+    Streams changelog entries from a YAML file.
+    Yields nothing if the file does not exist or is empty.
     """
-    with open(Path(file), "w") as f:
-        yaml.dump(entries, f)
+    return iter_changelog(file)
+
+
+def _write_changelog(entries: Iterable[Dict[str, Any]], file: str) -> None:
+    atomic_write(file, "".join(_encode_entry(entry) for entry in entries))
+
 
+def _migrate_unlocked(file: str) -> bool:
+    if not is_legacy_changelog(file):
+        return False
+    _write_changelog(list(iter_changelog(file)), file)
+    return True
 
-def append_to_changelog(context: Dict[str, Any], file: str = "changelog.yaml") -> None:
+
+def save_changelog(entries: Iterable[Dict[str, Any]], file: str = "changelog.yaml") -> None:
     """
-    Appends a new changelog entry using task context.
+    Rewrites the changelog with the given entries in the append-only format.
     """
-    entries = load_changelog(file)
+    with file_lock(file):
+        _write_changelog(entries, file)
+
 
-    entry = {
+def migrate_changelog(file: str = "changelog.yaml") -> bool:
+    """
+    Converts a legacy list-format changelog to the append-only format.
+    Returns True if the file was migrated.
+    """
+    with file_lock(file):
+        return _migrate_unlocked(file)
+
+
+def append_entries(entries: Iterable[Dict[str, Any]], file: str = "changelog.yaml", fsync: bool = False) -> None:
+    """
+    Appends entries with a single buffered write, optionally fsync'ing the file.
+    """
+    data = "".join(_encode_entry(entry) for entry in entries)
+    with file_lock(file):
+        _migrate_unlocked(file)
+        with open(Path(file), "a", encoding="utf-8") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def compact_changelog(file: str = "changelog.yaml", keep: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Rewrites the changelog in canonical one-line form, dropping blank or
+    unreadable documents and, if `keep` is given, all but the newest entries.
+    Returns (entries before, entries after).
+    """
+    if not Path(file).is_file():
+        return 0, 0
+    with file_lock(file):
+        entries = list(iter_changelog(file))
+        before = len(entries)
+        if keep is not None:
+            entries = entries[-keep:] if keep > 0 else []
+        _write_changelog(entries, file)
+    return before, len(entries)
+
+
+def _context_entry(context: Dict[str, Any]) -> Dict[str, Any]:
+    return {
         "timestamp": datetime.utcnow().isoformat(),
         "task_id": context.get("task_id"),
         "summary": context.get("summary", "No summary provided"),
@@ -40,6 +163,279 @@ def append_to_changelog(context: Dict[str, Any], file: str = "changelog.yaml") -
         "stage": context.get("stage"),
     }
 
-    entries.append(entry)
-    save_changelog(entries, file)
+
+def archive_entries(
+    tasks: Iterable[Dict[str, Any]], deliverables: Iterable[Dict[str, Any]] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Changelog entries recording archived tasks and deliverables; each keeps
+    the full record so it can be restored.
+    """
+    now = datetime.utcnow().isoformat()
+    entries = [
+        {"timestamp": now, "task_id": task.get("id"), "summary": f"Archived task: {task.get('title', '')}",
+         "status": task.get("status"), "archived": "task", "record": task}
+        for task in tasks
+    ]
+    entries.extend(
+        {"timestamp": now, "task_id": deliverable.get("related_task_id"),
+         "summary": f"Archived deliverable: {deliverable.get('title', '')}",
+         "status": deliverable.get("status"), "archived": "deliverable", "record": deliverable}
+        for deliverable in deliverables
+    )
+    return entries
+
+
+def append_to_changelog(context: Dict[str, Any], file: str = "changelog.yaml", fsync: bool = False) -> None:
+    """
+    Appends a new changelog entry using task context.
+    """
+    append_entries([_context_entry(context)], file, fsync=fsync)
     print(f"📝 Changelog updated for task {context.get('task_id')}")
+
+
+def append_contexts_to_changelog(
+    contexts: List[Dict[str, Any]], file: str = "changelog.yaml", fsync: bool = False
+) -> None:
+    """
+    Batch form of append_to_changelog: one entry per context, one write.
+    """
+    append_entries([_context_entry(context) for context in contexts], file, fsync=fsync)
+    print(f"📝 Changelog updated for {len(contexts)} task(s)")
+
+
+# --- Offset index ---
+# `.tracklet/cache/<changelog>.idx` next to the log maps entry numbers to
+# byte ranges, timestamps and task ids. Since the log only grows, a refresh
+# indexes just the bytes appended since the last one; a rewrite (compact,
+# migration) replaces the file's inode and triggers a full rebuild.
+CHANGELOG_INDEX_VERSION = 1
+CHANGELOG_INDEX_SUFFIX = ".idx"
+
+
+def _timestamp_key(value: Any) -> float:
+    """Seconds since the epoch for an ISO timestamp (naive = UTC), NaN if unreadable."""
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        try:
+            moment = datetime.fromisoformat(str(value))
+        except ValueError:
+            return math.nan
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _bound(value: Any, default: float, end_of_day: bool = False) -> float:
+    if value is None:
+        return default
+    key = _timestamp_key(value)
+    if math.isnan(key):
+        raise ValueError(f"Invalid timestamp '{value}'; use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS")
+    if end_of_day and len(str(value)) == 10:
+        key += 86400 - 1e-6
+    return key
+
+
+def _is_doc_start_at(mm, pos: int) -> bool:
+    return mm[pos:pos + 3] == b"---" and mm[pos + 3:pos + 4] in (b"", b" ", b"\n", b"\r")
+
+
+def _scan_documents(mm, start: int, end: int) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Byte ranges of the documents between start and end, and the offset up
+    to which they were read. A trailing line without its newline (an
+    append still being written) is left for the next refresh.
+    """
+    ranges: List[Tuple[int, int]] = []
+    doc = None
+    pos = start
+    while pos < end:
+        newline = mm.find(b"\n", pos, end)
+        if newline < 0:
+            break
+        if _is_doc_start_at(mm, pos):
+            if doc is not None:
+                ranges.append((doc, pos))
+            doc = pos
+        pos = newline + 1
+    if doc is not None:
+        ranges.append((doc, pos))
+    return ranges, pos
+
+
+class ChangelogIndex:
+    """
+    Random access to an append-only changelog through a memory map and a
+    sidecar offset index. `tail`, `select` (time window via binary search
+    on timestamps, task id via the task map) and `entries` only decode the
+    entries they return.
+    """
+
+    def __init__(self, file: str = "changelog.yaml"):
+        self.file = Path(file)
+        folder, name = os.path.split(os.path.abspath(self.file))
+        self.index_path = os.path.join(get_cache_dir(folder), name + CHANGELOG_INDEX_SUFFIX)
+        self.starts = array("q")
+        self.ends = array("q")
+        self.stamps = array("d")
+        self.tasks: Dict[str, array] = {}  # task id -> entry numbers
+        self.indexed_size = 0
+        self._inode = None
+        self._tail_digest = b""
+        self._sorted = True
+        self._legacy: Optional[List[Dict[str, Any]]] = None
+        self._fd = None
+        self._mm = None
+        self._opened = False
+
+    # --- Opening and indexing ---
+
+    def open(self, rebuild: bool = False) -> "ChangelogIndex":
+        """Maps the log and brings the index up to date with it."""
+        self.close()
+        self._opened = True
+        if is_legacy_changelog(str(self.file)):
+            # List-format logs have no document offsets; index them in memory.
+            self._legacy = list(iter_changelog(str(self.file)))
+            self._reset()
+            for number, entry in enumerate(self._legacy):
+                self._add(number, 0, 0, entry)
+            return self
+        try:
+            self._fd = open(self.file, "rb")
+        except FileNotFoundError:
+            self._reset()
+            return self
+        st = os.fstat(self._fd.fileno())
+        if st.st_size:
+            self._mm = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        if rebuild or not self._load() or not self._still_valid(st):
+            self._reset()
+        self._inode = st.st_ino
+        if self.indexed_size < st.st_size:
+            self._extend(st.st_size)
+        return self
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fd is not None:
+            self._fd.close()
+            self._fd = None
+        self._opened = False
+
+    def __enter__(self) -> "ChangelogIndex":
+        # `with index.open(rebuild=True):` must not map and load everything a second time.
+        return self if self._opened else self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _reset(self) -> None:
+        self.starts, self.ends, self.stamps = array("q"), array("q"), array("d")
+        self.tasks = {}
+        self.indexed_size = 0
+        self._tail_digest = b""
+        self._sorted = True
+
+    def _digest_last(self) -> bytes:
+        if not self.starts:
+            return b""
+        return hashlib.blake2b(self._mm[self.starts[-1]:self.ends[-1]], digest_size=16).digest()
+
+    def _still_valid(self, st: os.stat_result) -> bool:
+        """Same file, not truncated, and the last indexed entry is where it was."""
+        return (
+            self._inode == st.st_ino
+            and self.indexed_size <= st.st_size
+            and self._digest_last() == self._tail_digest
+        )
+
+    def _add(self, number: int, start: int, end: int, entry: Dict[str, Any]) -> None:
+        stamp = _timestamp_key(entry.get("timestamp"))
+        if self.stamps and not (stamp >= self.stamps[-1]):
+            self._sorted = False  # out of order or unreadable: time queries scan the stamps
+        self.starts.append(start)
+        self.ends.append(end)
+        self.stamps.append(stamp)
+        task_id = entry.get("task_id")
+        if task_id is not None:
+            numbers = self.tasks.get(str(task_id))
+            if numbers is None:
+                numbers = self.tasks[str(task_id)] = array("q")
+            numbers.append(number)
+
+    def _extend(self, size: int) -> None:
+        ranges, self.indexed_size = _scan_documents(self._mm, self.indexed_size, size)
+        added = 0
+        for start, end in ranges:
+            entry = _decode_document(self._mm[start:end].decode("utf-8").splitlines(keepends=True))
+            if entry is not None:
+                self._add(len(self.starts), start, end, entry)
+                added += 1
+        if added:
+            self._tail_digest = self._digest_last()
+            self._save()
+
+    def _load(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as f:
+                data = marshal.loads(f.read())
+            version, inode, size, digest, is_sorted, starts, ends, stamps, tasks = data
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if version != CHANGELOG_INDEX_VERSION:
+            return False
+        self._inode, self.indexed_size, self._tail_digest, self._sorted = inode, size, digest, is_sorted
+        self.starts, self.ends, self.stamps = array("q", starts), array("q", ends), array("d", stamps)
+        self.tasks = {task_id: array("q", numbers) for task_id, numbers in tasks.items()}
+        return True
+
+    def _save(self) -> None:
+        data = (CHANGELOG_INDEX_VERSION, self._inode, self.indexed_size, self._tail_digest, self._sorted,
+                self.starts.tobytes(), self.ends.tobytes(), self.stamps.tobytes(),
+                {task_id: numbers.tobytes() for task_id, numbers in self.tasks.items()})
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            atomic_write(self.index_path, marshal.dumps(data))
+        except OSError:
+            pass  # The index is an optimization only; it is rebuilt in memory next time
+
+    # --- Queries ---
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def entry(self, number: int) -> Dict[str, Any]:
+        if self._legacy is not None:
+            return self._legacy[number]
+        text = self._mm[self.starts[number]:self.ends[number]].decode("utf-8")
+        return _decode_document(text.splitlines(keepends=True)) or {}
+
+    def entries(self, numbers: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.entry(number) for number in numbers]
+
+    def select(self, since: Any = None, until: Any = None, task_id: Optional[str] = None) -> Sequence[int]:
+        """
+        Entry numbers, oldest first, with since <= timestamp <= until and the
+        given task id. Bounds are ISO dates or datetimes (naive = UTC); a
+        date as `until` includes that whole day.
+        """
+        low = _bound(since, -math.inf)
+        high = _bound(until, math.inf, end_of_day=True)
+        if task_id is not None:
+            numbers = self.tasks.get(str(task_id), array("q"))
+            return [n for n in numbers if low <= self.stamps[n] <= high] if since is not None or until is not None else numbers
+        if since is None and until is None:
+            return range(len(self))
+        if self._sorted:
+            return range(bisect_left(self.stamps, low), bisect_right(self.stamps, high))
+        return [n for n, stamp in enumerate(self.stamps) if low <= stamp <= high]
+
+    def tail(self, count: int = 10, **filters: Any) -> List[Dict[str, Any]]:
+        """The newest `count` entries matching select(**filters), oldest first."""
+        numbers = self.select(**filters)
+        return self.entries(numbers[max(0, len(numbers) - count):] if count > 0 else [])
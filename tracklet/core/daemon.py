@@ -0,0 +1,297 @@
+# tracklet/core/daemon.py
+
+"""
+`tracklet daemon`: keeps one workspace's parsed files in memory and serves
+them to CLI processes over a Unix domain socket.
+
+The daemon caches `.projectmeta`, `tasks.yaml` and `deliverables.yaml`
+contents (keyed by path, validated by mtime/size on every request). A watcher re-parses files as soon as they change:
+inotify on Linux, mtime polling elsewhere. Requests are JSON lines:
+
+    {"op": "select", "args": {"file": "/ws/p1/tasks.yaml", "equals": {"status": "todo"}, "limit": 20}}
+    -> {"ok": true, "result": [...]}
+
+`select` runs core.query.select on the cached records, so a client gets
+only the page it asked for instead of the whole file.
+
+Clients go through `data_access.daemon_client.query_daemon`, which
+returns None when no daemon is running so callers read the files directly.
+"""
+
+import json
+import os
+import socketserver
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tracklet.data_access import codec, snapshot
+from tracklet.data_access.cache import file_signature
+from tracklet.data_access.daemon_client import encode_response, get_socket_path, send_request
+from tracklet.data_access.metadata import META_FILENAME
+from tracklet.data_access.tracker import discover_project_dirs
+from .query import select
+
+TASKS_FILENAME = "tasks.yaml"
+DELIVERABLES_FILENAME = "deliverables.yaml"
+WATCHED_FILES = (META_FILENAME, TASKS_FILENAME, DELIVERABLES_FILENAME)
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def _load_records(key: str) -> Callable[[str], List[Dict[str, Any]]]:
+    return lambda path: [item for item in snapshot.iter_items(path, key) if isinstance(item, dict)]
+
+
+LOADERS: Dict[str, Callable[[str], Any]] = {
+    META_FILENAME: codec.load_file,
+    TASKS_FILENAME: _load_records("tasks"),
+    DELIVERABLES_FILENAME: _load_records("deliverables"),
+}
+
+
+class WorkspaceState:
+    """Parsed files of one workspace, re-read only when their mtime or size changes."""
+
+    def __init__(self, base_path, depth: int = 1, recursive: bool = False):
+        self.base_path = os.path.abspath(base_path)
+        self.depth = depth
+        self.recursive = recursive
+        self.files: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self.hits = 0
+        self.loads = 0
+        self.on_new_dir: Optional[Callable[[str], None]] = None  # set by the inotify watcher
+        self._lock = threading.Lock()
+
+    def project_dirs(self) -> List[str]:
+        return discover_project_dirs(self.base_path, depth=self.depth, recursive=self.recursive)
+
+    def check_path(self, path: str) -> str:
+        path = os.path.abspath(path)
+        if os.path.basename(path) not in LOADERS or os.path.commonpath([path, self.base_path]) != self.base_path:
+            raise ValueError(f"Not a tracklet file in this workspace: {path}")
+        return path
+
+    def get(self, path: str) -> Any:
+        """Parsed contents of path (None if missing), from memory when unchanged."""
+        path = self.check_path(path)
+        signature = file_signature(path)
+        cached = self.files.get(path)
+        if cached is not None and cached[0] == signature:
+            self.hits += 1
+            return cached[1]
+        with self._lock:
+            cached = self.files.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            if signature is None:
+                self.files.pop(path, None)
+                return None
+            data = LOADERS[os.path.basename(path)](path)
+            self.loads += 1
+            is_new_dir = not any(os.path.dirname(known) == os.path.dirname(path) for known in self.files)
+            self.files[path] = (signature, data)
+        if is_new_dir and self.on_new_dir is not None:
+            self.on_new_dir(os.path.dirname(path))
+        return data
+
+    def reload(self, path: str) -> None:
+        """Re-parses path if it is cached (or is a project file) and changed."""
+        try:
+            self.get(path)
+        except Exception as e:
+            print(f"⚠️ Failed to reload {path}: {e}", flush=True)
+
+    def warm(self) -> int:
+        """Parses every project's files up front. Returns the number of projects."""
+        projects = self.project_dirs()
+        for project in projects:
+            for name in WATCHED_FILES:
+                if os.path.isfile(os.path.join(project, name)):
+                    self.reload(os.path.join(project, name))
+        return len(projects)
+
+    def known_dirs(self) -> List[str]:
+        return sorted({os.path.dirname(path) for path in list(self.files)})
+
+
+# --- Watchers ---
+
+class PollingWatcher(threading.Thread):
+    """Stats every cached file each `interval` seconds and re-parses the changed ones."""
+
+    kind = "polling"
+
+    def __init__(self, state: WorkspaceState, interval: float = DEFAULT_POLL_INTERVAL):
+        super().__init__(daemon=True, name="tracklet-poll")
+        self.state = state
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            for path, (signature, _) in list(self.state.files.items()):
+                if file_signature(path) != signature:
+                    self.state.reload(path)
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+
+class InotifyWatcher(threading.Thread):
+    """Re-parses project files on inotify events for the folders holding them (Linux only)."""
+
+    kind = "inotify"
+    MASK = 0x00000008 | 0x00000080 | 0x00000100 | 0x00000200  # CLOSE_WRITE, MOVED_TO, CREATE, DELETE
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, state: WorkspaceState):
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        super().__init__(daemon=True, name="tracklet-inotify")
+        self.state = state
+        self.dirs: Dict[int, str] = {}
+        self.stopped = threading.Event()
+        state.on_new_dir = self.watch
+
+    def watch(self, directory: str) -> None:
+        if directory in self.dirs.values():
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+        if wd >= 0:
+            self.dirs[wd] = directory
+
+    def run(self) -> None:
+        import select
+        for directory in self.state.known_dirs():
+            self.watch(directory)
+        while not self.stopped.is_set():
+            ready, _, _ = select.select([self._fd], [], [], 0.5)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            changed = set()
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset += length
+                if name in WATCHED_FILES and wd in self.dirs:
+                    changed.add(os.path.join(self.dirs[wd], name))
+            for path in changed:
+                self.state.reload(path)
+
+    def stop(self) -> None:
+        self.stopped.set()
+        if self.is_alive():
+            self.join(timeout=2)
+        os.close(self._fd)
+
+
+def make_watcher(state: WorkspaceState, poll_interval: Optional[float] = None):
+    """inotify when available, unless a poll interval is given; polling otherwise."""
+    if poll_interval is None and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(state)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(state, poll_interval or DEFAULT_POLL_INTERVAL)
+
+
+# --- Server ---
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = self.server.daemon.dispatch(request.get("op"), request.get("args") or {})
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(encode_response(response))
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TrackletDaemon:
+    """Owns the state, watcher and socket server for one workspace."""
+
+    def __init__(self, base_path, poll_interval: Optional[float] = None, depth: int = 1, recursive: bool = False):
+        self.state = WorkspaceState(base_path, depth=depth, recursive=recursive)
+        self.socket_path = get_socket_path(self.state.base_path)
+        self.poll_interval = poll_interval
+        self.started = time.time()
+        self.watcher = None
+        self.server: Optional[_UnixServer] = None
+        self.ops: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "ping": lambda args: self.status(),
+            "metadata": lambda args: {path: self.state.get(os.path.join(path, META_FILENAME)) for path in args["paths"]},
+            "select": lambda args: list(select(self.state.get(args.pop("file")) or [], **args)),
+            "shutdown": lambda args: self._shutdown(),
+        }
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "base_path": self.state.base_path,
+            "uptime": round(time.time() - self.started, 1),
+            "watcher": getattr(self.watcher, "kind", None),
+            "files": len(self.state.files),
+            "hits": self.state.hits,
+            "loads": self.state.loads,
+        }
+
+    def _shutdown(self) -> bool:
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return True
+
+    def dispatch(self, op: Optional[str], args: Dict[str, Any]) -> Any:
+        handler = self.ops.get(op or "")
+        if handler is None:
+            raise ValueError(f"Unknown operation '{op}'")
+        return handler(args)
+
+    def serve(self) -> None:
+        # Requests made while serving (e.g. by rule actions) must not loop back here.
+        os.environ["TRACKLET_NO_DAEMON"] = "1"
+        if os.path.exists(self.socket_path):
+            try:
+                send_request(self.socket_path, "ping", timeout=1)
+                raise RuntimeError(f"A daemon is already running for {self.state.base_path}")
+            except (OSError, ValueError):
+                os.unlink(self.socket_path)  # stale socket from a daemon that died
+
+        projects = self.state.warm()
+        self.watcher = make_watcher(self.state, self.poll_interval)
+        self.watcher.start()
+
+        old_umask = os.umask(0o177)  # socket readable by this user only
+        try:
+            self.server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon = self
+        print(f"🟢 tracklet daemon serving {self.state.base_path} ({projects} projects, "
+              f"{self.watcher.kind} watcher) on {self.socket_path}", flush=True)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.watcher.stop()
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("🔴 tracklet daemon stopped.", flush=True)
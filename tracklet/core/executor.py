@@ -0,0 +1,255 @@
+# tracklet/core/executor.py
+
+"""
+Asynchronous execution of rule actions.
+
+Matched rules are turned into ActionJobs. An ActionExecutor runs jobs
+concurrently on an asyncio loop: the actions of one job run in order,
+each with a timeout, while a semaphore caps how many actions run at once
+across jobs. Plain functions run in worker threads; coroutine functions
+are awaited directly.
+
+In deferred mode jobs are appended to `.tracklet/queue/actions.jsonl`
+instead and run later by `tracklet actions run`, so the command that
+fired the rule returns immediately. While they run, jobs sit in
+`running.jsonl`; a run that dies leaves them there and the next run puts
+them back in the queue, so no job is lost.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from tracklet.data_access.cache import get_queue_dir
+from tracklet.data_access.locking import LockTimeout, atomic_write, file_lock
+
+ACTION_MODES = ("inline", "async", "deferred")
+QUEUE_FILENAME = "actions.jsonl"
+FAILED_FILENAME = "failed.jsonl"
+RUNNING_FILENAME = "running.jsonl"
+
+
+def default_action_mode() -> str:
+    """How evaluate_rules runs actions; override with TRACKLET_ACTION_MODE."""
+    mode = os.environ.get("TRACKLET_ACTION_MODE", "inline").strip().lower()
+    return mode if mode in ACTION_MODES else "inline"
+
+
+def default_action_timeout() -> float:
+    """Seconds an action may run; override with TRACKLET_ACTION_TIMEOUT."""
+    try:
+        return float(os.environ.get("TRACKLET_ACTION_TIMEOUT", "30"))
+    except ValueError:
+        return 30.0
+
+
+def default_concurrency() -> int:
+    """Actions run at once; override with TRACKLET_ACTION_CONCURRENCY."""
+    try:
+        return max(1, int(os.environ.get("TRACKLET_ACTION_CONCURRENCY", "4")))
+    except ValueError:
+        return 4
+
+
+class ActionJob(NamedTuple):
+    """The actions of one matched rule, to be run in order against one context."""
+    rule_id: str
+    actions: List[Tuple[str, tuple, dict]]
+    context: Dict[str, Any]
+    trigger: str = ""
+
+
+class ActionResult(NamedTuple):
+    rule_id: str
+    action: str
+    ok: bool
+    error: Optional[str]
+    seconds: float
+
+
+class ActionExecutor:
+    """
+    Runs ActionJobs concurrently. `timeouts` can override the timeout for
+    individual action names. A timed-out action is reported as failed and
+    the job moves on; a thread running a plain function cannot be killed,
+    so it finishes in the background.
+    """
+    def __init__(
+        self,
+        action_registry: Dict[str, Callable],
+        timeout: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.action_registry = action_registry
+        self.timeout = default_action_timeout() if timeout is None else timeout
+        self.concurrency = default_concurrency() if concurrency is None else max(1, concurrency)
+        self.timeouts = timeouts or {}
+
+    async def _run_action(self, semaphore, pool, job: ActionJob, action_name, args, kwargs) -> ActionResult:
+        action_fn = self.action_registry.get(action_name)
+        if not action_fn:
+            return ActionResult(job.rule_id, action_name, False, f"Action '{action_name}' not found.", 0.0)
+
+        timeout = self.timeouts.get(action_name, self.timeout)
+        start = time.perf_counter()
+        async with semaphore:
+            try:
+                if inspect.iscoroutinefunction(action_fn):
+                    call = action_fn(job.context, *args, **kwargs)
+                else:
+                    call = asyncio.get_running_loop().run_in_executor(
+                        pool, functools.partial(action_fn, job.context, *args, **kwargs))
+                await asyncio.wait_for(call, timeout=timeout if timeout > 0 else None)
+            except asyncio.TimeoutError:
+                error = f"timed out after {timeout:g}s"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                error = None
+        return ActionResult(job.rule_id, action_name, error is None, error, time.perf_counter() - start)
+
+    async def _run_job(self, semaphore, pool, job: ActionJob) -> List[ActionResult]:
+        # Actions of one rule run strictly in order.
+        return [
+            await self._run_action(semaphore, pool, job, name, args, kwargs)
+            for name, args, kwargs in job.actions
+        ]
+
+    async def run_async(self, jobs: List[ActionJob], pool: Optional[ThreadPoolExecutor] = None) -> List[ActionResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        per_job = await asyncio.gather(*(self._run_job(semaphore, pool, job) for job in jobs))
+        return [result for results in per_job for result in results]
+
+    def run(self, jobs: List[ActionJob]) -> List[ActionResult]:
+        """Runs jobs to completion and returns one result per action, in job order."""
+        if not jobs:
+            return []
+        # A private pool that is not waited on, so a timed-out action doesn't hold up the caller.
+        pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="tracklet-action")
+        try:
+            return asyncio.run(self.run_async(list(jobs), pool))
+        finally:
+            pool.shutdown(wait=False)
+
+
+# --- Deferred mode: on-disk queue ---
+
+def _encode_job(job: ActionJob) -> str:
+    return json.dumps({
+        "rule": job.rule_id,
+        "trigger": job.trigger,
+        "actions": [[name, list(args), kwargs] for name, args, kwargs in job.actions],
+        "context": job.context,
+        "queued_at": datetime.utcnow().isoformat(),
+    }, default=str) + "\n"
+
+
+def _decode_job(line: str) -> Optional[ActionJob]:
+    try:
+        data = json.loads(line)
+        actions = [(name, tuple(args), dict(kwargs)) for name, args, kwargs in data["actions"]]
+        return ActionJob(data["rule"], actions, data.get("context") or {}, data.get("trigger", ""))
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class QueueBusy(RuntimeError):
+    """Raised when another `tracklet actions run` holds the queue."""
+
+
+class ActionQueue:
+    """Append-only JSON-lines queue of ActionJobs under `.tracklet/queue`."""
+
+    def __init__(self, base_path=None):
+        self.dir = Path(get_queue_dir(base_path or Path.cwd()))
+        self.file = self.dir / QUEUE_FILENAME
+        self.failed_file = self.dir / FAILED_FILENAME
+        self.running_file = self.dir / RUNNING_FILENAME
+
+    def enqueue(self, jobs: List[ActionJob]) -> int:
+        if not jobs:
+            return 0
+        self.dir.mkdir(parents=True, exist_ok=True)
+        data = "".join(_encode_job(job) for job in jobs)
+        with file_lock(self.file):
+            with open(self.file, "a", encoding="utf-8") as f:
+                f.write(data)
+        return len(jobs)
+
+    def _lines(self, file: Path) -> List[str]:
+        try:
+            with open(file, "r", encoding="utf-8") as f:
+                return [line for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _read(self, file: Path) -> List[ActionJob]:
+        return [job for job in map(_decode_job, self._lines(file)) if job is not None]
+
+    def pending(self) -> List[ActionJob]:
+        return self._read(self.file)
+
+    def failed(self) -> List[ActionJob]:
+        return self._read(self.failed_file)
+
+    def running(self) -> List[ActionJob]:
+        return self._read(self.running_file)
+
+    def _move_to_running(self, file: Path, limit: Optional[int] = None) -> List[str]:
+        """Moves up to `limit` lines of file (oldest first) to the end of running.jsonl."""
+        if not file.exists():
+            return []
+        with file_lock(file):
+            lines = self._lines(file)
+            taken, rest = (lines, []) if limit is None else (lines[:limit], lines[limit:])
+            if taken:
+                # Written to running.jsonl before leaving file: a crash in between repeats jobs, never drops them.
+                atomic_write(self.running_file, "".join(self._lines(self.running_file) + taken))
+                atomic_write(file, "".join(rest))
+        return taken
+
+    def _requeue_running(self) -> int:
+        """Puts the jobs of a run that never finished back at the front of the queue."""
+        leftovers = self._lines(self.running_file)
+        if leftovers:
+            with file_lock(self.file):
+                atomic_write(self.file, "".join(leftovers + self._lines(self.file)))
+            atomic_write(self.running_file, "")
+        return len(leftovers)
+
+    @contextmanager
+    def claim(self, limit: Optional[int] = None, retry_failed: bool = False) -> Iterator[List[ActionJob]]:
+        """
+        Yields up to `limit` queued jobs (all by default, after the failed ones
+        when retry_failed), oldest first, moving them to running.jsonl. They
+        leave it only when the block exits normally, so record failures inside
+        the block; a run that is killed or interrupted leaves them for the next
+        claim to requeue. Raises QueueBusy while another run holds the queue.
+        """
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with ExitStack() as stack:
+            try:
+                stack.enter_context(file_lock(self.running_file, timeout=0))
+            except LockTimeout:
+                raise QueueBusy("Another `tracklet actions run` is in progress.") from None
+            self._requeue_running()
+            taken = self._move_to_running(self.failed_file) if retry_failed else []
+            taken += self._move_to_running(self.file, limit)
+            yield [job for job in map(_decode_job, taken) if job is not None]
+            atomic_write(self.running_file, "")
+
+    def record_failed(self, jobs: List[ActionJob]) -> None:
+        if not jobs:
+            return
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.failed_file):
+            with open(self.failed_file, "a", encoding="utf-8") as f:
+                f.write("".join(_encode_job(job) for job in jobs))
@@ -0,0 +1,451 @@
+# tracklet/core/expressions.py
+
+"""
+Restricted expression language for rule conditions.
+
+Conditions are parsed and validated once, when a rule is loaded, into a
+tree of Python closures; evaluating a condition never calls `eval` and
+cannot reach builtins, call functions or touch private attributes.
+
+Supported syntax:
+  - literals: numbers, 'strings', "strings", true/false/null, [lists]
+  - durations: 30s, 15m, 24h, 3d, 2w (and `now`, the current time)
+  - names looked up in the context (unknown names are null)
+  - key/attribute access: task.status, task['status']
+  - arithmetic: + and - (time + duration, duration + duration, numbers)
+  - comparisons: == != < <= > >= in, not in (chains like a < b < c)
+  - predicates: `x exists`, `x passed`, `x not exists`, `x not passed`
+  - boolean logic: and, or, not, parentheses
+
+Comparing a point in time with a duration compares its age, so
+`last_updated > 72h` reads "last updated more than 72 hours ago".
+"""
+
+import operator
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+Evaluator = Callable[[Mapping[str, Any]], Any]
+
+
+class ExpressionError(ValueError):
+    """Raised when a condition cannot be parsed or uses a forbidden construct."""
+
+
+# --- Tokenizer ---
+
+DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<duration>\d+(?:\.\d+)?[smhdw])(?![A-Za-z0-9_])
+  | (?P<number>\d+(?:\.\d+)?)(?![A-Za-z_])
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>==|!=|<=|>=|<|>|\+|-|\.|\[|\]|\(|\)|,)
+""", re.VERBOSE)
+
+KEYWORDS = {"and", "or", "not", "in", "exists", "passed", "now", "true", "false", "null", "none"}
+
+_STRING_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", "'": "'", '"': '"'}
+
+
+def _unescape(body: str) -> str:
+    return re.sub(r"\\(.)", lambda m: _STRING_ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+def tokenize(source: str) -> List[Tuple[str, Any, int]]:
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise ExpressionError(f"Unexpected character {source[pos]!r} at position {pos}")
+        kind, text = match.lastgroup, match.group()
+        if kind == "duration":
+            tokens.append(("value", timedelta(**{DURATION_UNITS[text[-1]]: float(text[:-1])}), pos))
+        elif kind == "number":
+            tokens.append(("value", float(text) if "." in text else int(text), pos))
+        elif kind == "string":
+            tokens.append(("value", _unescape(text[1:-1]), pos))
+        elif kind == "name":
+            lowered = text.lower()
+            if lowered in KEYWORDS:
+                tokens.append(("kw", lowered, pos))
+            else:
+                tokens.append(("name", text, pos))
+        elif kind == "op":
+            tokens.append(("op", text, pos))
+        pos = match.end()
+    tokens.append(("end", None, pos))
+    return tokens
+
+
+# --- Value semantics ---
+
+def _now(value: Any = None) -> datetime:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return datetime.now(value.tzinfo)
+    return datetime.now()
+
+
+def _as_time(value: Any) -> Optional[datetime]:
+    """Interprets datetimes, dates and ISO-8601 strings as points in time."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _as_duration(value: Any) -> Optional[timedelta]:
+    """Interprets timedeltas, seconds and points in time (as their age) as durations."""
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return timedelta(seconds=value)
+    moment = _as_time(value)
+    if moment is not None:
+        return _now(moment) - moment
+    return None
+
+
+def _coerce_pair(left: Any, right: Any) -> Tuple[Any, Any]:
+    """Aligns time and duration operands so they can be compared."""
+    if isinstance(left, timedelta) or isinstance(right, timedelta):
+        return _as_duration(left), _as_duration(right)
+    if isinstance(left, (datetime, date)) or isinstance(right, (datetime, date)):
+        return _as_time(left), _as_time(right)
+    return left, right
+
+
+def _compare(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    def compare(left, right):
+        left, right = _coerce_pair(left, right)
+        if left is None or right is None:
+            return False
+        try:
+            return op(left, right)
+        except TypeError:
+            return False
+    return compare
+
+
+def _equals(left, right) -> bool:
+    if isinstance(left, (timedelta, datetime, date)) or isinstance(right, (timedelta, datetime, date)):
+        left, right = _coerce_pair(left, right)
+    return left == right
+
+
+def _contains(left, right) -> bool:
+    if right is None:
+        return False
+    try:
+        return left in right
+    except TypeError:
+        return False
+
+
+COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": _equals,
+    "!=": lambda left, right: not _equals(left, right),
+    "<": _compare(operator.lt),
+    "<=": _compare(operator.le),
+    ">": _compare(operator.gt),
+    ">=": _compare(operator.ge),
+    "in": _contains,
+    "not in": lambda left, right: right is not None and not _contains(left, right),
+}
+
+
+def _add(left, right):
+    if isinstance(left, timedelta) and not isinstance(right, timedelta):
+        left, right = right, left
+    if isinstance(right, timedelta):
+        moment = _as_time(left)
+        if moment is not None:
+            return moment + right
+        if isinstance(left, timedelta):
+            return left + right
+        raise TypeError("can only add a duration to a time or another duration")
+    return left + right
+
+
+def _subtract(left, right):
+    if isinstance(right, timedelta):
+        moment = _as_time(left)
+        if moment is not None:
+            return moment - right
+        if isinstance(left, timedelta):
+            return left - right
+        raise TypeError("can only subtract a duration from a time or another duration")
+    if isinstance(left, (datetime, date, str)) and isinstance(right, (datetime, date, str)):
+        left_time, right_time = _as_time(left), _as_time(right)
+        if left_time is not None and right_time is not None:
+            return left_time - right_time
+    return left - right
+
+
+PASSED_WORDS = {"passed", "pass", "ok", "success", "succeeded", "green", "done", "true"}
+
+
+def is_passed(value: Any) -> bool:
+    """A gate passes if it is true, a passing status word, or a non-empty collection of passing gates."""
+    if value is True:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in PASSED_WORDS
+    if isinstance(value, Mapping):
+        return bool(value) and all(is_passed(v) for v in value.values())
+    if isinstance(value, (list, tuple, set)):
+        return bool(value) and all(is_passed(v) for v in value)
+    return False
+
+
+def exists(value: Any) -> bool:
+    return value is not None and value != ""
+
+
+def _lookup(value: Any, key: Any) -> Any:
+    if isinstance(key, str) and key.startswith("_"):
+        return None
+    if isinstance(value, Mapping):
+        return value.get(key)
+    if isinstance(value, (list, tuple, str)) and isinstance(key, int):
+        try:
+            return value[key]
+        except IndexError:
+            return None
+    if isinstance(key, str) and value is not None:
+        attr = getattr(value, key, None)
+        return None if callable(attr) else attr
+    return None
+
+
+# --- Parser (recursive descent, compiles straight to closures) ---
+
+class _Parser:
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = tokenize(source)
+        self.index = 0
+        self.constants: Dict[Evaluator, Any] = {}  # literal nodes, folded at parse time
+
+    def peek(self, offset: int = 0):
+        return self.tokens[min(self.index + offset, len(self.tokens) - 1)]
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def accept(self, kind: str, value: Any = None) -> bool:
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, kind: str, value: Any = None):
+        token = self.peek()
+        if not self.accept(kind, value):
+            wanted = value if value is not None else kind
+            raise ExpressionError(f"Expected {wanted!r} at position {token[2]} in {self.source!r}")
+        return token
+
+    def error(self, message: str, pos: Optional[int] = None):
+        pos = self.peek()[2] if pos is None else pos
+        raise ExpressionError(f"{message} at position {pos} in {self.source!r}")
+
+    def parse(self) -> Evaluator:
+        node = self.parse_or()
+        if self.peek()[0] != "end":
+            self.error(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def parse_or(self) -> Evaluator:
+        operands = [self.parse_and()]
+        while self.accept("kw", "or"):
+            operands.append(self.parse_and())
+        if len(operands) == 1:
+            return operands[0]
+        if len(operands) == 2:
+            first, second = operands
+            return lambda ctx: bool(first(ctx)) or bool(second(ctx))
+        return lambda ctx: any(operand(ctx) for operand in operands)
+
+    def parse_and(self) -> Evaluator:
+        operands = [self.parse_not()]
+        while self.accept("kw", "and"):
+            operands.append(self.parse_not())
+        if len(operands) == 1:
+            return operands[0]
+        if len(operands) == 2:
+            first, second = operands
+            return lambda ctx: bool(first(ctx)) and bool(second(ctx))
+        return lambda ctx: all(operand(ctx) for operand in operands)
+
+    def parse_not(self) -> Evaluator:
+        if self.accept("kw", "not"):
+            operand = self.parse_not()
+            return lambda ctx: not operand(ctx)
+        return self.parse_comparison()
+
+    def _comparison_op(self) -> Optional[str]:
+        kind, value, _ = self.peek()
+        if kind == "op" and value in ("==", "!=", "<", "<=", ">", ">="):
+            self.advance()
+            return value
+        if kind == "kw" and value == "in":
+            self.advance()
+            return "in"
+        if kind == "kw" and value == "not" and self.peek(1)[:2] == ("kw", "in"):
+            self.advance()
+            self.advance()
+            return "not in"
+        return None
+
+    def parse_comparison(self) -> Evaluator:
+        left = self.parse_additive()
+
+        # Postfix predicates: `x exists`, `x not passed`, ...
+        negate = self.peek()[:2] == ("kw", "not") and self.peek(1)[:2] in (("kw", "exists"), ("kw", "passed"))
+        if negate:
+            self.advance()
+        if self.accept("kw", "exists"):
+            return (lambda ctx: not exists(left(ctx))) if negate else (lambda ctx: exists(left(ctx)))
+        if self.accept("kw", "passed"):
+            return (lambda ctx: not is_passed(left(ctx))) if negate else (lambda ctx: is_passed(left(ctx)))
+
+        chain = []
+        op = self._comparison_op()
+        while op is not None:
+            chain.append((COMPARISONS[op], self.parse_additive()))
+            op = self._comparison_op()
+        if not chain:
+            return left
+        if len(chain) == 1:
+            compare, right = chain[0]
+            if right in self.constants:
+                constant = self.constants[right]
+                return lambda ctx: compare(left(ctx), constant)
+            return lambda ctx: compare(left(ctx), right(ctx))
+
+        def evaluate_chain(ctx):
+            current = left(ctx)
+            for compare, right in chain:
+                value = right(ctx)
+                if not compare(current, value):
+                    return False
+                current = value
+            return True
+        return evaluate_chain
+
+    def parse_additive(self) -> Evaluator:
+        node = self.parse_unary()
+        while True:
+            if self.accept("op", "+"):
+                left, right = node, self.parse_unary()
+                node = (lambda l, r: lambda ctx: _add(l(ctx), r(ctx)))(left, right)
+            elif self.accept("op", "-"):
+                left, right = node, self.parse_unary()
+                node = (lambda l, r: lambda ctx: _subtract(l(ctx), r(ctx)))(left, right)
+            else:
+                return node
+
+    def parse_unary(self) -> Evaluator:
+        if self.accept("op", "-"):
+            operand = self.parse_unary()
+            return lambda ctx: -operand(ctx)
+        return self.parse_postfix()
+
+    def parse_postfix(self) -> Evaluator:
+        node = self.parse_primary()
+        while True:
+            if self.accept("op", "."):
+                kind, name, pos = self.peek()
+                if kind not in ("name", "kw"):
+                    self.error("Expected a field name after '.'")
+                self.advance()
+                if name.startswith("_"):
+                    self.error(f"Access to private field {name!r} is not allowed", pos)
+                node = (lambda base, key: lambda ctx: _lookup(base(ctx), key))(node, name)
+            elif self.accept("op", "["):
+                key = self.parse_or()
+                self.expect("op", "]")
+                node = (lambda base, key: lambda ctx: _lookup(base(ctx), key(ctx)))(node, key)
+            elif self.peek()[:2] == ("op", "("):
+                self.error("Function calls are not allowed")
+            else:
+                return node
+
+    def constant(self, value: Any) -> Evaluator:
+        node = lambda ctx: value
+        self.constants[node] = value
+        return node
+
+    def parse_primary(self) -> Evaluator:
+        kind, value, pos = self.peek()
+        if kind == "value":
+            self.advance()
+            return self.constant(value)
+        if kind == "name":
+            self.advance()
+            if value.startswith("_"):
+                self.error(f"Access to private name {value!r} is not allowed", pos)
+            return lambda ctx: ctx.get(value)
+        if kind == "kw":
+            if value == "now":
+                self.advance()
+                return lambda ctx: _now()
+            if value in ("true", "false", "null", "none"):
+                self.advance()
+                return self.constant({"true": True, "false": False}.get(value))
+        if self.accept("op", "("):
+            node = self.parse_or()
+            self.expect("op", ")")
+            return node
+        if self.accept("op", "["):
+            items = []
+            if not self.accept("op", "]"):
+                items.append(self.parse_or())
+                while self.accept("op", ","):
+                    items.append(self.parse_or())
+                self.expect("op", "]")
+            if all(item in self.constants for item in items):
+                return self.constant([self.constants[item] for item in items])
+            return lambda ctx: [item(ctx) for item in items]
+        if kind == "end":
+            self.error("Unexpected end of expression")
+        self.error(f"Unexpected {value!r}")
+
+
+class Condition:
+    """A parsed, validated condition; call `evaluate(context)` to test it."""
+
+    __slots__ = ("source", "_evaluate")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._evaluate = _Parser(source).parse()
+
+    def evaluate(self, context: Mapping[str, Any]) -> bool:
+        return bool(self._evaluate(context))
+
+    __call__ = evaluate
+
+    def __repr__(self) -> str:
+        return f"Condition({self.source!r})"
+
+
+def compile_condition(source: Any) -> Condition:
+    """Parses a condition string, raising ExpressionError if it is invalid or unsafe."""
+    return Condition(str(source))
@@ -0,0 +1,143 @@
+# tracklet/core/git_batch.py
+
+"""
+Coalesces git operations requested by rule actions.
+
+While a GitBatch is active (see `collect_git_operations`, which the CLI
+wraps around every command), `git_tag` and `push_tags` actions only record
+what they want. On flush, HEAD and other refs are resolved with one
+`git rev-parse`, every new tag is created in one `git update-ref --stdin`
+transaction, and each remote is pushed at most once. flush reports which
+tags and remotes failed, so callers can mark the actions that asked for
+them as failed.
+"""
+
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class GitError(RuntimeError):
+    """Raised by git actions run outside a batch when git fails."""
+
+
+def _git(args: List[str], cwd=None, input: Optional[str] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=cwd, input=input, capture_output=True, text=True, check=True)
+
+
+class GitBatch:
+    """Collects tag and push requests and applies them with a fixed number of git calls."""
+
+    def __init__(self, cwd=None):
+        self.cwd = cwd
+        self.tags: Dict[str, str] = {}  # tag name -> ref it should point at
+        self.remotes: List[Optional[str]] = []  # None pushes to the default remote
+        self.commands = 0  # git processes spawned by flush
+        self._lock = threading.Lock()
+
+    def tag(self, name: str, ref: str = "HEAD") -> None:
+        with self._lock:
+            self.tags.setdefault(name, ref)
+
+    def push_tags(self, remote: Optional[str] = None) -> None:
+        with self._lock:
+            if remote not in self.remotes:
+                self.remotes.append(remote)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.tags or self.remotes)
+
+    def _run(self, args: List[str], input: Optional[str] = None) -> subprocess.CompletedProcess:
+        self.commands += 1
+        return _git(args, cwd=self.cwd, input=input)
+
+    def _create_tags(self, tags: Dict[str, str]) -> List[str]:
+        listed = self._run(["for-each-ref", "--format=%(refname)", "refs/tags"]).stdout.split()
+        existing = {ref[len("refs/tags/"):] for ref in listed}
+        new = {name: ref for name, ref in tags.items() if name not in existing}
+        for name in tags:
+            if name in existing:
+                print(f"ℹ️ Git tag '{name}' already exists.")
+        if not new:
+            return []
+
+        refs = sorted(set(new.values()))
+        shas = dict(zip(refs, self._run(["rev-parse", "--verify", "--end-of-options", *refs]).stdout.split()))
+        transaction = "".join(f"create refs/tags/{name} {shas[ref]}\n" for name, ref in new.items())
+        self._run(["update-ref", "--stdin"], input=transaction)
+        return list(new)
+
+    def flush(self) -> Dict[str, Any]:
+        """
+        Applies everything collected so far. Returns {"tags": created,
+        "pushed": remotes, "failed_tags": {tag: reason},
+        "failed_remotes": {remote: reason}}; the default remote is None.
+        """
+        with self._lock:
+            tags, self.tags = self.tags, {}
+            remotes, self.remotes = self.remotes, []
+
+        created, pushed = [], []
+        failed_tags: Dict[str, str] = {}
+        failed_remotes: Dict[Optional[str], str] = {}
+        if tags:
+            try:
+                created = self._create_tags(tags)
+                if created:
+                    shown = ", ".join(created[:5]) + (f" (+{len(created) - 5} more)" if len(created) > 5 else "")
+                    print(f"🏷️ Git tag(s) created: {shown}")
+            except (OSError, subprocess.CalledProcessError) as e:
+                reason = (getattr(e, 'stderr', None) or str(e)).strip()
+                # One transaction: none of the requested tags was created.
+                failed_tags = {name: reason for name in tags}
+                print(f"❌ Failed to create git tags: {reason}")
+        for remote in remotes:
+            try:
+                self._run(["push", *([remote] if remote else []), "--tags"])
+                pushed.append(remote or "default remote")
+                print(f"🚀 Git tags pushed to {remote or 'default remote'}.")
+            except (OSError, subprocess.CalledProcessError) as e:
+                reason = (getattr(e, 'stderr', None) or str(e)).strip()
+                failed_remotes[remote] = reason
+                print(f"❌ Failed to push git tags to {remote or 'default remote'}: {reason}")
+        return {"tags": created, "pushed": pushed, "failed_tags": failed_tags, "failed_remotes": failed_remotes}
+
+
+def failure_of(flushed: Dict[str, Any], action_name: str, args: tuple = (), kwargs: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Why a `git_tag` or `push_tags` action with these arguments failed in the flush result, or None."""
+    kwargs = kwargs or {}
+    if action_name == "git_tag":
+        return flushed["failed_tags"].get(kwargs.get("tag", args[0] if args else None))
+    if action_name == "push_tags":
+        return flushed["failed_remotes"].get(kwargs.get("remote", args[0] if args else None))
+    return None
+
+
+_active: Optional[GitBatch] = None
+
+
+def get_git_batch() -> Optional[GitBatch]:
+    """The batch collecting git operations for the running command, if any."""
+    return _active
+
+
+@contextmanager
+def collect_git_operations(cwd=None) -> Iterator[GitBatch]:
+    """
+    Activates a GitBatch for the duration of the block and flushes it on
+    exit, also when the block fails, so work already done is still tagged.
+    Nested blocks share the outer batch.
+    """
+    global _active
+    if _active is not None:
+        yield _active
+        return
+    _active = batch = GitBatch(cwd)
+    try:
+        yield batch
+    finally:
+        _active = None
+        if batch.pending:
+            batch.flush()
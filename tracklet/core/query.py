@@ -0,0 +1,492 @@
+# tracklet/core/query.py
+
+"""
+Search query language shared by `project search --query` and
+`task list --query`, and `select`, the filter/sort/page pipeline behind
+`task list` that a running daemon also applies to its in-memory records.
+
+A query is a list of terms that must all match:
+
+    stage:Development tag:python -tag:ai author~dan due<2026-11-01
+
+  - field:value    equals, ignoring case (field:a,b matches either; for
+                   list fields such as tag/assignee, any element matches;
+                   field:none matches a missing value)
+  - field!=value   does not equal
+  - field~text     contains text, ignoring case
+  - field<value    also <=, >, >=; dates (YYYY-MM-DD or `today`),
+                   priorities by rank, other values as text
+  - bare words     contain the word in the default text fields
+                   (name/description, or title/description for tasks)
+  - -term, NOT     negation; OR and parentheses group alternatives
+  - "quoted"       values with spaces or special characters
+
+The query is parsed once into a predicate tree. Each node carries an
+estimated cost and selectivity; AND children are ordered so cheap,
+selective predicates run first (and OR children so likely ones do), and
+evaluation short-circuits, so substring matches on long text only run on
+records that survived the cheaper checks.
+"""
+
+import re
+from datetime import date
+from itertools import islice
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .task_table import _date_ordinal
+
+Record = Dict[str, Any]
+Predicate = Callable[[Record], bool]
+
+
+class QueryError(ValueError):
+    """Raised when a query cannot be parsed or names an unknown field."""
+
+
+class FieldSpec(NamedTuple):
+    get: Callable[[Record], Any]
+    kind: str  # "text", "enum", "list" or "date"
+    cost: float = 1.0  # relative cost of reading and comparing the value
+    order: Optional[Dict[str, int]] = None  # ranks for <, > on enums
+
+
+def _key(name: str) -> Callable[[Record], Any]:
+    return lambda record: record.get(name)
+
+
+PRIORITY_ORDER = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+PROJECT_FIELDS: Dict[str, FieldSpec] = {
+    "name": FieldSpec(_key("name"), "text", 2),
+    "description": FieldSpec(_key("description"), "text", 4),
+    "author": FieldSpec(_key("author"), "text", 1),
+    "tag": FieldSpec(_key("tags"), "list", 1.5),
+    "stage": FieldSpec(lambda meta: (meta.get("progress") or {}).get("stage"), "enum", 1),
+    "created": FieldSpec(_key("created"), "date", 2),
+    "updated": FieldSpec(_key("last_updated"), "date", 2),
+}
+
+TASK_FIELDS: Dict[str, FieldSpec] = {
+    "id": FieldSpec(_key("id"), "enum", 1),
+    "title": FieldSpec(_key("title"), "text", 2),
+    "description": FieldSpec(_key("description"), "text", 4),
+    "status": FieldSpec(_key("status"), "enum", 1),
+    "priority": FieldSpec(_key("priority"), "enum", 1, PRIORITY_ORDER),
+    "assignee": FieldSpec(_key("assignees"), "list", 1.5),
+    "tag": FieldSpec(_key("tags"), "list", 1.5),
+    "due": FieldSpec(_key("due_date"), "date", 2),
+}
+
+ALIASES = {"tags": "tag", "assignees": "assignee", "due_date": "due", "last_updated": "updated"}
+
+SCHEMAS = {
+    "project": (PROJECT_FIELDS, ("name", "description")),
+    "task": (TASK_FIELDS, ("title", "description")),
+}
+
+
+# --- Tokenizer ---
+
+_TERM_RE = re.compile(r"""
+    (?P<field>[A-Za-z_][A-Za-z0-9_]*)
+    (?P<op><=|>=|!=|:|~|<|>|=)
+    (?P<value>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^\s()]*)
+""", re.VERBOSE)
+_WORD_RE = re.compile(r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^\s()]+)""")
+KEYWORDS = {"AND", "OR", "NOT"}
+
+
+def _unquote(text: str) -> Tuple[str, bool]:
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        return re.sub(r"\\(.)", r"\1", text[1:-1]), True
+    return text, False
+
+
+def tokenize(source: str) -> List[Tuple[str, Any, int]]:
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        char = source[pos]
+        if char.isspace():
+            pos += 1
+            continue
+        if char in "()":
+            tokens.append((char, char, pos))
+            pos += 1
+            continue
+        if char == "-" and pos + 1 < len(source) and not source[pos + 1].isspace():
+            tokens.append(("NOT", "-", pos))
+            pos += 1
+            continue
+        match = _TERM_RE.match(source, pos)
+        if match:
+            tokens.append(("term", (match.group("field"), match.group("op"), match.group("value")), pos))
+        else:
+            match = _WORD_RE.match(source, pos)
+            word, quoted = _unquote(match.group())
+            if not quoted and word in KEYWORDS:
+                tokens.append((word, word, pos))
+            else:
+                tokens.append(("word", word, pos))
+        pos = match.end()
+    tokens.append(("end", None, len(source)))
+    return tokens
+
+
+# --- Predicate tree ---
+
+class Node:
+    """A predicate with an estimated evaluation cost and selectivity (share of records matched)."""
+    cost: float
+    selectivity: float
+
+    def compile(self) -> Predicate:
+        raise NotImplementedError
+
+    def explain(self) -> str:
+        raise NotImplementedError
+
+
+class Term(Node):
+    def __init__(self, source: str, test: Predicate, cost: float, selectivity: float):
+        self.source, self.test, self.cost, self.selectivity = source, test, cost, selectivity
+
+    def compile(self) -> Predicate:
+        return self.test
+
+    def explain(self) -> str:
+        return self.source
+
+
+class Not(Node):
+    def __init__(self, child: Node):
+        self.child = child
+        self.cost, self.selectivity = child.cost, 1 - child.selectivity
+
+    def compile(self) -> Predicate:
+        test = self.child.compile()
+        return lambda record: not test(record)
+
+    def explain(self) -> str:
+        child = self.child.explain()
+        return f"-({child})" if isinstance(self.child, (And, Or)) else f"-{child}"
+
+
+class And(Node):
+    def __init__(self, children: Sequence[Node]):
+        # Cheap and selective first: ascending cost / (1 - selectivity)
+        self.children = sorted(children, key=lambda n: n.cost / max(1 - n.selectivity, 1e-6))
+        self.cost, passing = 0.0, 1.0
+        for child in self.children:
+            self.cost += passing * child.cost
+            passing *= child.selectivity
+        self.selectivity = passing
+
+    def compile(self) -> Predicate:
+        tests = [child.compile() for child in self.children]
+        if len(tests) == 1:
+            return tests[0]
+
+        def matches(record: Record) -> bool:
+            for test in tests:
+                if not test(record):
+                    return False
+            return True
+        return matches
+
+    def explain(self) -> str:
+        return " ".join(_group(child) for child in self.children)
+
+
+class Or(Node):
+    def __init__(self, children: Sequence[Node]):
+        # Cheap and likely first: ascending cost / selectivity
+        self.children = sorted(children, key=lambda n: n.cost / max(n.selectivity, 1e-6))
+        self.cost, failing = 0.0, 1.0
+        for child in self.children:
+            self.cost += failing * child.cost
+            failing *= 1 - child.selectivity
+        self.selectivity = 1 - failing
+
+    def compile(self) -> Predicate:
+        tests = [child.compile() for child in self.children]
+
+        def matches(record: Record) -> bool:
+            for test in tests:
+                if test(record):
+                    return True
+            return False
+        return matches
+
+    def explain(self) -> str:
+        return " OR ".join(child.explain() for child in self.children)
+
+
+def _group(node: Node) -> str:
+    return f"({node.explain()})" if isinstance(node, Or) else node.explain()
+
+
+def _make_and(children: List[Node]) -> Node:
+    flat: List[Node] = []
+    for child in children:
+        flat.extend(child.children if isinstance(child, And) else [child])
+    return flat[0] if len(flat) == 1 else And(flat)
+
+
+def _make_or(children: List[Node]) -> Node:
+    flat: List[Node] = []
+    for child in children:
+        flat.extend(child.children if isinstance(child, Or) else [child])
+    return flat[0] if len(flat) == 1 else Or(flat)
+
+
+# --- Term compilation ---
+
+def _text(value: Any) -> str:
+    return str(value).lower()
+
+
+def _ordinal_value(spec: FieldSpec, raw: str) -> Any:
+    if spec.kind == "date":
+        ordinal = date.today().toordinal() if raw.lower() == "today" else _date_ordinal(raw)
+        if not ordinal:
+            raise QueryError(f"Expected a date (YYYY-MM-DD or today), got '{raw}'")
+        return ordinal
+    if spec.order is not None:
+        if raw.lower() not in spec.order:
+            raise QueryError(f"Expected one of {', '.join(spec.order)}, got '{raw}'")
+        return spec.order[raw.lower()]
+    return raw.lower()
+
+
+def _comparable(spec: FieldSpec) -> Callable[[Any], Any]:
+    if spec.kind == "date":
+        cache: Dict[Any, Optional[int]] = {}  # due dates repeat a lot; parse each once
+
+        def convert(value):
+            try:
+                return cache[value]
+            except KeyError:
+                ordinal = cache[value] = _date_ordinal(value) or None
+                return ordinal
+            except TypeError:
+                return _date_ordinal(value) or None
+        return convert
+    if spec.order is not None:
+        return lambda value: spec.order.get(_text(value)) if value is not None else None
+    return lambda value: _text(value) if value not in (None, "") else None
+
+
+_COMPARISONS = {
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b, ">=": lambda a, b: a >= b,
+}
+
+
+def _equals(spec: FieldSpec, values: List[str]) -> Tuple[Predicate, float]:
+    get = spec.get
+    wanted = {value.lower() for value in values}
+    missing = "none" in wanted
+    if spec.kind == "date":
+        ordinals, convert = {_ordinal_value(spec, value) for value in values if value.lower() != "none"}, _comparable(spec)
+        return (lambda r: convert(get(r)) in ordinals or (missing and not get(r))), 0.1
+    if spec.kind == "list":
+        return (lambda r: not wanted.isdisjoint(map(_text, get(r) or ())) or (missing and not get(r))), min(1.0, 0.3 * len(wanted))
+    if len(wanted) == 1 and not missing:
+        (single,) = wanted
+        return (lambda r: (value := get(r)) is not None and _text(value) == single), 0.15
+
+    def test(record):
+        value = get(record)
+        return _text(value) in wanted if value not in (None, "") else missing
+    return test, min(1.0, 0.15 * len(wanted))
+
+
+def _contains(spec: FieldSpec, needles: List[str]) -> Tuple[Predicate, float]:
+    get = spec.get
+    needles = [needle.lower() for needle in needles]
+    if spec.kind == "list":
+        def test(record):
+            return any(needle in _text(item) for item in get(record) or [] for needle in needles)
+    else:
+        def test(record):
+            value = get(record)
+            if value is None:
+                return False
+            text = _text(value)
+            return any(needle in text for needle in needles)
+    return test, min(1.0, 0.3 * len(needles))
+
+
+def _compile_term(schema: Dict[str, FieldSpec], field: str, op: str, raw: str) -> Term:
+    name = ALIASES.get(field.lower(), field.lower())
+    spec = schema.get(name)
+    if spec is None:
+        raise QueryError(f"Unknown field '{field}'; expected one of {', '.join(sorted(schema))}")
+    value, quoted = _unquote(raw)
+    if value == "" and not quoted:
+        raise QueryError(f"Missing value after '{field}{op}'")
+    source = f"{name}{op}{raw}"
+    values = [value] if quoted else [v for v in value.split(",") if v]
+
+    if op in (":", "=", "!="):
+        test, selectivity = _equals(spec, values)
+        term = Term(source, test, spec.cost, selectivity)
+        return Not(term) if op == "!=" else term
+    if op == "~":
+        test, selectivity = _contains(spec, values)
+        return Term(source, test, spec.cost * 3, selectivity)
+
+    if spec.kind == "list":
+        raise QueryError(f"'{op}' does not apply to the list field '{name}'")
+    bound, compare, convert, get = _ordinal_value(spec, value), _COMPARISONS[op], _comparable(spec), spec.get
+
+    def test(record):
+        converted = convert(get(record))
+        return converted is not None and compare(converted, bound)
+    return Term(source, test, spec.cost * 1.5, 0.5)
+
+
+def _compile_word(schema: Dict[str, FieldSpec], fields: Sequence[str], word: str) -> Node:
+    return _make_or([
+        Term(f'{field}~"{word}"' if " " in word else f"{field}~{word}",
+             _contains(schema[field], [word])[0], schema[field].cost * 3, 0.3)
+        for field in fields
+    ])
+
+
+# --- Parser ---
+
+class _Parser:
+    def __init__(self, source: str, schema: Dict[str, FieldSpec], text_fields: Sequence[str]):
+        self.source = source
+        self.schema = schema
+        self.text_fields = text_fields
+        self.tokens = tokenize(source)
+        self.pos = 0
+
+    def peek(self) -> str:
+        return self.tokens[self.pos][0]
+
+    def take(self) -> Tuple[str, Any, int]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self) -> Node:
+        if self.peek() == "end":
+            raise QueryError("Empty query")
+        node = self.parse_or()
+        if self.peek() != "end":
+            kind, text, pos = self.take()
+            raise QueryError(f"Unexpected '{text}' at position {pos}")
+        return node
+
+    def parse_or(self) -> Node:
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.take()
+            children.append(self.parse_and())
+        return _make_or(children)
+
+    def parse_and(self) -> Node:
+        children = [self.parse_unary()]
+        while self.peek() not in ("OR", ")", "end"):
+            if self.peek() == "AND":
+                self.take()
+            children.append(self.parse_unary())
+        return _make_and(children)
+
+    def parse_unary(self) -> Node:
+        kind, value, pos = self.take()
+        if kind == "NOT":
+            return Not(self.parse_unary())
+        if kind == "(":
+            node = self.parse_or()
+            if self.take()[0] != ")":
+                raise QueryError(f"Unclosed '(' at position {pos}")
+            return node
+        if kind == "term":
+            return _compile_term(self.schema, *value)
+        if kind == "word":
+            return _compile_word(self.schema, self.text_fields, value)
+        raise QueryError(f"Unexpected '{value or 'end of query'}' at position {pos}")
+
+
+class Query:
+    """A parsed query; call it with a record (project metadata or task dict)."""
+
+    def __init__(self, source: str, target: str = "task"):
+        if target not in SCHEMAS:
+            raise QueryError(f"Unknown query target '{target}'")
+        schema, text_fields = SCHEMAS[target]
+        self.source = source
+        self.target = target
+        self.root = _Parser(source, schema, text_fields).parse()
+        self._test = self.root.compile()
+
+    def __call__(self, record: Record) -> bool:
+        return isinstance(record, dict) and self._test(record)
+
+    def filter(self, records):
+        return filter(self, records)
+
+    def explain(self) -> str:
+        """The predicates in evaluation order."""
+        return self.root.explain()
+
+
+def compile_query(source: str, target: str = "task") -> Query:
+    return Query(source, target)
+
+
+# --- Selecting records ---
+
+def record_filter(equals: Optional[Dict[str, Any]] = None, tag: Optional[str] = None,
+                  query: Optional[str] = None, target: str = "task") -> Predicate:
+    """One predicate for all filters, so each record is tested in a single pass."""
+    checks: List[Predicate] = [
+        (lambda record, field=field, value=value: record.get(field) == value)
+        for field, value in (equals or {}).items() if value
+    ]
+    if tag:
+        checks.append(lambda record: tag in (record.get("tags") or []))
+    if query:
+        checks.append(Query(query, target))  # ordered by estimated selectivity
+    return lambda record: all(check(record) for check in checks)
+
+
+def sort_key(field: str, descending: bool = False) -> Callable[[Record], Any]:
+    """Sort key for a record field; priorities sort by rank, missing values sort last in either order."""
+    missing = -1 if descending else 1
+
+    def key(record):
+        value = record.get(field)
+        if value is None or value == "":
+            return (missing, 0, "")
+        if field == "priority" and value in PRIORITY_ORDER:
+            return (0, 0, PRIORITY_ORDER[value])
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return (0, 0, value)
+        return (0, 1, str(value))
+    return key
+
+
+def select(records, equals: Optional[Dict[str, Any]] = None, tag: Optional[str] = None,
+           query: Optional[str] = None, target: str = "task", sort: Optional[str] = None,
+           descending: bool = False, offset: int = 0, limit: Optional[int] = None):
+    """
+    Filters records, then applies sort, offset and limit lazily. Sorting with
+    a limit keeps only offset+limit records in a heap. Raises QueryError for
+    a bad query before any record is read.
+    """
+    records = filter(record_filter(equals, tag, query, target), records)
+    offset = max(offset or 0, 0)
+    end = offset + limit if limit is not None else None
+    if sort:
+        import heapq
+        key = sort_key(sort, descending)
+        if end is not None:
+            records = (heapq.nlargest if descending else heapq.nsmallest)(end, records, key=key)
+        else:
+            records = sorted(records, key=key, reverse=descending)
+    return islice(records, offset, end)
@@ -0,0 +1,151 @@
+# tracklet/core/report.py
+
+"""
+Portfolio report across every project in a workspace.
+
+Each project is summarized on its own (metadata, tasks and deliverables)
+into a partial aggregate; partials are computed on a process pool, since
+YAML parsing is CPU-bound, and merged in the parent. Merging is
+associative, so the order in which workers finish does not matter.
+"""
+
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from tracklet.data_access import snapshot
+from tracklet.data_access.file_io import get_deliverables_file, get_tasks_file
+from tracklet.data_access.metadata import read_metadata
+from .task_table import COMPLETED_STATUSES, TaskTable, _date_ordinal
+
+UNKNOWN = "Unknown"
+
+
+def _totals() -> Dict[str, int]:
+    return {"total": 0, "completed": 0, "overdue": 0}
+
+
+def empty_report() -> Dict[str, Any]:
+    return {
+        "projects": [],
+        "stages": {},
+        "tasks": _totals(),
+        "deliverables": _totals(),
+        "authors": {},
+        "errors": [],
+    }
+
+
+def _deliverable_totals(path: Path, today_ordinal: int) -> Dict[str, int]:
+    totals = _totals()
+    for deliverable in snapshot.iter_items(path, "deliverables"):
+        if not isinstance(deliverable, dict):
+            continue
+        totals["total"] += 1
+        if deliverable.get("status") in COMPLETED_STATUSES:
+            totals["completed"] += 1
+        elif 0 < _date_ordinal(deliverable.get("due_date")) < today_ordinal:
+            totals["overdue"] += 1
+    return totals
+
+
+def _task_totals(project_path: Path, meta: Dict[str, Any], today: date) -> Dict[str, int]:
+    tasks_file = get_tasks_file(project_path)
+    if not tasks_file.is_file():
+        # Projects without tasks.yaml only track progress in .projectmeta
+        tasks = (meta.get("progress") or {}).get("tasks") or {}
+        completed = len(tasks.get("completed") or [])
+        return {"total": completed + len(tasks.get("todo") or []), "completed": completed, "overdue": 0}
+    table = TaskTable.from_file(tasks_file)
+    completion = table.completion()
+    return {"total": completion["total"], "completed": completion["completed"], "overdue": table.overdue(today)}
+
+
+def project_report(project_path, today: Optional[date] = None) -> Dict[str, Any]:
+    """Partial report for one project, in the same shape as the merged report."""
+    today = today or date.today()
+    project_path = Path(project_path)
+    report = empty_report()
+    try:
+        meta = read_metadata(project_path) or {}
+        tasks = _task_totals(project_path, meta, today)
+        deliverables = _deliverable_totals(get_deliverables_file(project_path), today.toordinal())
+    except Exception as e:
+        report["errors"].append({"path": str(project_path), "error": str(e)})
+        return report
+
+    stage = (meta.get("progress") or {}).get("stage") or UNKNOWN
+    author = meta.get("author") or UNKNOWN
+    report["projects"].append({
+        "name": meta.get("name") or project_path.name,
+        "path": str(project_path),
+        "stage": stage,
+        "author": author,
+        "tasks": tasks,
+        "deliverables": deliverables,
+    })
+    report["stages"][stage] = 1
+    report["tasks"] = dict(tasks)
+    report["deliverables"] = dict(deliverables)
+    report["authors"][author] = {"projects": 1, **tasks}
+    return report
+
+
+def _add_counts(into: Dict[str, int], counts: Dict[str, int]) -> None:
+    for key, value in counts.items():
+        into[key] = into.get(key, 0) + value
+
+
+def merge_reports(into: Dict[str, Any], partial: Dict[str, Any]) -> Dict[str, Any]:
+    """Adds `partial` into `into` (in place) and returns it."""
+    into["projects"].extend(partial["projects"])
+    into["errors"].extend(partial["errors"])
+    _add_counts(into["stages"], partial["stages"])
+    _add_counts(into["tasks"], partial["tasks"])
+    _add_counts(into["deliverables"], partial["deliverables"])
+    for author, counts in partial["authors"].items():
+        _add_counts(into["authors"].setdefault(author, {}), counts)
+    return into
+
+
+def _percent(counts: Dict[str, int]) -> float:
+    return (counts["completed"] / counts["total"] * 100) if counts.get("total") else 0.0
+
+
+def _finish(report: Dict[str, Any]) -> Dict[str, Any]:
+    report["projects"].sort(key=lambda p: (p["name"].lower(), p["path"]))
+    for counts in (report["tasks"], report["deliverables"], *report["authors"].values(),
+                   *(p[kind] for p in report["projects"] for kind in ("tasks", "deliverables"))):
+        counts["percent"] = round(_percent(counts), 1)
+    report["project_count"] = len(report["projects"])
+    return report
+
+
+def build_report(project_paths: Iterable[Any], jobs: Optional[int] = None, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Merged report over project_paths. Projects are summarized on up to
+    `jobs` worker processes (default: one per CPU); jobs=1, or a single
+    project, runs in this process.
+    """
+    paths: List[str] = [str(path) for path in project_paths]
+    today = today or date.today()
+    jobs = (os.cpu_count() or 1) if jobs is None else max(1, jobs)
+    jobs = min(jobs, len(paths))
+    report = empty_report()
+
+    partials = None
+    if jobs > 1:
+        from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+        from functools import partial
+        chunksize = max(1, len(paths) // (jobs * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                partials = list(pool.map(partial(project_report, today=today), paths, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenExecutor) as e:
+            print(f"⚠️ Process pool unavailable ({e}); building the report serially.")
+    if partials is None:
+        partials = (project_report(path, today) for path in paths)
+
+    for partial_report in partials:
+        merge_reports(report, partial_report)
+    return _finish(report)
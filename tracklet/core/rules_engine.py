@@ -1,11 +1,19 @@
 # tracklet/rules_engine.py
 
-import yaml
+import json
+import os
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, List, Callable, Optional, Tuple
+from tracklet.core.expressions import ExpressionError, compile_condition
+from tracklet.data_access import codec
 
 RULES_DIR = Path("rules/operations")
 
+# Within this window a cached RuleSet is reused without touching the disk,
+# so bulk operations firing thousands of triggers never re-scan the rules.
+RULES_RECHECK_SECONDS = 2.0
+
 class Rule:
     """
     Represents a single automation rule loaded from YAML.
@@ -13,80 +21,287 @@ class Rule:
       - a trigger name (e.g. on_task_saved)
       - an optional condition (as an expression)
       - one or more actions to execute
+    The condition and action list are compiled once, when the rule is built;
+    conditions use the restricted language in tracklet.core.expressions.
     """
     def __init__(self, rule_data: Dict[str, Any]):
         self.id = rule_data.get("id", "unnamed-rule")
         self.trigger = rule_data.get("trigger")
         self.condition = rule_data.get("condition")
-        self.actions = rule_data.get("actions", [])
+        self.actions = rule_data.get("actions", rule_data.get("sync", []))  # sync_rules.yaml says `sync:`
+        self._condition_code = self._compile_condition()
+        self._compiled_actions = self._compile_actions()
+
+    def _compile_condition(self):
+        if not self.condition:
+            return None
+        try:
+            return compile_condition(self.condition)
+        except ExpressionError as e:
+            print(f"[RuleEngine] Condition error in rule '{self.id}': {e}")
+            return False
+
+    def _compile_actions(self) -> List[Tuple[str, tuple, dict]]:
+        """
+        Normalizes actions to (name, args, kwargs): a mapping value becomes
+        keyword arguments, a list positional arguments, `true`/null no
+        arguments, and any other scalar a single positional argument.
+        """
+        compiled = []
+        for action in self.actions or []:
+            if isinstance(action, str):
+                compiled.append((action, (), {}))
+                continue
+            if not isinstance(action, dict) or not action:
+                print(f"[RuleEngine] Invalid action format in rule '{self.id}'")
+                continue
+            action_name, params = next(iter(action.items()))
+            if isinstance(params, dict):
+                compiled.append((action_name, (), params))
+            elif isinstance(params, list):
+                compiled.append((action_name, tuple(params), {}))
+            elif params is True or params is None:
+                compiled.append((action_name, (), {}))
+            else:
+                compiled.append((action_name, (params,), {}))
+        return compiled
 
     def is_triggered_by(self, trigger_name: str) -> bool:
         return self.trigger == trigger_name
 
-    def evaluate_condition(self, context: Dict[str, Any]) -> bool:
-        if not self.condition:
+    def matches(self, context: Dict[str, Any]) -> bool:
+        """Like evaluate_condition, but lets evaluation errors propagate."""
+        if self._condition_code is None:
             return True  # No condition means always true
+        if self._condition_code is False:
+            return False  # Condition failed to compile
+        return self._condition_code.evaluate(context)
 
+    def evaluate_condition(self, context: Dict[str, Any]) -> bool:
         try:
-            # Safe condition evaluation
-            return eval(self.condition, {}, context)
+            return self.matches(context)
         except Exception as e:
             print(f"[RuleEngine] Condition error in rule '{self.id}': {e}")
             return False
 
     def execute_actions(self, context: Dict[str, Any], action_registry: Dict[str, Callable]) -> None:
-        for action in self.actions:
-            if isinstance(action, str):
-                action_name, params = action, {}
-            elif isinstance(action, dict):
-                action_name, params = next(iter(action.items()))
-            else:
-                print(f"[RuleEngine] Invalid action format in rule '{self.id}'")
-                continue
-
+        for action_name, args, kwargs in self._compiled_actions:
             action_fn = action_registry.get(action_name)
             if not action_fn:
                 print(f"[RuleEngine] Action '{action_name}' not found.")
                 continue
 
             try:
-                action_fn(context=context, **params)
+                action_fn(context, *args, **kwargs)
             except Exception as e:
                 print(f"[RuleEngine] Action '{action_name}' failed: {e}")
 
 
-def load_rules(trigger_name: str) -> List[Rule]:
+class RuleSet:
     """
-    Loads all rule YAML files and filters those matching the given trigger.
+    Every rule from a rules directory, parsed once and indexed by trigger,
+    so dispatching a trigger is a dict lookup.
     """
-    rules = []
-    for file in RULES_DIR.glob("*.yaml"):
-        with open(file, "r") as f:
+    def __init__(self, rules: List[Rule], signature: tuple = ()):
+        self.rules = rules
+        self.signature = signature
+        self.by_trigger: Dict[str, List[Rule]] = {}
+        for rule in rules:
+            self.by_trigger.setdefault(rule.trigger, []).append(rule)
+
+    def for_trigger(self, trigger_name: str) -> List[Rule]:
+        return self.by_trigger.get(trigger_name, [])
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @classmethod
+    def from_data(cls, files: Dict[str, Any], signature: tuple = ()) -> "RuleSet":
+        """Builds a RuleSet from {filename: parsed YAML}, in filename order."""
+        rules = []
+        for name in sorted(files):
+            rule_data = files[name]
+            if isinstance(rule_data, list):
+                rules.extend(Rule(entry) for entry in rule_data if isinstance(entry, dict))
+        return cls(rules, signature)
+
+
+def _rules_signature(rules_dir: Path) -> tuple:
+    """(filename, mtime_ns, size) for every rule file; changes whenever a file is edited, added or removed."""
+    signature = []
+    try:
+        entries = list(os.scandir(rules_dir))
+    except (FileNotFoundError, NotADirectoryError):
+        return ()
+    for entry in entries:
+        if entry.name.endswith(".yaml") and entry.is_file():
+            st = entry.stat()
+            signature.append((entry.name, st.st_mtime_ns, st.st_size))
+    return tuple(sorted(signature))
+
+
+def _parse_rule_files(rules_dir: Path, signature: tuple) -> Dict[str, Any]:
+    files = {}
+    for name, _, _ in signature:
+        file = rules_dir / name
+        with open(file, "r", encoding="utf-8") as f:
             try:
-                rule_data = yaml.safe_load(f)
-                if isinstance(rule_data, list):
-                    for entry in rule_data:
-                        rule = Rule(entry)
-                        if rule.is_triggered_by(trigger_name):
-                            rules.append(rule)
+                files[name] = codec.load(f)
             except Exception as e:
                 print(f"[RuleEngine] Failed to parse {file}: {e}")
-    return rules
+                files[name] = None
+    return files
 
 
-def evaluate_rules(trigger: str, context: Dict[str, Any], action_registry: Dict[str, Callable]) -> None:
+_ruleset_cache: Dict[str, Tuple[float, RuleSet]] = {}
+
+
+def get_ruleset(rules_dir: Optional[Path] = None, refresh: bool = False) -> RuleSet:
+    """
+    Returns the compiled RuleSet for rules_dir (default RULES_DIR).
+    Cached in-process, keyed by the rule files' names, mtimes and sizes;
+    re-validated at most every RULES_RECHECK_SECONDS unless refresh is set.
+    """
+    rules_dir = Path(rules_dir or RULES_DIR)
+    key = os.path.abspath(rules_dir)
+    now = time.monotonic()
+
+    cached = _ruleset_cache.get(key)
+    if cached and not refresh and now - cached[0] < RULES_RECHECK_SECONDS:
+        return cached[1]
+
+    signature = _rules_signature(rules_dir)
+    if cached and cached[1].signature == signature:
+        _ruleset_cache[key] = (now, cached[1])
+        return cached[1]
+
+    if not signature:
+        ruleset = RuleSet([], signature)
+    else:
+        ruleset = RuleSet.from_data(_parse_rule_files(rules_dir, signature), signature)
+
+    _ruleset_cache[key] = (now, ruleset)
+    return ruleset
+
+
+def load_rules(trigger_name: str) -> List[Rule]:
+    """
+    Returns the rules matching the given trigger from the cached RuleSet.
+    """
+    return list(get_ruleset().for_trigger(trigger_name))
+
+
+def evaluate_rules(
+    trigger: str, context: Dict[str, Any], action_registry: Dict[str, Callable], mode: Optional[str] = None
+) -> None:
     """
     Main evaluation entrypoint.
-    Loads and executes rules based on trigger name and context.
+    Looks up the rules for the trigger name and executes them against context.
+
+    mode (default TRACKLET_ACTION_MODE, else "inline") selects how matched
+    actions run: "inline" calls them one by one, "async" runs matched rules
+    concurrently through an ActionExecutor, and "deferred" queues them for
+    `tracklet actions run` and returns immediately.
     """
+    from tracklet.core.executor import ActionExecutor, ActionJob, ActionQueue, default_action_mode
+    mode = mode or default_action_mode()
+
     print(f"[RuleEngine] Evaluating rules for trigger: '{trigger}'")
-    for rule in load_rules(trigger):
+    jobs = []
+    for rule in get_ruleset().for_trigger(trigger):
         if rule.evaluate_condition(context):
             print(f"[RuleEngine] ✅ Rule matched: {rule.id}")
-            rule.execute_actions(context, action_registry)
+            if mode == "inline":
+                rule.execute_actions(context, action_registry)
+            else:
+                jobs.append(ActionJob(rule.id, rule._compiled_actions, context, trigger))
         else:
             print(f"[RuleEngine] ❌ Rule skipped: {rule.id} (condition false)")
 
+    if jobs and mode == "deferred":
+        ActionQueue().enqueue(jobs)
+        print(f"[RuleEngine] ⏳ Queued actions for {len(jobs)} rule(s); run `tracklet actions run`.")
+    elif jobs:
+        for result in ActionExecutor(action_registry).run(jobs):
+            if not result.ok:
+                print(f"[RuleEngine] Action '{result.action}' failed: {result.error}")
+
+
+def _action_key(action_name: str, args: tuple, kwargs: dict) -> str:
+    return json.dumps([action_name, args, kwargs], sort_keys=True, default=str)
+
+
+def evaluate_rules_batch(
+    trigger: str,
+    contexts: List[Dict[str, Any]],
+    action_registry: Optional[Dict[str, Callable]] = None,
+    batch_registry: Optional[Dict[str, Callable]] = None,
+) -> Dict[str, Any]:
+    """
+    Bulk counterpart of evaluate_rules. Every rule's condition is evaluated
+    over the whole batch, matched contexts are grouped per distinct action
+    call (same name and arguments, across rules), and each group runs once:
+    actions in batch_registry receive the list of contexts in one call,
+    the rest are called per context. Nothing is printed per rule; a summary
+    dict with per-rule and per-action counts and errors is returned.
+    """
+    if action_registry is None or batch_registry is None:
+        from tracklet.core import actions
+        action_registry = actions.action_registry if action_registry is None else action_registry
+        batch_registry = actions.batch_action_registry if batch_registry is None else batch_registry
+
+    contexts = list(contexts)
+    summary: Dict[str, Any] = {"trigger": trigger, "contexts": len(contexts), "rules": [], "actions": [], "errors": 0}
+    groups: Dict[str, Dict[str, Any]] = {}
+
+    for rule in get_ruleset().for_trigger(trigger):
+        matched, errors = [], []
+        for context in contexts:
+            try:
+                if rule.matches(context):
+                    matched.append(context)
+            except Exception as e:
+                errors.append(str(e))
+        summary["rules"].append({
+            "id": rule.id,
+            "matched": len(matched),
+            "skipped": len(contexts) - len(matched) - len(errors),
+            "errors": errors,
+        })
+        summary["errors"] += len(errors)
+        if not matched:
+            continue
+        for action_name, args, kwargs in rule._compiled_actions:
+            group = groups.setdefault(_action_key(action_name, args, kwargs), {
+                "action": action_name, "args": args, "kwargs": kwargs, "rules": [], "contexts": [],
+            })
+            group["rules"].append(rule.id)
+            group["contexts"].extend(matched)
+
+    for group in groups.values():
+        action_name, args, kwargs, matched = group["action"], group["args"], group["kwargs"], group["contexts"]
+        result = {"action": action_name, "rules": group["rules"], "contexts": len(matched),
+                  "batched": action_name in batch_registry, "calls": 0, "errors": []}
+        if result["batched"]:
+            try:
+                result["calls"] = 1
+                batch_registry[action_name](matched, *args, **kwargs)
+            except Exception as e:
+                result["errors"].append(str(e))
+        elif action_name not in action_registry:
+            result["errors"].append(f"Action '{action_name}' not found.")
+        else:
+            action_fn = action_registry[action_name]
+            for context in matched:
+                result["calls"] += 1
+                try:
+                    action_fn(context, *args, **kwargs)
+                except Exception as e:
+                    result["errors"].append(str(e))
+        summary["actions"].append(result)
+        summary["errors"] += len(result["errors"])
+    return summary
+
 
 # --- Validation helpers (can be moved out to validators.py later) ---
 
@@ -1,8 +1,11 @@
 # tracklet/task_op.py
 
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from tracklet.data_access.file_io import load_task, save_task
-from .rules_engine import evaluate_rules
+from pathlib import Path
+from tracklet.data_access.store import DeliverableStore, TaskStore
+from .changelog import append_entries, archive_entries
+from .rules_engine import evaluate_rules, evaluate_rules_batch
 from .actions import action_registry
 from .validators import validate_task
 
@@ -26,6 +29,67 @@ def update_task(task_data: Dict[str, Any], context: Dict[str, Any]) -> Tuple[boo
     evaluate_rules("on_task_updated", context, action_registry)
     return True, []
 
+def _save_tasks_batch(trigger: str, tasks: List[Dict[str, Any]], context: Dict[str, Any],
+                      file: str = "tasks.yaml") -> Dict[str, Any]:
+    valid, invalid = [], {}
+    for task in tasks:
+        is_valid, errors = validate_task(task)
+        if is_valid:
+            valid.append(task)
+        else:
+            invalid[task.get("id", f"#{len(valid) + len(invalid)}")] = errors
+
+    with TaskStore(file) as store:
+        store.put_many(valid)
+    contexts = [{**context, "task_id": task.get("id"), **task} for task in valid]
+    summary = evaluate_rules_batch(trigger, contexts, action_registry)
+    summary["saved"] = len(valid)
+    summary["invalid"] = invalid
+    return summary
+
+def create_tasks(tasks: List[Dict[str, Any]], context: Dict[str, Any], file: str = "tasks.yaml") -> Dict[str, Any]:
+    """Bulk create: one file write and one batched rule pass; returns the rule summary."""
+    return _save_tasks_batch("on_task_created", tasks, context, file)
+
+def update_tasks(tasks: List[Dict[str, Any]], context: Dict[str, Any], file: str = "tasks.yaml") -> Dict[str, Any]:
+    """Bulk update: one file write and one batched rule pass; returns the rule summary."""
+    return _save_tasks_batch("on_task_updated", tasks, context, file)
+
+LINKED_DELIVERABLES = ("remove", "unlink", "keep")
+
+def remove_tasks(task_ids: List[str], project_path=".", deliverables: str = "remove",
+                 archive_to: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Removes tasks and, depending on `deliverables`, the deliverables linked
+    to them (found through the link index): "remove" deletes them, "unlink"
+    clears their related_task_id and "keep" leaves them untouched. With
+    archive_to, the removed records are appended to that changelog first.
+    One write per file; returns {"tasks", "deliverables", "unlinked", "kept"} ids.
+    """
+    if deliverables not in LINKED_DELIVERABLES:
+        raise ValueError(f"deliverables must be one of {', '.join(LINKED_DELIVERABLES)}")
+    tasks = TaskStore.for_project(project_path)
+    store = DeliverableStore.for_project(project_path)
+    found = [task for task in (tasks.get(task_id) for task_id in task_ids) if task]
+    linked = [deliverable for task in found for deliverable in store.linked_to(task["id"])]
+    cascade = deliverables == "remove"
+
+    if archive_to:
+        append_entries(archive_entries(found, linked if cascade else ()), str(Path(project_path) / archive_to))
+
+    with tasks:
+        tasks.delete_many(task["id"] for task in found)
+    if linked and deliverables != "keep":  # otherwise deliverables.yaml is never loaded, only its link index
+        with store:
+            if cascade:
+                store.delete_many(deliverable["id"] for deliverable in linked)
+            else:
+                store.put_many({**deliverable, "related_task_id": None} for deliverable in linked)
+    ids = [deliverable["id"] for deliverable in linked]
+    return {"tasks": [task["id"] for task in found],
+            **{key: ids if deliverables == mode else []
+               for key, mode in (("deliverables", "remove"), ("unlinked", "unlink"), ("kept", "keep"))}}
+
 def submit_task(task_id: str, context: Dict[str, Any]) -> Tuple[bool, list]:
     task = load_task(task_id)
     if not task:
@@ -0,0 +1,278 @@
+# tracklet/core/task_table.py
+
+"""
+Columnar, category-encoded view of a project's tasks for aggregate queries.
+
+Each categorical field is stored as an integer code array plus a list of
+categories (code 0 is "missing"); multi-valued fields such as assignees
+and tags are stored CSR-style as offsets into one flat code array. Counts
+and filters then work on flat integer arrays: with NumPy installed they
+are vectorized (`bincount`, boolean masks); without it, filters and
+grouped counts use one arbitrary-precision int bitmap per category, so
+AND/OR and `bit_count` process a machine word of rows at a time.
+"""
+
+import operator
+from array import array
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+COMPLETED_STATUSES = {"completed", "done"}
+CATEGORY_FIELDS = ("status", "priority")
+MULTI_FIELDS = {"assignee": "assignees", "tag": "tags"}  # column name -> task field
+
+_numpy = None
+
+
+def _np():
+    """NumPy if it is installed (imported on first use), otherwise None."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _bitmap(flags) -> int:
+    """Packs an iterable of 0/1 (or bool) per row into an int with bit i set for row i."""
+    digits = bytes(flags).translate(_BITS)
+    return int(digits[::-1], 2) if digits else 0
+
+
+def _date_ordinal(value: Any) -> int:
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    if isinstance(value, str) and value:
+        try:
+            return date.fromisoformat(value[:10]).toordinal()
+        except ValueError:
+            return 0
+    return 0
+
+
+class Categories:
+    """Maps category values to dense integer codes; code 0 means missing."""
+
+    def __init__(self):
+        self.values: List[Any] = [None]
+        self.index: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        if value is None or value == "":
+            return 0
+        value = str(value)
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class TaskTable:
+    """
+    Tasks as columns. Build with `from_records` or `from_file`, then use
+    `where` for filters and `count_by`, `completion` and `overdue` for
+    aggregates; every aggregate accepts an optional mask from `where`.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.categories: Dict[str, Categories] = {name: Categories() for name in (*CATEGORY_FIELDS, *MULTI_FIELDS)}
+        self.codes: Dict[str, array] = {name: array("i") for name in CATEGORY_FIELDS}
+        self.offsets: Dict[str, array] = {name: array("i", [0]) for name in MULTI_FIELDS}
+        self.multi_codes: Dict[str, array] = {name: array("i") for name in MULTI_FIELDS}
+        self.multi_rows: Dict[str, array] = {name: array("i") for name in MULTI_FIELDS}  # row of each code
+        self.due = array("i")  # date ordinals, 0 if missing
+        self._np_cache: Dict[str, Any] = {}
+
+    # --- Building ---
+
+    def append(self, task: Dict[str, Any]) -> None:
+        for name in CATEGORY_FIELDS:
+            self.codes[name].append(self.categories[name].code(task.get(name)))
+        for name, field in MULTI_FIELDS.items():
+            values = task.get(field) or []
+            if isinstance(values, str):
+                values = [values]
+            codes, rows, categories = self.multi_codes[name], self.multi_rows[name], self.categories[name]
+            seen = set()
+            for value in values:
+                code = categories.code(value)
+                if code and code not in seen:
+                    seen.add(code)
+                    codes.append(code)
+                    rows.append(self.size)
+            self.offsets[name].append(len(codes))
+        self.due.append(_date_ordinal(task.get("due_date")))
+        self.size += 1
+        self._np_cache.clear()
+
+    @classmethod
+    def from_records(cls, tasks: Iterable[Dict[str, Any]]) -> "TaskTable":
+        table = cls()
+        for task in tasks:
+            if isinstance(task, dict):
+                table.append(task)
+        return table
+
+    @classmethod
+    def from_file(cls, path) -> "TaskTable":
+        from tracklet.data_access.file_io import iter_tasks, select_from_daemon
+        cached = select_from_daemon(path, {})  # every task, already parsed by a running daemon
+        return cls.from_records(iter_tasks(path) if cached is None else cached)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def columns(self) -> List[str]:
+        return [*CATEGORY_FIELDS, *MULTI_FIELDS, "due"]
+
+    # --- NumPy views (zero-copy over the array buffers) ---
+
+    def _as_np(self, key: str, buffer: array):
+        cached = self._np_cache.get(key)
+        if cached is None:
+            np = _np()
+            cached = self._np_cache[key] = np.frombuffer(buffer, dtype=np.int32) if len(buffer) else np.zeros(0, np.int32)
+        return cached
+
+    def _rows_of(self, name: str):
+        return self._as_np(f"{name}:rows", self.multi_rows[name])
+
+    def _empty_rows(self, name: str):
+        """Mask of rows with no value in a multi-valued column."""
+        offsets = self.offsets[name]
+        if _np():
+            return _np().diff(self._as_np(f"{name}:offsets", offsets)) == 0
+        return _bitmap(map(operator.eq, offsets, offsets[1:]))
+
+    # --- Bitmaps (without NumPy: one int per category, bit i set for row i) ---
+
+    def _bitmaps(self, name: str) -> List[int]:
+        cached = self._np_cache.get(f"{name}:bitmaps")
+        if cached is None:
+            if name in self.codes:
+                column = self.codes[name]
+                cached = [_bitmap(map(code.__eq__, column)) for code in range(len(self.categories[name]))]
+            else:
+                flags = [bytearray(self.size) for _ in range(len(self.categories[name]))]
+                for row, code in zip(self.multi_rows[name], self.multi_codes[name]):
+                    flags[code][row] = 1
+                cached = [_bitmap(f) for f in flags]
+                cached[0] = self._empty_rows(name)
+            self._np_cache[f"{name}:bitmaps"] = cached
+        return cached
+
+    # --- Filters ---
+
+    def where(self, **conditions: Any):
+        """
+        Mask of rows matching every condition, e.g. where(status="todo",
+        tag="ui"). A value may be a single category or a collection of them.
+        Returns a NumPy bool array, or an int bitmap without NumPy.
+        """
+        np = _np()
+        mask = np.ones(self.size, dtype=bool) if np else (1 << self.size) - 1
+        for name, wanted in conditions.items():
+            if name not in self.categories:
+                raise KeyError(f"Unknown column '{name}'")
+            if isinstance(wanted, (str, type(None))):
+                wanted = [wanted]
+            categories = self.categories[name]
+            codes = {0 if w is None else categories.index.get(str(w), -1) for w in wanted}
+            codes.discard(-1)
+            if not np:
+                bitmaps = self._bitmaps(name)
+                hit = 0
+                for code in codes:
+                    hit |= bitmaps[code]
+                mask &= hit
+            elif name in self.codes:
+                mask &= np.isin(self._as_np(name, self.codes[name]), list(codes))
+            else:
+                hit = np.zeros(self.size, dtype=bool)
+                hit[self._rows_of(name)[np.isin(self._as_np(name, self.multi_codes[name]), list(codes))]] = True
+                if 0 in codes:
+                    hit |= self._empty_rows(name)
+                mask &= hit
+        return mask
+
+    def selected(self, mask=None) -> int:
+        if mask is None:
+            return self.size
+        return int(mask.sum()) if _np() else mask.bit_count()
+
+    # --- Aggregates ---
+
+    def count_by(self, name: str, mask=None) -> Dict[Any, int]:
+        """Rows per category (tasks with no value count under None); multi-valued columns count each value."""
+        np = _np()
+        categories = self.categories[name]
+        single = name in self.codes
+        if np:
+            if single:
+                column = self._as_np(name, self.codes[name])
+                counts = np.bincount(column if mask is None else column[mask], minlength=len(categories))
+            else:
+                column, empty = self._as_np(name, self.multi_codes[name]), self._empty_rows(name)
+                if mask is not None:
+                    column, empty = column[mask[self._rows_of(name)]], empty & mask
+                counts = np.bincount(column, minlength=len(categories))
+                counts[0] = int(empty.sum())
+            counts = counts.tolist()
+        elif mask is None:
+            counter = Counter(self.codes[name] if single else self.multi_codes[name])
+            if not single:
+                counter[0] = self._empty_rows(name).bit_count()
+            counts = [counter.get(code, 0) for code in range(len(categories))]
+        else:
+            counts = [(bitmap & mask).bit_count() for bitmap in self._bitmaps(name)]
+        return {categories.values[code]: count for code, count in enumerate(counts) if count}
+
+    def completion(self, mask=None) -> Dict[str, Any]:
+        """{"completed", "total", "percent"} over the selected rows."""
+        total = self.selected(mask)
+        by_status = self.count_by("status", mask)
+        completed = sum(by_status.get(status, 0) for status in COMPLETED_STATUSES)
+        return {"completed": completed, "total": total, "percent": (completed / total * 100) if total else 0.0}
+
+    def overdue(self, today: Optional[date] = None, mask=None) -> int:
+        """Open tasks whose due date is before `today`."""
+        today_ordinal = (today or date.today()).toordinal()
+        done = [code for status, code in self.categories["status"].index.items() if status in COMPLETED_STATUSES]
+        np = _np()
+        if np:
+            due = self._as_np("due", self.due)
+            status = self._as_np("status", self.codes["status"])
+            hit = (due > 0) & (due < today_ordinal) & ~np.isin(status, done)
+            if mask is not None:
+                hit &= mask
+            return int(hit.sum())
+        hit = _bitmap(map(lambda ordinal: 0 < ordinal < today_ordinal, self.due))
+        bitmaps = self._bitmaps("status")
+        for code in done:
+            hit &= ~bitmaps[code]
+        if mask is not None:
+            hit &= mask
+        return hit.bit_count()
+
+    def summary(self, by: Sequence[str] = ("status", "priority"), mask=None, today: Optional[date] = None) -> Dict[str, Any]:
+        """Everything `tracklet task stats` shows, as one dict."""
+        return {
+            **self.completion(mask),
+            "overdue": self.overdue(today, mask),
+            "by": {name: self.count_by(name, mask) for name in by},
+        }
@@ -1,32 +1,57 @@
 # tracklet/data_access/__init__.py
 
-from .file_io import (
-    load_yaml_file,
-    save_yaml_file,
-    get_tasks_file,
-    load_tasks,
-    load_task,
-    save_task,
-    save_tasks,
-    generate_task_id,
-    generate_deliverable_id,
-    load_deliverable,
-    load_deliverables,
-    save_deliverable,
-    save_deliverables,
-    generate_deliverable_id
-)
-from .metadata import (
-    read_metadata,
-    write_metadata,
-    create_default_metadata,
-    delete_metadata,
-    STAGES
-)
-from .tracker import (
-    find_projects,
-    list_projects,
-    filter_projects,
-    summarize_progress,
-    collect_all_tags
-)
+# Resolved lazily (PEP 562), like the top-level package: a command that needs
+# one reader (e.g. `task list` and file_io) doesn't import the workspace index,
+# full-text search or tag dictionary too.
+
+from importlib import import_module
+
+_LAZY_EXPORTS = {
+    "load_yaml_file": "file_io",
+    "save_yaml_file": "file_io",
+    "get_tasks_file": "file_io",
+    "load_tasks": "file_io",
+    "load_task": "file_io",
+    "save_task": "file_io",
+    "save_tasks": "file_io",
+    "generate_task_id": "file_io",
+    "generate_deliverable_id": "file_io",
+    "load_deliverable": "file_io",
+    "load_deliverables": "file_io",
+    "save_deliverable": "file_io",
+    "save_deliverables": "file_io",
+    "read_metadata": "metadata",
+    "read_metadata_many": "metadata",
+    "write_metadata": "metadata",
+    "create_default_metadata": "metadata",
+    "delete_metadata": "metadata",
+    "STAGES": "metadata",
+    "find_projects": "tracker",
+    "list_projects": "tracker",
+    "filter_projects": "tracker",
+    "summarize_progress": "tracker",
+    "collect_all_tags": "tracker",
+    "discover_project_dirs": "tracker",
+    "scan_workspace": "tracker",
+    "search_projects": "tracker",
+    "WorkspaceIndex": "index",
+    "FullTextIndex": "fulltext",
+    "TagDictionary": "tags",
+    "get_tag_dictionary": "tags",
+    "load_tag_schema": "tags",
+    "RecordStore": "store",
+    "TaskStore": "store",
+    "DeliverableStore": "store",
+    "LinkIndex": "links",
+    "get_link_index": "links",
+    "iter_records": "transfer",
+    "write_records": "transfer",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(f"{__name__}.{_LAZY_EXPORTS[name]}"), name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,50 @@
+# tracklet/data_access/cache.py
+
+import os
+from typing import Optional, Tuple
+
+TRACKLET_DIR = ".tracklet"
+CACHE_DIRNAME = "cache"
+LOCKS_DIRNAME = "locks"
+QUEUE_DIRNAME = "queue"
+
+
+def get_tracklet_dir(base_path, create: bool = False) -> str:
+    """Return the `.tracklet` state directory under base_path."""
+    path = os.path.join(base_path, TRACKLET_DIR)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_cache_dir(base_path, create: bool = False) -> str:
+    """Return the `.tracklet/cache` directory under base_path."""
+    path = os.path.join(get_tracklet_dir(base_path), CACHE_DIRNAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_lock_dir(base_path, create: bool = False) -> str:
+    """Return the `.tracklet/locks` directory under base_path."""
+    path = os.path.join(get_tracklet_dir(base_path), LOCKS_DIRNAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_queue_dir(base_path, create: bool = False) -> str:
+    """Return the `.tracklet/queue` directory under base_path."""
+    path = os.path.join(get_tracklet_dir(base_path), QUEUE_DIRNAME)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_signature(path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) for a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,331 @@
+# tracklet/data_access/codec.py
+
+import gc
+import json
+import re
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+from .locking import atomic_write
+
+# The C and pure-Python emitters fold long scalars at different columns.
+# Disabling folding keeps both backends byte-for-byte identical.
+DUMP_WIDTH = 2 ** 31 - 1
+
+_backend = None
+
+
+def _yaml():
+    """
+    Imports PyYAML on first use (keeps CLI start-up cheap) and picks the
+    libyaml-backed CSafeLoader/CSafeDumper when PyYAML was built with it.
+    Returns (yaml module, Loader, Dumper, libyaml available).
+    """
+    global _backend
+    if _backend is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as Loader, CSafeDumper as Dumper
+            libyaml = True
+        except ImportError:  # PyYAML built without libyaml
+            from yaml import SafeLoader as Loader, SafeDumper as Dumper
+            libyaml = False
+        _backend = (yaml, Loader, Dumper, libyaml)
+    return _backend
+
+
+def __getattr__(name):
+    if name == "Loader":
+        return _yaml()[1]
+    if name == "Dumper":
+        return _yaml()[2]
+    if name == "LIBYAML":
+        return _yaml()[3]
+    if name == "YAMLError":
+        return _yaml()[0].YAMLError
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pauses the collector while any thread is parsing. Concurrent loads (the
+    metadata thread pool, daemon request threads) share one pause, and the
+    last one out restores the state found by the first one in.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def load(stream) -> Any:
+    """Parse a YAML string or stream with the fastest available safe loader."""
+    yaml, Loader, _, _ = _yaml()
+    # Building a large document allocates millions of acyclic objects, which
+    # would trigger repeated full collections; parsing 100k tasks takes half
+    # as long with the collector paused.
+    with _gc_paused():
+        return yaml.load(stream, Loader=Loader)
+
+
+def load_all(stream) -> Iterator[Any]:
+    """Lazily parse every document in a multi-document YAML stream."""
+    yaml, Loader, _, _ = _yaml()
+    return yaml.load_all(stream, Loader=Loader)
+
+
+# --- Type-preserving JSON ---
+# JSON has no date type. Dates and datetimes from unquoted YAML are written
+# as {"$date": ...} / {"$datetime": ...} so they read back as the same types
+# (the workspace index and daemon replies); anything else falls back to str.
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    return str(value)
+
+
+def _json_object(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+        if "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"])
+    return obj
+
+
+def dump_json(value: Any) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def load_json(text: Union[str, bytes]) -> Any:
+    # The object hook costs a call per dict, so only pay it when a date was written.
+    marker = b'{"$date' if isinstance(text, bytes) else '{"$date'
+    if marker in text:
+        return json.loads(text, object_hook=_json_object)
+    return json.loads(text)
+
+
+# --- Fast block emitter ---
+# PyYAML's representer is pure Python even with libyaml and dominates the
+# cost of writing large record files. Documents made of string-keyed dicts,
+# lists and plain scalars (all that tracklet writes) are emitted directly,
+# byte-for-byte as SafeDumper would; anything else falls back to PyYAML.
+
+class _Unsupported(Exception):
+    pass
+
+
+# Strings PyYAML always writes plain: start with a letter that no implicit
+# resolver claims, printable ASCII only, and no indicator sequences.
+_SAFE_PLAIN = re.compile(r"[A-EG-MP-SU-XZa-eg-mp-su-xz_][A-Za-z0-9_ ./()+@-]*\Z")
+_PRINTABLE_ASCII = re.compile(r"[\x20-\x7e]*\Z")
+_scalar_cache: Dict[str, str] = {}
+_analysis = None
+
+
+def _str_scalar(value: str) -> str:
+    cached = _scalar_cache.get(value)
+    if cached is not None:
+        return cached
+    if _SAFE_PLAIN.match(value) and not value.endswith(" "):
+        text = value
+    elif not _PRINTABLE_ASCII.match(value):
+        raise _Unsupported()  # escapes and line breaks: leave to PyYAML
+    else:
+        global _analysis
+        if _analysis is None:
+            yaml = _yaml()[0]
+            emitter = yaml.emitter.Emitter(None)
+            resolver = yaml.resolver.Resolver()
+            _analysis = (emitter.analyze_scalar, resolver.resolve, yaml.ScalarNode)
+        analyze, resolve, node = _analysis
+        implicit = resolve(node, value, (True, False)) == "tag:yaml.org,2002:str"
+        analysis = analyze(value)
+        if implicit and analysis.allow_block_plain and not analysis.empty:
+            text = value
+        elif analysis.allow_single_quoted:
+            text = "'" + value.replace("'", "''") + "'"
+        else:
+            raise _Unsupported()
+    if len(_scalar_cache) < 100_000:
+        _scalar_cache[value] = text
+    return text
+
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, str):
+        return _str_scalar(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value != value or value in (float("inf"), float("-inf")):
+            raise _Unsupported()
+        text = repr(value).lower()
+        if "." not in text and "e" in text:
+            text = text.replace("e", ".0e", 1)
+        return text
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value.isoformat()
+    raise _Unsupported()
+
+
+def _emit_mapping(mapping: Dict[str, Any], indent: str, first_prefix: str, out: List[str]) -> None:
+    prefix = first_prefix
+    for key in sorted(mapping):
+        if not isinstance(key, str) or not key or len(key) >= 128:
+            raise _Unsupported()  # not a simple key
+        value = mapping[key]
+        head = f"{prefix}{_str_scalar(key)}:"
+        prefix = indent
+        if isinstance(value, dict):
+            if value:
+                out.append(head + "\n")
+                _emit_mapping(value, indent + "  ", indent + "  ", out)
+            else:
+                out.append(head + " {}\n")
+        elif isinstance(value, list):
+            if value:
+                out.append(head + "\n")
+                _emit_sequence(value, indent, out)  # sequences in mappings are not indented
+            else:
+                out.append(head + " []\n")
+        else:
+            out.append(f"{head} {_scalar(value)}\n")
+
+
+def _emit_sequence(items: List[Any], indent: str, out: List[str]) -> None:
+    for item in items:
+        if isinstance(item, dict):
+            if item:
+                _emit_mapping(item, indent + "  ", indent + "- ", out)
+            else:
+                out.append(f"{indent}- {{}}\n")
+        elif isinstance(item, (list, tuple)):
+            raise _Unsupported()
+        else:
+            out.append(f"{indent}- {_scalar(item)}\n")
+
+
+def _fast_dump(data: Any) -> str:
+    if not isinstance(data, dict):
+        raise _Unsupported()
+    if not data:
+        return "{}\n"
+    out: List[str] = []
+    _emit_mapping(data, "", "", out)
+    return "".join(out)
+
+
+def dump(data: Any, stream=None, **kwargs) -> Optional[str]:
+    """Serialize data with the fastest available safe dumper."""
+    if stream is None and not kwargs:
+        try:
+            return _fast_dump(data)
+        except _Unsupported:
+            pass
+    yaml, _, Dumper, _ = _yaml()
+    kwargs.setdefault("width", DUMP_WIDTH)
+    return yaml.dump(data, stream, Dumper=Dumper, **kwargs)
+
+
+def _compose_events(loader, event, anchors: Dict[str, Any]):
+    """Builds the node for `event` (already consumed) from the loader's event stream."""
+    yaml = _yaml()[0]
+    if isinstance(event, yaml.AliasEvent):
+        return anchors[event.anchor]
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+    elif isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(_compose_events(loader, loader.get_event(), anchors))
+        loader.get_event()
+    else:
+        tag = event.tag if event.tag not in (None, "!") else loader.resolve(yaml.MappingNode, None, event.implicit)
+        node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _compose_events(loader, loader.get_event(), anchors)
+            node.value.append((key, _compose_events(loader, loader.get_event(), anchors)))
+        loader.get_event()
+    if getattr(event, "anchor", None):
+        anchors[event.anchor] = node
+    return node
+
+
+def iter_items(path, key: str) -> Iterator[Any]:
+    """
+    Lazily yields the items of the top-level `key` sequence of a YAML file
+    (e.g. the tasks in tasks.yaml), constructing one item at a time from
+    the parser's event stream. Memory stays flat however long the list is,
+    and stopping early skips parsing the rest of the file.
+    """
+    path = Path(path)
+    if not path.is_file():
+        return
+    yaml, Loader, _, _ = _yaml()
+    with open(path, "r", encoding="utf-8") as f:
+        loader = Loader(f)
+        try:
+            loader.get_event()  # StreamStart
+            if not loader.check_event(yaml.DocumentStartEvent):
+                return
+            loader.get_event()
+            if not loader.check_event(yaml.MappingStartEvent):
+                return
+            loader.get_event()
+            anchors: Dict[str, Any] = {}
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = _compose_events(loader, loader.get_event(), anchors)
+                if getattr(key_node, "value", None) == key and loader.check_event(yaml.SequenceStartEvent):
+                    loader.get_event()
+                    while not loader.check_event(yaml.SequenceEndEvent):
+                        node = _compose_events(loader, loader.get_event(), anchors)
+                        yield loader.construct_document(node)
+                    return
+                _compose_events(loader, loader.get_event(), anchors)  # skip this value
+        finally:
+            loader.dispose()
+
+
+def load_file(path) -> Any:
+    """Load a YAML file, returning None if it does not exist."""
+    path = Path(path)
+    if not path.is_file():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return load(f)
+
+
+def dump_file(path, data: Any, **kwargs) -> None:
+    """Atomically replace a YAML file's contents with data."""
+    atomic_write(path, dump(data, **kwargs))
@@ -0,0 +1,110 @@
+# tracklet/data_access/daemon_client.py
+
+"""
+Client side of `tracklet daemon`.
+
+Readers ask a running daemon for already-parsed files over the Unix
+socket at `<workspace>/.tracklet/daemon.sock` (found by walking up from
+the file or folder being read). `query_daemon` returns None whenever no
+daemon answers, so callers fall back to reading the files themselves.
+
+Replies are JSON; dates and datetimes from unquoted YAML travel as
+{"$date": ...} / {"$datetime": ...} and are restored here, so callers get
+the same types with or without a daemon.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from . import codec
+from .cache import get_tracklet_dir
+
+SOCKET_FILENAME = "daemon.sock"
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonError(RuntimeError):
+    """Raised when the daemon answers a request with an error."""
+
+
+def daemon_enabled() -> bool:
+    """The daemon is skipped with TRACKLET_NO_DAEMON=1, and where Unix sockets are unavailable."""
+    if os.environ.get("TRACKLET_NO_DAEMON", "") not in ("", "0"):
+        return False
+    import socket
+    return hasattr(socket, "AF_UNIX")
+
+
+def request_timeout() -> float:
+    return float(os.environ.get("TRACKLET_DAEMON_TIMEOUT", "30"))
+
+
+def get_socket_path(base_path) -> str:
+    return os.path.join(get_tracklet_dir(base_path), SOCKET_FILENAME)
+
+
+_socket_by_dir: Dict[str, Optional[str]] = {}
+
+
+def find_socket(path) -> Optional[str]:
+    """The daemon socket of the nearest workspace at or above path, if any."""
+    path = os.path.abspath(path)
+    start = path
+    while True:
+        if path in _socket_by_dir:
+            found = _socket_by_dir[path]
+            break
+        candidate = get_socket_path(path)
+        if os.path.exists(candidate):
+            found = candidate
+            break
+        parent = os.path.dirname(path)
+        if parent == path:
+            found = None
+            break
+        path = parent
+    _socket_by_dir[start] = found
+    return found
+
+
+def encode_response(response: Dict[str, Any]) -> bytes:
+    """One reply line, with dates tagged (see codec.dump_json)."""
+    return codec.dump_json(response).encode("utf-8") + b"\n"
+
+
+def decode_response(line: bytes) -> Dict[str, Any]:
+    return codec.load_json(line)
+
+
+def send_request(socket_path: str, op: str, timeout: Optional[float] = None, **args: Any) -> Any:
+    """Sends one request and returns its result. Raises OSError, ValueError or DaemonError."""
+    import socket  # only when a daemon is actually running
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path)
+        sock.settimeout(request_timeout() if timeout is None else timeout)
+        sock.sendall(json.dumps({"op": op, "args": args}).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise DaemonError("Daemon closed the connection")
+    response = decode_response(line)
+    if not response.get("ok"):
+        raise DaemonError(response.get("error") or "Unknown daemon error")
+    return response.get("result")
+
+
+def query_daemon(near, op: str, **args: Any) -> Optional[Any]:
+    """
+    Result of `op` from the daemon serving the workspace around `near`, or
+    None if there is no daemon or it cannot answer.
+    """
+    # Looking for the socket file first keeps commands with no daemon from importing socket.
+    socket_path = find_socket(near)
+    if socket_path is None or not daemon_enabled():
+        return None
+    try:
+        return send_request(socket_path, op, **args)
+    except (OSError, ValueError, DaemonError):
+        return None
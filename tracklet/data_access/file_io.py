@@ -1,42 +1,52 @@
 
-import yaml
+import os
 import uuid
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+from . import codec, snapshot
+from .daemon_client import query_daemon
+from .links import write_link_index
+from .locking import file_lock
+from .store import TaskStore, DeliverableStore
 
 
 def load_yaml_file(file_path: Path) -> Optional[Dict]:
-    if not file_path.exists():
-        return None
-    with open(file_path, "r") as f:
-        return yaml.safe_load(f)
+    return codec.load_file(file_path)
 
 def save_yaml_file(file_path: Path, data: Dict):
-    with open(file_path, "w") as f:
-        yaml.dump(data, f)
+    codec.dump_file(file_path, data)
+
+def select_from_daemon(file, selection: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """
+    The records of `file` a running `tracklet daemon` picks with
+    core.query.select(**selection), so only that page crosses the socket.
+    None when no daemon answers; callers then select from iter_tasks/iter_deliverables.
+    """
+    path = os.path.abspath(file)
+    return query_daemon(os.path.dirname(path), "select", file=path, **selection)
 
 # --- Task I/O ---
 def get_tasks_file(file_path: Path) -> Path:
     return file_path / "tasks.yaml"
 
 def load_tasks(file: str = "tasks.yaml") -> List[Dict[str, Any]]:
-    path = Path(file)
-    if path.exists():
-        with open(path, "r") as f:
-            return yaml.safe_load(f).get("tasks", [])
-    return []
+    data = snapshot.load_file(file)
+    return (data or {}).get("tasks", [])
+
+def iter_tasks(file: str = "tasks.yaml") -> Iterator[Dict[str, Any]]:
+    """Streams tasks one at a time without loading the whole file."""
+    return (task for task in snapshot.iter_items(file, "tasks") if isinstance(task, dict))
 
 def save_tasks(tasks: List[Dict[str, Any]], file: str = "tasks.yaml"):
-    with open(file, "w") as f:
-        yaml.dump({"tasks": tasks}, f)
+    with file_lock(file):
+        snapshot.dump_file(file, {"tasks": tasks})
 
 def load_task(task_id: str, file: str = "tasks.yaml") -> Dict[str, Any]:
-    return next((t for t in load_tasks(file) if t.get("id") == task_id), {})
+    return TaskStore(file).get(task_id, {})
 
 def save_task(task: Dict[str, Any], file: str = "tasks.yaml"):
-    tasks = [t for t in load_tasks(file) if t.get("id") != task["id"]]
-    tasks.append(task)
-    save_tasks(tasks, file)
+    with TaskStore(file) as store:
+        store.put(task)
 
 def generate_task_id() -> str:
     return str(uuid.uuid4())
@@ -45,24 +55,25 @@ def generate_task_id() -> str:
 def get_deliverables_file(project_path: Path) -> Path:
     return project_path / "deliverables.yaml"
 
+def iter_deliverables(file: str = "deliverables.yaml") -> Iterator[Dict[str, Any]]:
+    """Like iter_tasks, for deliverables."""
+    return (item for item in snapshot.iter_items(file, "deliverables") if isinstance(item, dict))
+
 def load_deliverables(file: str = "deliverables.yaml") -> List[Dict[str, Any]]:
-    path = Path(file)
-    if path.exists():
-        with open(path, "r") as f:
-            return yaml.safe_load(f).get("deliverables", [])
-    return []
+    data = snapshot.load_file(file)
+    return (data or {}).get("deliverables", [])
 
 def save_deliverables(deliverables: List[Dict[str, Any]], file: str = "deliverables.yaml"):
-    with open(file, "w") as f:
-        yaml.dump({"deliverables": deliverables}, f)
+    with file_lock(file):
+        signature = snapshot.dump_file(file, {"deliverables": deliverables})
+        write_link_index(file, deliverables, signature)
 
 def load_deliverable(deliverable_id: str, file: str = "deliverables.yaml") -> Dict[str, Any]:
-    return next((d for d in load_deliverables(file) if d.get("id") == deliverable_id), {})
+    return DeliverableStore(file).get(deliverable_id, {})
 
 def save_deliverable(deliverable: Dict[str, Any], file: str = "deliverables.yaml"):
-    deliverables = [d for d in load_deliverables(file) if d.get("id") != deliverable["id"]]
-    deliverables.append(deliverable)
-    save_deliverables(deliverables, file)
+    with DeliverableStore(file) as store:
+        store.put(deliverable)
 
 def generate_deliverable_id() -> str:
     return str(uuid.uuid4())
\ No newline at end of file
@@ -0,0 +1,282 @@
+# tracklet/data_access/fulltext.py
+
+"""
+BM25-ranked full-text index over project names/descriptions and task
+titles/descriptions, stored in `.tracklet/search.sqlite`.
+
+Documents come from the files tracklet already keeps: one per project
+(`.projectmeta`) and one per task (`tasks.yaml`). Each source file is
+indexed with the mtime/size it was read at, so a refresh only re-reads
+the files that changed. Term postings carry the term frequency per
+document and a vocabulary table keeps document frequencies, so a query
+touches only the postings of its own terms and is scored in SQLite.
+"""
+
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import codec, snapshot
+from .cache import file_signature, get_tracklet_dir
+from .metadata import META_FILENAME
+
+SEARCH_FILENAME = "search.sqlite"
+SEARCH_VERSION = "1"
+TASKS_FILENAME = "tasks.yaml"
+
+# BM25 parameters; title terms count TITLE_WEIGHT times (a simple BM25F).
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+MAX_PREFIX_TERMS = 16
+# Terms in more than this share of documents add little to a score; they
+# are not used to find candidates when the query has rarer terms, only to
+# score the candidates (so a query with "the" does not visit every doc).
+COMMON_TERM_RATIO = 0.25
+
+_WORD_RE = re.compile(r"\w+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    project TEXT NOT NULL,
+    ref TEXT,
+    title TEXT,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_source ON docs (source);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+CREATE TABLE IF NOT EXISTS terms (
+    term TEXT PRIMARY KEY,
+    df INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+_DATA_TABLES = ("sources", "docs", "postings", "terms")
+
+
+def tokenize(text: Any) -> List[str]:
+    return _WORD_RE.findall(str(text).lower()) if text else []
+
+
+def get_search_path(base_path) -> str:
+    return os.path.join(get_tracklet_dir(base_path), SEARCH_FILENAME)
+
+
+def _documents(kind: str, path: str) -> Iterable[Tuple[Optional[str], str, Any]]:
+    """(ref, title, description) for each document in a source file."""
+    if kind == "project":
+        meta = codec.load_file(path) or {}
+        if isinstance(meta, dict):
+            yield None, str(meta.get("name") or ""), meta.get("description")
+        return
+    for task in snapshot.iter_items(path, "tasks"):
+        if isinstance(task, dict):
+            yield str(task.get("id") or ""), str(task.get("title") or ""), task.get("description")
+
+
+class FullTextIndex:
+    """Incrementally maintained BM25 index for one workspace."""
+
+    def __init__(self, base_path):
+        self.base_path = os.path.abspath(base_path)
+        self.path = get_search_path(self.base_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # --- Connection handling ---
+
+    def open(self) -> "FullTextIndex":
+        if self._conn is None:
+            get_tracklet_dir(self.base_path, create=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM info WHERE key = 'version'").fetchone()
+            if row is None or row[0] != SEARCH_VERSION:
+                with conn:
+                    for table in _DATA_TABLES:
+                        conn.execute(f"DELETE FROM {table}")
+                    conn.execute("INSERT OR REPLACE INTO info (key, value) VALUES ('version', ?)", (SEARCH_VERSION,))
+            self._conn = conn
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "FullTextIndex":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _key(self, path) -> str:
+        return os.path.relpath(os.path.abspath(path), self.base_path)
+
+    # --- Updates ---
+
+    def refresh(self, project_paths: Iterable[str]) -> Dict[str, int]:
+        """
+        Re-indexes the `.projectmeta` and `tasks.yaml` of the given projects
+        that changed since the last refresh and drops sources that no longer
+        exist. Returns {"updated": files, "removed": files, "documents": total}.
+        """
+        self.open()
+        conn = self._conn
+        indexed = {path: (mtime_ns, size) for path, mtime_ns, size in conn.execute("SELECT path, mtime_ns, size FROM sources")}
+
+        changed = []
+        for project_path in project_paths:
+            project_key = self._key(project_path)
+            for kind, filename in (("project", META_FILENAME), ("task", TASKS_FILENAME)):
+                file = os.path.join(project_path, filename)
+                key = os.path.normpath(os.path.join(project_key, filename))
+                signature = file_signature(file)
+                if signature is None:
+                    continue
+                if indexed.pop(key, None) != signature:
+                    changed.append((key, kind, project_key, file, signature))
+
+        removed = [key for key in indexed if file_signature(os.path.join(self.base_path, key)) is None]
+        if changed or removed:
+            with conn:
+                for key in removed:
+                    self._drop_source(key)
+                    conn.execute("DELETE FROM sources WHERE path = ?", (key,))
+                for key, kind, project_key, file, signature in changed:
+                    self._drop_source(key)
+                    self._add_source(key, kind, project_key, file)
+                    conn.execute("INSERT OR REPLACE INTO sources (path, mtime_ns, size) VALUES (?, ?, ?)", (key, *signature))
+                count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+                conn.executemany("INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+                                 [("doc_count", str(count)), ("total_length", str(total))])
+        return {"updated": len(changed), "removed": len(removed), "documents": self._stats()[0]}
+
+    def _drop_source(self, key: str) -> None:
+        conn = self._conn
+        docs = [(doc,) for doc, in conn.execute("SELECT id FROM docs WHERE source = ?", (key,))]
+        if not docs:
+            return
+        source_docs = "SELECT id FROM docs WHERE source = ?"
+        conn.execute(
+            f"""UPDATE terms SET df = df - (
+                    SELECT COUNT(*) FROM postings WHERE postings.term = terms.term AND doc IN ({source_docs}))
+                WHERE term IN (SELECT DISTINCT term FROM postings WHERE doc IN ({source_docs}))""",
+            (key, key),
+        )
+        conn.execute("DELETE FROM terms WHERE df <= 0")
+        conn.executemany("DELETE FROM postings WHERE doc = ?", docs)
+        conn.execute("DELETE FROM docs WHERE source = ?", (key,))
+
+    def _add_source(self, key: str, kind: str, project_key: str, file: str) -> None:
+        conn = self._conn
+        postings: List[Tuple[str, int, int]] = []
+        df: Counter = Counter()
+        for ref, title, description in _documents(kind, file):
+            counts = Counter(tokenize(description))
+            for term in tokenize(title):
+                counts[term] += TITLE_WEIGHT
+            doc = conn.execute(
+                "INSERT INTO docs (source, kind, project, ref, title, length) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, project_key, ref, title, sum(counts.values())),
+            ).lastrowid
+            postings.extend((term, doc, tf) for term, tf in counts.items())
+            df.update(counts.keys())
+        conn.executemany("INSERT INTO postings (term, doc, tf) VALUES (?, ?, ?)", postings)
+        conn.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+            df.items(),
+        )
+
+    def rebuild(self, project_paths: Iterable[str]) -> Dict[str, int]:
+        self.open()
+        with self._conn:
+            for table in _DATA_TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+        return self.refresh(project_paths)
+
+    # --- Queries ---
+
+    def _stats(self) -> Tuple[int, float]:
+        rows = dict(self._conn.execute("SELECT key, value FROM info WHERE key IN ('doc_count', 'total_length')"))
+        count = int(rows.get("doc_count", 0))
+        return count, (int(rows.get("total_length", 0)) / count) if count else 0.0
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        return [term for term, in self._conn.execute(
+            "SELECT term FROM terms WHERE term >= ? AND term < ? ORDER BY df DESC LIMIT ?",
+            (prefix, prefix + "\U0010ffff", MAX_PREFIX_TERMS),
+        )]
+
+    def search(self, text: str, limit: int = 10, kind: Optional[str] = None, prefix: bool = False) -> List[Dict[str, Any]]:
+        """
+        Top `limit` documents for `text` by BM25 score, best first. With
+        prefix=True the last word also matches longer terms (search-as-you-type).
+        """
+        self.open()
+        conn = self._conn
+        words = list(dict.fromkeys(tokenize(text)))
+        if not words:
+            return []
+        terms = words[:-1] + (self._expand_prefix(words[-1]) if prefix else [words[-1]])
+        terms = list(dict.fromkeys(terms))
+        if not terms:
+            return []
+
+        count, avgdl = self._stats()
+        placeholders = ",".join("?" * len(terms))
+        dfs = dict(conn.execute(f"SELECT term, df FROM terms WHERE term IN ({placeholders})", terms))
+        weights = [(term, math.log(1 + (count - df + 0.5) / (df + 0.5))) for term, df in dfs.items()]
+        if not weights:
+            return []
+
+        values = ",".join("(?, ?)" for _ in weights)
+        params: List[Any] = [value for pair in weights for value in pair]
+        rare = [term for term, _ in weights if dfs[term] <= COMMON_TERM_RATIO * count]
+        if rare and len(rare) < len(weights):
+            candidates = f"""SELECT DISTINCT doc FROM postings WHERE term IN ({",".join("?" * len(rare))})"""
+            source = "c JOIN q JOIN postings p ON p.term = q.term AND p.doc = c.doc"
+            params.extend(rare)
+        else:
+            candidates = "SELECT NULL AS doc"
+            source = "c JOIN q JOIN postings p ON p.term = q.term"
+        params.append(avgdl or 1.0)
+        where = ""
+        if kind:
+            where = "WHERE d.kind = ?"
+            params.append(kind)
+        params.append(limit)
+        rows = conn.execute(
+            f"""WITH q (term, idf) AS (VALUES {values}), c AS ({candidates})
+                SELECT d.kind, d.project, d.ref, d.title,
+                       SUM(q.idf * p.tf * ({K1} + 1) / (p.tf + {K1} * (1 - {B} + {B} * d.length / ?))) AS score
+                FROM {source} JOIN docs d ON d.id = p.doc
+                {where}
+                GROUP BY p.doc ORDER BY score DESC LIMIT ?""",
+            params,
+        )
+        return [
+            {"kind": doc_kind, "project": os.path.normpath(os.path.join(self.base_path, project)),
+             "id": ref, "title": title, "score": round(score, 4)}
+            for doc_kind, project, ref, title, score in rows
+        ]
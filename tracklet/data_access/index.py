@@ -0,0 +1,341 @@
+# tracklet/data_access/index.py
+
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from . import codec
+from .cache import get_tracklet_dir, file_signature
+from .metadata import META_FILENAME, read_metadata_many
+
+Signature = Tuple[int, int]
+ProjectPaths = Union[Dict[str, Optional[Signature]], Iterable[str]]
+
+INDEX_FILENAME = "index.sqlite"
+INDEX_VERSION = "3"  # 3: metadata stored with codec.dump_json, keeping dates
+
+# Fields matched exactly through postings, and fields matched by
+# case-insensitive substring through trigrams. Authors are in both: the
+# postings hold the lowercased name for exact lookups.
+TERM_FIELDS = ("tag", "stage", "author")
+TEXT_FIELDS = ("name", "author", "description")
+SEARCH_FIELDS = {"tag": "term", "stage": "term", "name": "text", "author": "text", "description": "text"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    field TEXT NOT NULL,
+    term TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (field, term, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_path ON postings (path);
+CREATE TABLE IF NOT EXISTS texts (
+    field TEXT NOT NULL,
+    path TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (field, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS texts_path ON texts (path);
+CREATE TABLE IF NOT EXISTS trigrams (
+    field TEXT NOT NULL,
+    gram TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (field, gram, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trigrams_path ON trigrams (path);
+"""
+
+_DATA_TABLES = ("projects", "postings", "texts", "trigrams")
+
+
+def index_enabled() -> bool:
+    """The workspace index can be switched off with TRACKLET_NO_INDEX=1."""
+    return os.environ.get("TRACKLET_NO_INDEX", "") in ("", "0")
+
+
+def get_index_path(base_path) -> str:
+    return os.path.join(get_tracklet_dir(base_path), INDEX_FILENAME)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _search_entries(meta: Any) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """(field, term) postings and (field, lowercased text) values for one project's metadata."""
+    if not isinstance(meta, dict):
+        return [], []
+    terms = [("tag", str(tag)) for tag in meta.get("tags") or [] if tag is not None]
+    stage = (meta.get("progress") or {}).get("stage")
+    if stage:
+        terms.append(("stage", str(stage)))
+    if meta.get("author"):
+        terms.append(("author", str(meta["author"]).lower()))
+    texts = [(field, str(meta[field]).lower()) for field in TEXT_FIELDS if meta.get(field) is not None]
+    return terms, texts
+
+
+def _signatures(projects: ProjectPaths) -> Dict[str, Optional[Signature]]:
+    """Accepts {path: signature} as produced by a scan, or plain paths to stat."""
+    if isinstance(projects, dict):
+        return projects
+    return {path: file_signature(os.path.join(path, META_FILENAME)) for path in projects}
+
+
+class WorkspaceIndex:
+    """
+    On-disk cache of parsed `.projectmeta` files for one workspace.
+    Rows are keyed by the project path (relative to the workspace) and
+    carry the mtime/size of the metadata file they were parsed from, so
+    unchanged projects are served from the index and only modified ones
+    are re-parsed.
+    """
+
+    def __init__(self, base_path):
+        self.base_path = os.path.abspath(base_path)
+        self.path = get_index_path(self.base_path)
+        self._conn: Optional[sqlite3.Connection] = None
+
+    # --- Connection handling ---
+
+    def open(self) -> "WorkspaceIndex":
+        if self._conn is None:
+            get_tracklet_dir(self.base_path, create=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM info WHERE key = 'version'").fetchone()
+            if row is None or row[0] != INDEX_VERSION:
+                for table in _DATA_TABLES:
+                    conn.execute(f"DELETE FROM {table}")
+                conn.execute(
+                    "INSERT OR REPLACE INTO info (key, value) VALUES ('version', ?)",
+                    (INDEX_VERSION,),
+                )
+                conn.commit()
+            self._conn = conn
+        return self
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> "WorkspaceIndex":
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # --- Helpers ---
+
+    def _key(self, project_path) -> str:
+        return os.path.relpath(os.path.abspath(project_path), self.base_path)
+
+    def _abs(self, key: str) -> str:
+        return os.path.normpath(os.path.join(self.base_path, key))
+
+    @staticmethod
+    def _encode(meta: Any) -> str:
+        return codec.dump_json(meta)  # an index hit returns the same types as a parse
+
+    # --- Queries ---
+
+    def refresh(self, projects: ProjectPaths, jobs: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns {project_path: metadata} for the given project folders,
+        re-parsing (on up to `jobs` threads) only those whose `.projectmeta`
+        changed since it was indexed. Rows for projects whose metadata file
+        has disappeared are dropped.
+        """
+        self.open()
+        conn = self._conn
+        rows = {
+            key: (mtime_ns, size, meta)
+            for key, mtime_ns, size, meta in conn.execute(
+                "SELECT path, mtime_ns, size, meta FROM projects"
+            )
+        }
+
+        results: Dict[str, Any] = {}
+        changed = []
+        for project_path, sig in _signatures(projects).items():
+            if sig is None:
+                continue
+            key = self._key(project_path)
+            row = rows.pop(key, None)
+            if row is not None and (row[0], row[1]) == sig:
+                results[project_path] = codec.load_json(row[2])
+            else:
+                results[project_path] = None  # keeps caller order
+                changed.append((project_path, key, sig))
+
+        metas = read_metadata_many([path for path, _, _ in changed], jobs=jobs)
+        updates = []
+        for (project_path, key, sig), meta in zip(changed, metas):
+            results[project_path] = meta
+            updates.append((key, sig[0], sig[1], self._encode(meta)))
+
+        removed = [
+            (key,) for key in rows
+            if file_signature(os.path.join(self._abs(key), META_FILENAME)) is None
+        ]
+
+        if updates or removed:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO projects (path, mtime_ns, size, meta) VALUES (?, ?, ?, ?)",
+                    updates,
+                )
+                conn.executemany("DELETE FROM projects WHERE path = ?", removed)
+                self._update_search(removed + [(key,) for key, _, _, _ in updates],
+                                    [(key, meta) for (_, key, _), meta in zip(changed, metas)])
+        return results
+
+    def _update_search(self, stale: List[Tuple[str]], indexed: List[Tuple[str, Any]]) -> None:
+        """Replaces the search rows of changed projects; runs inside refresh's transaction."""
+        conn = self._conn
+        for table in ("postings", "texts", "trigrams"):
+            conn.executemany(f"DELETE FROM {table} WHERE path = ?", stale)
+        postings, texts, grams = [], [], []
+        for key, meta in indexed:
+            terms, values = _search_entries(meta)
+            postings.extend((field, term, key) for field, term in terms)
+            for field, value in values:
+                texts.append((field, key, value))
+                grams.extend((field, gram, key) for gram in _trigrams(value))
+        conn.executemany("INSERT OR IGNORE INTO postings (field, term, path) VALUES (?, ?, ?)", postings)
+        conn.executemany("INSERT OR REPLACE INTO texts (field, path, value) VALUES (?, ?, ?)", texts)
+        conn.executemany("INSERT OR IGNORE INTO trigrams (field, gram, path) VALUES (?, ?, ?)", grams)
+
+    # --- Search ---
+
+    def lookup(self, field: str, terms: Iterable[str]) -> Set[str]:
+        """Project keys whose `field` (tag, stage, author) equals any of terms."""
+        self.open()
+        terms = [term.lower() if field == "author" else term for term in terms]
+        if not terms:
+            return set()
+        placeholders = ",".join("?" * len(terms))
+        return {key for key, in self._conn.execute(
+            f"SELECT DISTINCT path FROM postings WHERE field = ? AND term IN ({placeholders})", (field, *terms)
+        )}
+
+    def contains(self, field: str, needle: str) -> Set[str]:
+        """
+        Project keys whose `field` (name, author, description) contains needle,
+        ignoring case. Candidates come from the postings of the needle's
+        trigrams and are then checked against the stored text.
+        """
+        self.open()
+        needle = needle.lower()
+        grams = sorted(_trigrams(needle))
+        if not grams:
+            # Too short for trigrams: scan just this field's values
+            rows = self._conn.execute("SELECT path FROM texts WHERE field = ? AND instr(value, ?) > 0", (field, needle))
+        else:
+            placeholders = ",".join("?" * len(grams))
+            rows = self._conn.execute(
+                f"""SELECT path FROM texts WHERE field = ? AND instr(value, ?) > 0 AND path IN (
+                        SELECT path FROM trigrams WHERE field = ? AND gram IN ({placeholders})
+                        GROUP BY path HAVING COUNT(*) = ?)""",
+                (field, needle, field, *grams, len(grams)),
+            )
+        return {key for key, in rows}
+
+    def match(self, field: str, values: Iterable[str]) -> Set[str]:
+        """Keys matching any of values: exact for tag/stage, substring for name/author/description."""
+        if SEARCH_FIELDS[field] == "term":
+            return self.lookup(field, values)
+        matched: Set[str] = set()
+        for value in values:
+            matched |= self.contains(field, value)
+        return matched
+
+    def search(self, project_paths: Iterable[str], include: Dict[str, List[str]],
+               exclude: Optional[Dict[str, List[str]]] = None) -> Set[str]:
+        """
+        Paths from project_paths that match at least one value of every
+        include field and no value of any exclude field. Include fields are
+        intersected smallest first and excludes subtracted, so the work
+        follows the size of the postings rather than the workspace.
+        """
+        sets = sorted((self.match(field, values) for field, values in include.items() if values), key=len)
+        excluded: Set[str] = set()
+        for field, values in (exclude or {}).items():
+            if values:
+                excluded |= self.match(field, values)
+        project_paths = set(project_paths)
+        if not sets:
+            return project_paths - {self._abs(key) for key in excluded}
+        # Keys are only turned back into paths for the (small) result
+        matched = sets[0].intersection(*sets[1:]) - excluded
+        return {path for path in map(self._abs, matched) if path in project_paths}
+
+    def rebuild(self, projects: ProjectPaths, jobs: Optional[int] = None) -> int:
+        """Drops every row and re-parses the given projects. Returns the row count."""
+        self.open()
+        with self._conn:
+            for table in _DATA_TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+        return len(self.refresh(projects, jobs=jobs))
+
+    def status(self, projects: ProjectPaths) -> Dict[str, Any]:
+        """Compares the index against the given project folders without updating it."""
+        self.open()
+        rows = {
+            key: (mtime_ns, size)
+            for key, mtime_ns, size in self._conn.execute(
+                "SELECT path, mtime_ns, size FROM projects"
+            )
+        }
+        fresh = stale = missing = 0
+        for project_path, sig in _signatures(projects).items():
+            if sig is None:
+                continue
+            row = rows.pop(self._key(project_path), None)
+            if row is None:
+                missing += 1
+            elif row == sig:
+                fresh += 1
+            else:
+                stale += 1
+        return {
+            "path": self.path,
+            "size": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "indexed": fresh + stale + len(rows),
+            "fresh": fresh,
+            "stale": stale,
+            "missing": missing,
+            "orphaned": len(rows),
+        }
+
+
+def load_metadata_map(base_path, projects: ProjectPaths, jobs: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Loads metadata for the given project folders through the workspace index,
+    falling back to parsing every `.projectmeta` when the index is disabled
+    or cannot be opened (e.g. read-only workspace).
+    """
+    projects = _signatures(projects)
+    paths = [path for path, sig in projects.items() if sig is not None]
+    from .daemon_client import query_daemon
+    cached = query_daemon(base_path, "metadata", paths=paths) if paths else None
+    if cached is not None:
+        return cached
+    if index_enabled():
+        try:
+            with WorkspaceIndex(base_path) as index:
+                return index.refresh(projects, jobs=jobs)
+        except (sqlite3.Error, OSError):
+            pass
+    return dict(zip(paths, read_metadata_many(paths, jobs=jobs)))
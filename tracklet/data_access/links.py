@@ -0,0 +1,100 @@
+# tracklet/data_access/links.py
+
+"""
+Task ↔ deliverable links of one `deliverables.yaml`.
+
+Deliverables point at their task through `related_task_id`. A LinkIndex
+holds that mapping in both directions, so "deliverables of task X" and
+"task of deliverable Y" are dict lookups. It also records where each
+linked deliverable sits in the file, so its record can be read from the
+snapshot without loading the others (see DeliverableStore.linked_to). It is kept in
+`.tracklet/cache/deliverables.yaml.links` next to the file. Every
+DeliverableStore commit rewrites it. A hand edit changes the file's
+mtime/size, and the index is then rebuilt from the deliverables on the
+next lookup.
+"""
+
+import marshal
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import snapshot
+from .cache import file_signature, get_cache_dir
+from .locking import atomic_write
+
+LINK_FIELD = "related_task_id"
+LINKS_SUFFIX = ".links"
+
+
+class LinkIndex:
+    """deliverable id -> task id and task id -> [deliverable ids] for one deliverables file."""
+
+    def __init__(self, task_of: Dict[str, str], signature: Optional[Tuple[int, int]] = None,
+                 position_of: Optional[Dict[str, int]] = None):
+        self.task_of = task_of
+        self.signature = signature
+        self.position_of = position_of or {}  # deliverable id -> index in the deliverables list
+        self.deliverables_of: Dict[str, List[str]] = {}
+        for deliverable_id, task_id in task_of.items():
+            self.deliverables_of.setdefault(task_id, []).append(deliverable_id)
+
+    @classmethod
+    def from_records(cls, deliverables: Iterable[Any], signature: Optional[Tuple[int, int]] = None) -> "LinkIndex":
+        task_of, position_of = {}, {}
+        for position, deliverable in enumerate(deliverables):
+            if isinstance(deliverable, dict) and deliverable.get("id") is not None and deliverable.get(LINK_FIELD):
+                task_of[str(deliverable["id"])] = str(deliverable[LINK_FIELD])
+                position_of[str(deliverable["id"])] = position
+        return cls(task_of, signature, position_of)
+
+    def deliverables_for(self, task_id) -> List[str]:
+        return list(self.deliverables_of.get(str(task_id), ()))
+
+    def task_for(self, deliverable_id) -> Optional[str]:
+        return self.task_of.get(str(deliverable_id))
+
+    def __len__(self) -> int:
+        return len(self.task_of)
+
+
+def get_links_path(deliverables_file) -> str:
+    folder, name = os.path.split(os.path.abspath(deliverables_file))
+    return os.path.join(get_cache_dir(folder), name + LINKS_SUFFIX)
+
+
+_link_cache: Dict[str, LinkIndex] = {}
+
+
+def write_link_index(deliverables_file, deliverables: Iterable[Any],
+                     signature: Optional[Tuple[int, int]] = None) -> LinkIndex:
+    """Stores the links of deliverables, the contents of deliverables_file at `signature` (default: now)."""
+    index = LinkIndex.from_records(deliverables, signature or file_signature(deliverables_file))
+    _link_cache[os.path.abspath(deliverables_file)] = index
+    if index.signature is not None:
+        path = get_links_path(deliverables_file)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, marshal.dumps((index.signature, index.task_of, index.position_of)))
+        except OSError:
+            pass  # The sidecar is an optimization only
+    return index
+
+
+def get_link_index(deliverables_file) -> LinkIndex:
+    """The LinkIndex of deliverables_file, from memory or the sidecar while the file is unchanged."""
+    key = os.path.abspath(deliverables_file)
+    signature = file_signature(key)
+    if signature is None:
+        return LinkIndex({})
+    cached = _link_cache.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached
+    try:
+        with open(get_links_path(key), "rb") as f:
+            stored_signature, task_of, position_of = marshal.loads(f.read())
+        if tuple(stored_signature) == signature:
+            index = _link_cache[key] = LinkIndex(task_of, signature, position_of)
+            return index
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    return write_link_index(key, snapshot.iter_items(key, "deliverables"), signature)
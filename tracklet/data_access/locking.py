@@ -0,0 +1,123 @@
+# tracklet/data_access/locking.py
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+from .cache import TRACKLET_DIR, get_lock_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PathLike = Union[str, Path]
+
+LOCK_POLL_INTERVAL = 0.005
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a file lock could not be acquired in time."""
+
+
+def default_lock_timeout() -> float:
+    """Seconds to wait for a lock; override with TRACKLET_LOCK_TIMEOUT."""
+    try:
+        return float(os.environ.get("TRACKLET_LOCK_TIMEOUT", "10"))
+    except ValueError:
+        return 10.0
+
+
+def lock_path_for(path: PathLike) -> Path:
+    """
+    Lock file for `path` (the target itself is swapped by os.replace so it
+    can't hold the lock). Project files lock under the folder's
+    `.tracklet/locks`, so no lock files appear among the user's files;
+    files already inside `.tracklet` lock beside themselves.
+    """
+    path = Path(path)
+    if TRACKLET_DIR in path.parent.parts:
+        return path.with_name(f".{path.name}.lock")
+    return Path(get_lock_dir(path.parent)) / f"{path.name}.lock"
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: PathLike, timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    Holds an exclusive advisory lock for `path` (via its sidecar lock file).
+    Keep the critical section short: re-read, apply changes, replace, release.
+    """
+    timeout = default_lock_timeout() if timeout is None else timeout
+    lock_path = lock_path_for(path)
+    try:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    except FileNotFoundError:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f"Timed out after {timeout}s waiting for lock on {path}")
+            time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: PathLike, data: Union[str, bytes], fsync: bool = False) -> os.stat_result:
+    """
+    Writes `data` to a temporary file next to `path` and renames it into
+    place with os.replace, so readers see either the old or the new file.
+    Returns the stat of the file written (a rename keeps mtime and size).
+    """
+    path = Path(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    import tempfile  # write path only; keeps read-only commands from importing it
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with (os.fdopen(fd, "wb") if isinstance(data, bytes) else os.fdopen(fd, "w", encoding="utf-8")) as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        written = os.stat(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return written
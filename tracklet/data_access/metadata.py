@@ -1,6 +1,7 @@
-import yaml
 import os
 from datetime import datetime
+from . import codec
+from .locking import file_lock
 
 META_FILENAME = ".projectmeta"
 
@@ -15,17 +16,30 @@ STAGES = [
 ]
 
 def read_metadata(project_path):
-    meta_path = os.path.join(project_path, META_FILENAME)
-    if not os.path.exists(meta_path):
-        return None
-    with open(meta_path, "r") as f:
-        return yaml.safe_load(f)
+    return codec.load_file(os.path.join(project_path, META_FILENAME))
+
+def default_jobs():
+    """Default worker count for concurrent metadata reads."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+def read_metadata_many(project_paths, jobs=None):
+    """
+    Reads several projects' metadata on a bounded thread pool.
+    Results are returned in the same order as project_paths; jobs=1 reads serially.
+    """
+    project_paths = list(project_paths)
+    jobs = default_jobs() if jobs is None else max(1, jobs)
+    if jobs == 1 or len(project_paths) < 2:
+        return [read_metadata(path) for path in project_paths]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(jobs, len(project_paths))) as pool:
+        return list(pool.map(read_metadata, project_paths))
 
 def write_metadata(project_path, data):
     meta_path = os.path.join(project_path, META_FILENAME)
     data['last_updated'] = datetime.now().strftime("%Y-%m-%d")
-    with open(meta_path, "w") as f:
-        yaml.dump(data, f)
+    with file_lock(meta_path):
+        codec.dump_file(meta_path, data)
 
 def create_default_metadata(project_path, name, description, author, tags, stage):
     data = {
@@ -0,0 +1,266 @@
+# tracklet/data_access/snapshot.py
+
+"""
+Binary snapshots of parsed record files (`tasks.yaml`, `deliverables.yaml`),
+kept in the `.tracklet/cache/` folder next to each file.
+
+A snapshot is the parsed document in `marshal` format behind a small
+header holding the YAML file's mtime, size and content hash. A read
+that finds a snapshot matching the file's mtime/size loads it in a
+fraction of the YAML parse time. If only the mtime moved (a checkout or
+`touch`), the hash decides; otherwise the YAML is parsed and the
+snapshot rewritten. The YAML stays the source of truth and hand edits are
+picked up transparently. Writes through `dump_file` refresh the snapshot
+directly, so the next read never parses YAML.
+
+Snapshots are opt-in: set TRACKLET_SNAPSHOT=1 for projects whose record
+files are large enough for the YAML parse to matter. Otherwise everything
+here reads and writes the YAML only and no cache files are created.
+"""
+
+import marshal
+import os
+import struct
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import codec
+from .cache import file_signature, get_cache_dir
+from .locking import atomic_write
+
+SNAPSHOT_SUFFIX = ".snap"
+CHUNK_ITEMS = 1000
+_MAGIC = b"TKS1"
+_HEADER = struct.Struct("<4sqq16s")  # magic, mtime_ns, size, blake2b-128 of the YAML
+_INDEX_LENGTH = struct.Struct("<I")
+
+Span = Tuple[int, int, bool]  # offset, length, dates tagged
+
+
+def snapshots_enabled() -> bool:
+    return os.environ.get("TRACKLET_SNAPSHOT", "") not in ("", "0")
+
+
+def get_snapshot_path(path) -> str:
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(get_cache_dir(folder), name + SNAPSHOT_SUFFIX)
+
+
+def _digest(content: bytes) -> bytes:
+    import hashlib  # only needed when a snapshot is written or verified
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+# YAML documents only hold dicts, lists and scalars, so tuples are free to
+# carry the values marshal cannot: dates and datetimes from unquoted YAML.
+def _tag(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _tag(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_tag(item) for item in value]
+    if isinstance(value, datetime):
+        return ("datetime", value.isoformat())
+    if isinstance(value, date):
+        return ("date", value.isoformat())
+    return value
+
+
+def _untag(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _untag(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_untag(item) for item in value]
+    if isinstance(value, tuple):
+        kind, text = value
+        return datetime.fromisoformat(text) if kind == "datetime" else date.fromisoformat(text)
+    return value
+
+
+def _dumps(value: Any) -> Tuple[bytes, bool]:
+    try:
+        return marshal.dumps(value), False
+    except ValueError:
+        return marshal.dumps(_tag(value)), True
+
+
+def _pack(data: Any) -> bytes:
+    """
+    Body of a snapshot: an index, then the document with its top-level lists
+    left out, then those lists in chunks of CHUNK_ITEMS items. Chunks are
+    loaded separately, so iterating stops paying as soon as the caller stops.
+    """
+    parts: List[bytes] = []
+    offset = 0
+
+    def add(value: Any) -> Span:
+        nonlocal offset
+        blob, tagged = _dumps(value)
+        parts.append(blob)
+        offset += len(blob)
+        return offset - len(blob), len(blob), tagged
+
+    chunks: Dict[Any, List[Span]] = {}
+    doc = data
+    if isinstance(data, dict):
+        doc = {}
+        for key, value in data.items():
+            if isinstance(value, list):
+                chunks[key] = [add(value[start:start + CHUNK_ITEMS]) for start in range(0, len(value), CHUNK_ITEMS)]
+            doc[key] = None if isinstance(value, list) else value
+    index = marshal.dumps((add(doc), chunks))
+    return _INDEX_LENGTH.pack(len(index)) + index + b"".join(parts)
+
+
+def _load_span(body: memoryview, span: Span) -> Any:
+    offset, length, tagged = span
+    value = marshal.loads(body[offset:offset + length])
+    return _untag(value) if tagged else value
+
+
+def _signature_of(st: os.stat_result) -> Tuple[int, int]:
+    return st.st_mtime_ns, st.st_size
+
+
+def write_snapshot(path, data: Any, content: bytes, signature: Tuple[int, int]) -> None:
+    """
+    Stores data as the snapshot of path, whose bytes were content while the
+    file had `signature`. The signature must be taken from the same open
+    file (or write) as content, never re-read afterwards: a commit landing in
+    between would otherwise give the old data the new file's signature.
+    """
+    try:
+        body = _pack(data)
+    except ValueError:
+        return  # something no snapshot can hold; keep reading the YAML
+    snapshot = get_snapshot_path(path)
+    try:
+        os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+        atomic_write(snapshot, _HEADER.pack(_MAGIC, *signature, _digest(content)) + body)
+    except OSError:
+        pass  # Snapshots are an optimization only
+
+
+def _open_snapshot(path) -> Optional[Tuple[memoryview, Span, Dict[Any, List[Span]]]]:
+    """(body, document span, list chunks) of path's snapshot if it matches the file, else None."""
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    try:
+        with open(get_snapshot_path(path), "rb") as f:
+            blob = f.read()
+        magic, mtime_ns, size, digest = _HEADER.unpack_from(blob)
+        index_length, = _INDEX_LENGTH.unpack_from(blob, _HEADER.size)
+    except (OSError, struct.error):
+        return None
+    if magic != _MAGIC or size != signature[1]:
+        return None
+    if mtime_ns != signature[0]:
+        # Same size, new mtime: reuse the snapshot if the bytes are unchanged.
+        try:
+            with open(path, "rb") as f:
+                signature = _signature_of(os.fstat(f.fileno()))
+                content = f.read()
+        except OSError:
+            return None
+        if _digest(content) != digest:
+            return None
+        try:
+            atomic_write(get_snapshot_path(path), _HEADER.pack(_MAGIC, *signature, digest) + blob[_HEADER.size:])
+        except OSError:
+            pass
+    start = _HEADER.size + _INDEX_LENGTH.size
+    try:
+        doc_span, chunks = marshal.loads(blob[start:start + index_length])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return memoryview(blob)[start + index_length:], doc_span, chunks
+
+
+def read_snapshot(path) -> Tuple[bool, Any]:
+    """(True, data) if path has a snapshot matching its current contents, else (False, None)."""
+    opened = _open_snapshot(path)
+    if opened is None:
+        return False, None
+    body, doc_span, chunks = opened
+    try:
+        data = _load_span(body, doc_span)
+        for key, spans in chunks.items():
+            data[key] = [item for span in spans for item in _load_span(body, span)]
+    except (EOFError, ValueError, TypeError):
+        return False, None
+    return True, data
+
+
+def load_file(path) -> Any:
+    """codec.load_file through the snapshot: parses the YAML only when it changed."""
+    if not snapshots_enabled():
+        return codec.load_file(path)
+    found, data = read_snapshot(path)
+    if found:
+        return data
+    try:
+        with open(path, "rb") as f:
+            signature = _signature_of(os.fstat(f.fileno()))
+            content = f.read()
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        return None
+    data = codec.load(content.decode("utf-8"))
+    write_snapshot(path, data, content, signature)
+    return data
+
+
+def iter_items(path, key: str) -> Iterator[Any]:
+    """
+    codec.iter_items through the snapshot, loading one chunk of items at a
+    time. The first read after an edit parses the whole file once to
+    rebuild the snapshot; with snapshots disabled items stream from the YAML.
+    """
+    if not snapshots_enabled():
+        return codec.iter_items(path, key)
+    opened = _open_snapshot(path)
+    if opened is not None:
+        body, _, chunks = opened
+        return (item for span in chunks.get(key, ()) for item in _load_span(body, span))
+    data = load_file(path)
+    items = data.get(key) if isinstance(data, dict) else None
+    return iter(items if isinstance(items, list) else [])
+
+
+def get_items(path, key: str, positions: List[int]) -> Optional[List[Any]]:
+    """
+    The items at `positions` of the top-level list `key`, unmarshalling only
+    the chunks holding them. None when there is no snapshot matching the
+    file (or a position is out of range); callers then read the file.
+    """
+    if not snapshots_enabled():
+        return None
+    opened = _open_snapshot(path)
+    if opened is None:
+        return None
+    body, _, chunks = opened
+    spans = chunks.get(key, [])
+    loaded: Dict[int, List[Any]] = {}
+    items = []
+    try:
+        for position in positions:
+            if position < 0:
+                return None
+            chunk, offset = divmod(position, CHUNK_ITEMS)
+            if chunk not in loaded:
+                loaded[chunk] = _load_span(body, spans[chunk])
+            items.append(loaded[chunk][offset])
+    except (IndexError, EOFError, ValueError, TypeError):
+        return None
+    return items
+
+
+def dump_file(path, data: Any, **kwargs) -> Tuple[int, int]:
+    """
+    codec.dump_file that also refreshes the snapshot from the data just
+    written. Returns the (mtime_ns, size) signature of the written file.
+    """
+    text = codec.dump(data, **kwargs)
+    written = atomic_write(path, text)
+    if snapshots_enabled():
+        write_snapshot(path, data, text.encode("utf-8"), _signature_of(written))
+    return _signature_of(written)
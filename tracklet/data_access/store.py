@@ -0,0 +1,240 @@
+# tracklet/data_access/store.py
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+from . import snapshot
+from .links import LINK_FIELD, get_link_index, write_link_index
+from .locking import file_lock
+
+
+def _version(path: Path):
+    """Identifies one on-disk version of a file; atomic replaces always change the inode."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+_REMOVED = object()  # tombstone for a deleted row until the next read
+
+
+class RecordStore:
+    """
+    Id-indexed, in-memory view of a YAML record file such as `tasks.yaml`.
+    The file is read once when the store is opened; get/put/delete work on
+    the records in file order through an id -> position map, and `commit`
+    writes the file back once, so bulk updates cost one read and one write
+    regardless of record count. Records without an id stay where they are;
+    records sharing an id are all kept (with a warning) and the last one
+    is the one get/put/delete address.
+
+    Commits are atomic and lock-protected: if another process changed the
+    file since it was loaded, it is re-read under the lock and only this
+    store's puts and deletes are replayed on top, so no update is lost.
+    """
+    root_key: str = ""
+    filename: str = ""
+
+    def __init__(self, file=None, id_field: str = "id", lock_timeout: Optional[float] = None):
+        self.file = Path(file or self.filename)
+        self.id_field = id_field
+        self.lock_timeout = lock_timeout
+        self._rows: List[Any] = []  # every record in file order, _REMOVED once deleted
+        self._position: Dict[str, int] = {}  # record id -> index in _rows
+        self._removed = 0
+        self.duplicates: Set[str] = set()  # ids that more than one record in the file uses
+        self._version = None
+        self._loaded = False
+        self._put: Dict[str, Dict[str, Any]] = {}
+        self._deleted: Set[str] = set()
+
+    @classmethod
+    def for_project(cls, project_path, **kwargs) -> "RecordStore":
+        return cls(Path(project_path) / cls.filename, **kwargs)
+
+    # --- Loading and flushing ---
+
+    def load(self) -> "RecordStore":
+        """(Re)reads the file, discarding uncommitted changes."""
+        self._read()
+        self._put.clear()
+        self._deleted.clear()
+        return self
+
+    def _read(self) -> None:
+        self._version = _version(self.file)
+        data = snapshot.load_file(self.file) or {}
+        self._rows = list(data.get(self.root_key) or [])
+        self._position = {}
+        self._removed = 0
+        duplicates = set()
+        for position, record in enumerate(self._rows):
+            key = record.get(self.id_field) if isinstance(record, dict) else None
+            if key is not None:
+                if key in self._position:
+                    duplicates.add(key)
+                self._position[key] = position
+        if duplicates - self.duplicates:
+            shown = ", ".join(str(key) for key in sorted(duplicates, key=str)[:5])
+            print(f"⚠️ {self.file}: {len(duplicates)} id(s) used by more than one record ({shown}); "
+                  f"all are kept, the last one is the one updated.")
+        self.duplicates = duplicates
+        self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._put or self._deleted)
+
+    def commit(self) -> bool:
+        """Writes pending changes to disk. Returns True if the file was written."""
+        if not self.dirty:
+            return False
+        with file_lock(self.file, timeout=self.lock_timeout):
+            if _version(self.file) != self._version:
+                # Someone else wrote the file since we loaded it: rebase on their version.
+                self._read()
+                for record_id in self._deleted:
+                    self._remove(record_id)
+                for record_id, record in self._put.items():
+                    self._set(record_id, record)
+            signature = snapshot.dump_file(self.file, {self.root_key: self.records()})
+            self._version = _version(self.file)
+            self._committed(signature)
+        self._put.clear()
+        self._deleted.clear()
+        return True
+
+    def _committed(self, signature) -> None:
+        """Called under the file lock after each write (of `signature`), to refresh derived indexes."""
+
+    def __enter__(self) -> "RecordStore":
+        self._ensure_loaded()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+
+    # --- Queries ---
+
+    def get(self, record_id: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        self._ensure_loaded()
+        position = self._position.get(record_id)
+        return default if position is None else self._rows[position]
+
+    def records(self) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        if not self._removed:
+            return list(self._rows)
+        return [record for record in self._rows if record is not _REMOVED]
+
+    def ids(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._position)
+
+    def __contains__(self, record_id) -> bool:
+        self._ensure_loaded()
+        return record_id in self._position
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.records())
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._rows) - self._removed
+
+    def _set(self, key, record) -> None:
+        position = self._position.get(key)
+        if position is None:
+            self._position[key] = len(self._rows)
+            self._rows.append(record)
+        else:
+            self._rows[position] = record
+
+    def _remove(self, key) -> bool:
+        position = self._position.pop(key, None)
+        if position is None:
+            return False
+        if key in self.duplicates:
+            # Deleting an id deletes every record that uses it.
+            self.duplicates.discard(key)
+            positions = [i for i, record in enumerate(self._rows)
+                         if isinstance(record, dict) and record.get(self.id_field) == key]
+        else:
+            positions = [position]
+        for i in positions:
+            self._rows[i] = _REMOVED
+        self._removed += len(positions)
+        return True
+
+    # --- Mutations (in memory until commit) ---
+
+    def put(self, record: Dict[str, Any]) -> None:
+        """Inserts or replaces a record by id; replaced records keep their position."""
+        key = record.get(self.id_field)
+        if key is None:
+            raise ValueError(f"Record has no '{self.id_field}' field.")
+        self._ensure_loaded()
+        self._set(key, record)
+        self._put[key] = record
+        self._deleted.discard(key)
+
+    def put_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        for record in records:
+            self.put(record)
+            count += 1
+        return count
+
+    def delete(self, record_id: str) -> bool:
+        self._ensure_loaded()
+        if not self._remove(record_id):
+            return False
+        self._put.pop(record_id, None)
+        self._deleted.add(record_id)
+        return True
+
+    def delete_many(self, record_ids: Iterable[str]) -> int:
+        return sum(1 for record_id in record_ids if self.delete(record_id))
+
+
+class TaskStore(RecordStore):
+    root_key = "tasks"
+    filename = "tasks.yaml"
+
+
+class DeliverableStore(RecordStore):
+    root_key = "deliverables"
+    filename = "deliverables.yaml"
+
+    def _committed(self, signature) -> None:
+        write_link_index(self.file, self.records(), signature)
+
+    def linked_to(self, task_id) -> List[Dict[str, Any]]:
+        """
+        Deliverables whose related_task_id is task_id, through the link index.
+        A store that is not loaded yet stays unloaded: only the chunks of the
+        snapshot holding those deliverables are read.
+        """
+        if self._loaded and self.dirty:
+            return [record for record in self.records()
+                    if isinstance(record, dict) and str(record.get(LINK_FIELD)) == str(task_id)]
+        links = get_link_index(self.file)
+        ids = links.deliverables_for(task_id)
+        if not ids:
+            return []
+        if self._loaded:
+            return [self.get(record_id) for record_id in ids if record_id in self._position]
+        wanted = set(ids)
+        records = snapshot.get_items(self.file, self.root_key, [links.position_of.get(record_id, -1) for record_id in ids])
+        if records is None or any(not isinstance(r, dict) or str(r.get(self.id_field)) not in wanted for r in records):
+            # No usable snapshot (or it moved on since the index was read): scan the file.
+            records = [r for r in snapshot.iter_items(self.file, self.root_key)
+                       if isinstance(r, dict) and str(r.get(self.id_field)) in wanted]
+        return records
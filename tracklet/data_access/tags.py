@@ -0,0 +1,195 @@
+# tracklet/data_access/tags.py
+
+"""
+Tag dictionary for autocomplete: every tag used by a workspace's projects
+plus the tags declared in `rules/definitions/tag_schema.yaml`, with usage
+counts and schema categories.
+
+The dictionary is cached in-process and in `.tracklet/cache/tags.json`,
+keyed by the mtime/size of every `.projectmeta` and of the schema, so a
+prompt only re-reads metadata (through the workspace index) after a file
+changed. Lookups go through a prefix trie whose nodes keep their best
+TOP_K tags, so a suggestion costs one walk down the typed prefix however
+many tags the workspace has.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import codec
+from .cache import file_signature, get_cache_dir
+from .locking import atomic_write
+from .metadata import META_FILENAME
+
+TAG_SCHEMA_PATH = Path("rules/definitions/tag_schema.yaml")
+TAGS_CACHE_FILENAME = "tags.json"
+TOP_K = 10
+
+
+def load_tag_schema(schema_path=None) -> Dict[str, List[str]]:
+    """
+    {tag: [category ids]} from the tag schema. Accepts the categorized
+    format (`categories: [{id, tags}]`) as well as a flat `tags:` list or a
+    bare list; tags from the flat formats have no category.
+    """
+    try:
+        data = codec.load_file(Path(schema_path or TAG_SCHEMA_PATH))
+    except Exception:
+        return {}
+    schema: Dict[str, List[str]] = {}
+    if isinstance(data, dict):
+        for category in data.get("categories") or []:
+            if isinstance(category, dict):
+                for tag in category.get("tags") or []:
+                    schema.setdefault(str(tag), []).append(str(category.get("id", "")))
+        data = data.get("tags") or []
+    if isinstance(data, list):
+        for tag in data:
+            schema.setdefault(str(tag), [])
+    return schema
+
+
+class TagTrie:
+    """
+    Prefix trie over lower-cased tags. Tags are inserted best first, so each
+    node's `top` list is simply the first TOP_K tags that pass through it.
+    """
+
+    __slots__ = ("root", "k")
+
+    def __init__(self, ranked_tags: Iterable[str], k: int = TOP_K):
+        self.k = k
+        self.root: Dict[str, Any] = {"": []}
+        for tag in ranked_tags:
+            node = self.root
+            if len(node[""]) < k:
+                node[""].append(tag)
+            for char in tag.lower():
+                child = node.get(char)
+                if child is None:
+                    child = node[char] = {"": []}
+                node = child
+                if len(node[""]) < k:
+                    node[""].append(tag)
+
+    def top(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Best tags starting with prefix (case-insensitive), at most min(limit, k)."""
+        node = self.root
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return []
+        return node[""][:limit or self.k]
+
+
+class TagDictionary:
+    """Tags of one workspace with usage counts and schema categories."""
+
+    def __init__(self, counts: Dict[str, int], schema: Dict[str, List[str]], signature: str = ""):
+        self.counts = counts
+        self.schema = schema
+        self.signature = signature
+        # Most used first; schema-only tags (count 0) after, alphabetically
+        self.ranked = sorted(set(counts) | set(schema), key=lambda tag: (-counts.get(tag, 0), tag.lower(), tag))
+        self._trie: Optional[TagTrie] = None
+
+    def __len__(self) -> int:
+        return len(self.ranked)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.counts or tag in self.schema
+
+    @property
+    def trie(self) -> TagTrie:
+        if self._trie is None:
+            self._trie = TagTrie(self.ranked)
+        return self._trie
+
+    def suggest(self, prefix: str = "", limit: int = TOP_K) -> List[str]:
+        """Up to `limit` tags starting with prefix, most used first."""
+        if limit <= self.trie.k:
+            return self.trie.top(prefix, limit)
+        lowered = prefix.lower()
+        return [tag for tag in self.ranked if tag.lower().startswith(lowered)][:limit]
+
+    def categories(self, tag: str) -> List[str]:
+        return self.schema.get(tag, [])
+
+    def entries(self) -> List[Dict[str, Any]]:
+        return [{"tag": tag, "count": self.counts.get(tag, 0), "categories": self.categories(tag)} for tag in self.ranked]
+
+
+def workspace_for(path) -> str:
+    """The workspace holding path: its parent when path is a project folder."""
+    path = os.path.abspath(path)
+    if os.path.isfile(os.path.join(path, META_FILENAME)):
+        parent = os.path.dirname(path)
+        return parent if parent != path else path
+    return path
+
+
+def _signature(project_paths: List[str], schema_path: Path) -> str:
+    digest = hashlib.sha1(repr(file_signature(schema_path)).encode("utf-8"))
+    digest.update(str(schema_path.resolve()).encode("utf-8"))
+    for path in sorted(project_paths):
+        digest.update(f"{path}\0{file_signature(os.path.join(path, META_FILENAME))}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_path(base_path) -> str:
+    return os.path.join(get_cache_dir(base_path), TAGS_CACHE_FILENAME)
+
+
+def _read_cache(base_path, signature: str) -> Optional[Tuple[Dict[str, int], Dict[str, List[str]]]]:
+    try:
+        with open(_cache_path(base_path), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("signature") != signature:
+        return None
+    return cached.get("counts") or {}, cached.get("schema") or {}
+
+
+def _write_cache(base_path, signature: str, counts: Dict[str, int], schema: Dict[str, List[str]]) -> None:
+    try:
+        get_cache_dir(base_path, create=True)
+        atomic_write(_cache_path(base_path), json.dumps({"signature": signature, "counts": counts, "schema": schema}))
+    except OSError:
+        pass  # The disk cache is an optimization only
+
+
+_dictionary_cache: Dict[Tuple[str, str], TagDictionary] = {}
+
+
+def get_tag_dictionary(path=".", schema_path=None, jobs=None, refresh: bool = False) -> TagDictionary:
+    """
+    The TagDictionary of the workspace around path (see workspace_for).
+    Served from memory or `.tracklet/cache/tags.json` until a `.projectmeta`
+    or the schema changes; then rebuilt from the workspace index.
+    """
+    from .tracker import discover_project_dirs, find_projects
+
+    base_path = workspace_for(path)
+    schema_path = Path(schema_path or TAG_SCHEMA_PATH)
+    signature = _signature(discover_project_dirs(base_path), schema_path)
+    key = (base_path, str(schema_path.resolve()))
+
+    cached = _dictionary_cache.get(key)
+    if cached is not None and cached.signature == signature and not refresh:
+        return cached
+    stored = None if refresh else _read_cache(base_path, signature)
+    if stored is None:
+        counts: Dict[str, int] = {}
+        for _, meta in find_projects(base_path, jobs=jobs):
+            for tag in set(meta.get("tags") or []) if isinstance(meta, dict) else ():
+                counts[str(tag)] = counts.get(str(tag), 0) + 1
+        schema = load_tag_schema(schema_path)
+        _write_cache(base_path, signature, counts, schema)
+    else:
+        counts, schema = stored
+    dictionary = _dictionary_cache[key] = TagDictionary(counts, schema, signature)
+    return dictionary
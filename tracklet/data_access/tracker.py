@@ -1,88 +1,161 @@
 import os
-from .metadata import read_metadata
+import sqlite3
+from fnmatch import fnmatch
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from .metadata import META_FILENAME
+from .cache import TRACKLET_DIR, file_signature
+from .index import SEARCH_FIELDS, WorkspaceIndex, index_enabled, load_metadata_map
 
-def is_project_folder(path: str) -> bool:
-    return os.path.isfile(os.path.join(path, ".projectmeta"))
+class ScanEntry(NamedTuple):
+    """A folder seen by scan_workspace; signature is None if it is not initialized."""
+    name: str
+    path: str
+    signature: Optional[Tuple[int, int]]
+    meta: Optional[dict] = None
 
-def collect_all_tags(base_path):
-    tags_set = set()
+    @property
+    def initialized(self) -> bool:
+        return self.signature is not None
+
+# Folders never descended into during discovery
+PRUNED_DIRS = {
+    TRACKLET_DIR, ".git", ".hg", ".svn", "node_modules", "__pycache__",
+    ".venv", "venv", ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".ruff_cache",
+    "site-packages",
+}
+VENV_MARKER = "pyvenv.cfg"
+IGNORE_FILENAME = ".trackletignore"
 
-    # Check base_path itself
-    if os.path.isfile(os.path.join(base_path, ".projectmeta")):
-        meta = read_metadata(base_path)
-        if meta and "tags" in meta:
-            tags_set.update(meta["tags"])
+def is_project_folder(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, META_FILENAME))
 
-    # Check immediate subdirectories
+def load_ignore_patterns(base_path) -> List[str]:
+    """Read user-configured prune globs from base_path/.trackletignore (one per line)."""
     try:
-        entries = os.listdir(base_path)
-    except FileNotFoundError:
+        with open(os.path.join(base_path, IGNORE_FILENAME), "r", encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+    except OSError:
         return []
+    return [line.rstrip("/") for line in lines if line and not line.startswith("#")]
 
-    for entry in entries:
-        full_path = os.path.join(base_path, entry)
-        if os.path.isdir(full_path):
-            meta_path = os.path.join(full_path, ".projectmeta")
-            if os.path.isfile(meta_path):
-                meta = read_metadata(full_path)
-                if meta and "tags" in meta:
-                    tags_set.update(meta["tags"])
+def _is_pruned(name, rel_path, patterns):
+    if name in PRUNED_DIRS:
+        return True
+    rel_path = rel_path.replace(os.sep, "/")
+    return any(fnmatch(name, p) or fnmatch(rel_path, p) for p in patterns)
 
-    return sorted(tags_set)
+def _scan_dirs(base_path, depth=1, exclude: Optional[Iterable[str]] = None):
+    """
+    Walk base_path with os.scandir and return its immediate subdirectories plus
+    any initialized project found up to `depth` levels down (None = unlimited).
+    Does not descend into projects, pruned folders or virtualenvs, so the cost
+    grows with the number of projects rather than the number of files.
+    Returns None if base_path is missing.
+    """
+    patterns = load_ignore_patterns(base_path) + list(exclude or [])
+    results = []
+    stack = [(base_path, "", 1)]
+    while stack:
+        path, rel, level = stack.pop()
+        try:
+            it = os.scandir(path)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            if level == 1:
+                return None
+            continue
+        with it:
+            # Follow symlinks only for immediate children, to avoid cycles deeper down
+            children = [
+                entry for entry in it
+                if entry.is_dir(follow_symlinks=(level == 1)) or entry.name == VENV_MARKER
+            ]
+        if level > 1 and any(entry.name == VENV_MARKER for entry in children):
+            continue
 
-def find_projects(base_path):
-    projects = []
+        for entry in children:
+            if entry.name == VENV_MARKER:
+                continue
+            child_rel = os.path.join(rel, entry.name) if rel else entry.name
+            if _is_pruned(entry.name, child_rel, patterns):
+                continue
+            signature = file_signature(os.path.join(entry.path, META_FILENAME))
+            if level == 1 or signature is not None:
+                results.append(ScanEntry(child_rel, entry.path, signature))
+            if signature is None and (depth is None or level < depth):
+                stack.append((entry.path, child_rel, level + 1))
 
-    # Check base_path itself
-    if os.path.isfile(os.path.join(base_path, ".projectmeta")):
-        meta = read_metadata(base_path)
-        if meta:
-            projects.append((base_path, meta))
+    results.sort(key=lambda e: e.name.split(os.sep))
+    return results
 
-    # List immediate subdirectories only (one level deep)
-    try:
-        entries = os.listdir(base_path)
-    except FileNotFoundError:
-        return projects
-
-    for entry in entries:
-        full_path = os.path.join(base_path, entry)
-        if os.path.isdir(full_path):
-            if os.path.isfile(os.path.join(full_path, ".projectmeta")):
-                meta = read_metadata(full_path)
-                if meta:
-                    projects.append((full_path, meta))
-    return projects
-
-def list_projects(base_path):
-    """List all immediate subdirectories, showing if initialized or not."""
-    try:
-        entries = os.listdir(base_path)
-    except FileNotFoundError:
+def _max_depth(depth, recursive):
+    return None if recursive else max(1, depth or 1)
+
+def scan_workspace(base_path, jobs=None, include_base=True, depth=1, recursive=False, exclude=None):
+    """
+    Scans base_path in a single pass and loads metadata for every initialized
+    folder through the workspace index, parsing changed `.projectmeta` files
+    concurrently on up to `jobs` workers. By default only immediate
+    subdirectories are scanned; `depth` or `recursive` reach nested layouts
+    such as clients/<client>/<project>.
+    Entries come back in a stable order: base_path first, then folders by path.
+    """
+    entries = _scan_dirs(base_path, _max_depth(depth, recursive), exclude)
+    if entries is None:
         return []
 
+    if include_base:
+        signature = file_signature(os.path.join(base_path, META_FILENAME))
+        if signature is not None:
+            name = os.path.basename(os.path.abspath(base_path))
+            entries.insert(0, ScanEntry(name, base_path, signature))
+
+    signatures = {e.path: e.signature for e in entries if e.initialized}
+    metas = load_metadata_map(base_path, signatures, jobs=jobs)
+    return [e._replace(meta=metas.get(e.path)) for e in entries]
+
+def discover_project_dirs(base_path, depth=1, recursive=False, exclude=None):
+    """Return every initialized project folder visible from base_path."""
+    entries = _scan_dirs(base_path, _max_depth(depth, recursive), exclude) or []
+    paths = [base_path] if is_project_folder(base_path) else []
+    paths.extend(e.path for e in entries if e.initialized)
+    return paths
+
+def collect_all_tags(base_path, jobs=None):
+    tags_set = set()
+    for entry in scan_workspace(base_path, jobs=jobs):
+        if entry.meta and "tags" in entry.meta:
+            tags_set.update(entry.meta["tags"])
+
+    return sorted(tags_set)
+
+def find_projects(base_path, jobs=None, **scan_options):
+    return [
+        (entry.path, entry.meta)
+        for entry in scan_workspace(base_path, jobs=jobs, **scan_options)
+        if entry.meta
+    ]
+
+def list_projects(base_path, jobs=None, **scan_options):
+    """List all immediate subdirectories (and nested projects), showing if initialized or not."""
     project_list = []
-    for entry in entries:
-        full_path = os.path.join(base_path, entry)
-        if os.path.isdir(full_path):
-            meta_path = os.path.join(full_path, ".projectmeta")
-            if os.path.isfile(meta_path):
-                meta = read_metadata(full_path)
-                project_list.append({
-                    "name": meta.get("name", entry),
-                    "path": full_path,
-                    "initialized": True,
-                    "tags": meta.get("tags", []),
-                    "stage": meta.get("progress", {}).get("stage", "Unknown")
-                })
-            else:
-                project_list.append({
-                    "name": entry,
-                    "path": full_path,
-                    "initialized": False,
-                    "tags": [],
-                    "stage": None
-                })
+    for entry in scan_workspace(base_path, jobs=jobs, include_base=False, **scan_options):
+        if entry.initialized:
+            meta = entry.meta or {}
+            project_list.append({
+                "name": meta.get("name", entry.name),
+                "path": entry.path,
+                "initialized": True,
+                "tags": meta.get("tags", []),
+                "stage": meta.get("progress", {}).get("stage", "Unknown")
+            })
+        else:
+            project_list.append({
+                "name": entry.name,
+                "path": entry.path,
+                "initialized": False,
+                "tags": [],
+                "stage": None
+            })
     return project_list
 
 def filter_projects(projects, tag=None, stage=None, author=None):
@@ -97,6 +170,44 @@ def filter_projects(projects, tag=None, stage=None, author=None):
         filtered.append((path, meta))
     return filtered
 
+def project_matches(meta, field, value):
+    """Linear-scan equivalent of the index: exact tag/stage, case-insensitive substring otherwise."""
+    if field == "tag":
+        return value in (meta.get("tags") or [])
+    if field == "stage":
+        return value == (meta.get("progress") or {}).get("stage")
+    return meta.get(field) is not None and value.lower() in str(meta[field]).lower()
+
+def _served_by_daemon(base_path) -> bool:
+    from .daemon_client import daemon_enabled, find_socket
+    return find_socket(base_path) is not None and daemon_enabled()
+
+def search_projects(base_path, projects, include, exclude=None):
+    """
+    Filters [(path, meta)] to projects matching at least one value of every
+    include field and no value of any exclude field ({field: [values]}, with
+    fields from SEARCH_FIELDS). Uses the workspace index's postings and
+    trigrams when available, otherwise checks each project in turn.
+    When a daemon served the metadata the index was not refreshed with it,
+    so the (already loaded) projects are checked directly instead.
+    """
+    exclude = exclude or {}
+    for field in (*include, *exclude):
+        if field not in SEARCH_FIELDS:
+            raise ValueError(f"Unknown search field '{field}'")
+    if index_enabled() and not _served_by_daemon(base_path):
+        try:
+            with WorkspaceIndex(base_path) as index:
+                matched = index.search([path for path, _ in projects], include, exclude)
+            return [(path, meta) for path, meta in projects if path in matched]
+        except (sqlite3.Error, OSError):
+            pass
+    return [
+        (path, meta) for path, meta in projects
+        if all(any(project_matches(meta, f, v) for v in values) for f, values in include.items() if values)
+        and not any(project_matches(meta, f, v) for f, values in exclude.items() for v in values or [])
+    ]
+
 def summarize_progress(meta):
     tasks = meta.get("progress", {}).get("tasks", {})
     completed = len(tasks.get("completed", []))
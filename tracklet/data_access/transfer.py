@@ -0,0 +1,110 @@
+# tracklet/data_access/transfer.py
+
+"""
+Streaming CSV and JSON Lines readers/writers for bulk import and export.
+Records are yielded and written one at a time, so memory use does not
+depend on the size of the input or output file.
+"""
+
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+
+FORMATS = ("csv", "jsonl")
+FORMAT_BY_SUFFIX = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl"}
+
+# Fields holding lists; in CSV they are joined with LIST_SEPARATOR.
+LIST_FIELDS = {"assignees", "tags"}
+LIST_SEPARATOR = ";"
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """Returns fmt if given, otherwise the format implied by the file extension."""
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'; expected one of {', '.join(FORMATS)}.")
+        return fmt
+    detected = FORMAT_BY_SUFFIX.get(Path(path).suffix.lower())
+    if detected is None:
+        raise ValueError(f"Cannot tell the format of '{path}'; pass --format csv or --format jsonl.")
+    return detected
+
+
+@contextmanager
+def _open(path: str, mode: str) -> Iterator[IO[str]]:
+    if path == "-":
+        yield sys.stdin if "r" in mode else sys.stdout
+        return
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        yield f
+
+
+def _from_csv_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    record = {}
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue  # missing cells and extra columns without a header
+        key = key.strip()
+        if key in LIST_FIELDS:
+            record[key] = [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+        else:
+            record[key] = value
+    return record
+
+
+def _to_csv_value(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return LIST_SEPARATOR.join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return "" if value is None else value
+
+
+def iter_records(path: str, fmt: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one dict per CSV row or JSON line. Raises ValueError with the line
+    number for malformed JSON lines.
+    """
+    with _open(path, "r") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                yield _from_csv_row(row)
+            return
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {line_number}: invalid JSON ({e})") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"Line {line_number}: expected a JSON object")
+            yield record
+
+
+def write_records(records: Iterable[Dict[str, Any]], path: str, fmt: str,
+                  fields: Optional[List[str]] = None) -> int:
+    """
+    Streams records to path ("-" for stdout). CSV output uses `fields` as
+    columns (extra keys are dropped); JSON Lines output keeps every field
+    unless `fields` is given. Returns the number of records written.
+    """
+    count = 0
+    with _open(path, "w") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=fields or [], extrasaction="ignore")
+            writer.writeheader()
+            for record in records:
+                writer.writerow({key: _to_csv_value(record.get(key)) for key in writer.fieldnames})
+                count += 1
+            return count
+        for record in records:
+            if fields:
+                record = {key: record.get(key) for key in fields}
+            f.write(json.dumps(record, default=str, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
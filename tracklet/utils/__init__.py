@@ -14,5 +14,6 @@ from .format import (
     format_datetime,
     status_text,
     print_colored,
-    format_tags
+    format_tags,
+    get_console
 )
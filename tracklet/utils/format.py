@@ -1,11 +1,21 @@
 # tracklet/utils/formats.py
 
 from datetime import datetime
-from rich.console import Console
-from rich.text import Text
-from rich.style import Style
+from typing import TYPE_CHECKING
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.text import Text
+
+# Rich is imported on first use so that importing tracklet.utils stays cheap.
+_console = None
+
+def get_console():
+    """Shared Rich console, created on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 # --- Date & Time Formatting ---
 
@@ -21,16 +31,18 @@ def format_datetime(dt_str: str) -> str:
 # --- Status & Tag Styling ---
 
 STATUS_STYLES = {
-    "todo": Style(color="bright_blue", bold=True),
-    "in_progress": Style(color="yellow", bold=True),
-    "completed": Style(color="green", bold=True),
-    "blocked": Style(color="red", bold=True),
-    "default": Style(color="white")
+    "todo": {"color": "bright_blue", "bold": True},
+    "in_progress": {"color": "yellow", "bold": True},
+    "completed": {"color": "green", "bold": True},
+    "blocked": {"color": "red", "bold": True},
+    "default": {"color": "white"}
 }
 
-def status_text(status: str) -> Text:
+def status_text(status: str) -> "Text":
     """Return a styled Text object for a given status."""
-    style = STATUS_STYLES.get(status, STATUS_STYLES["default"])
+    from rich.style import Style
+    from rich.text import Text
+    style = Style(**STATUS_STYLES.get(status, STATUS_STYLES["default"]))
     return Text(status.replace("_", " ").title(), style=style)
 
 
@@ -38,14 +50,18 @@ def status_text(status: str) -> Text:
 
 def print_colored(message: str, color: str = "white", bold: bool = False):
     """Print any message with rich formatting."""
+    from rich.style import Style
+    from rich.text import Text
     style = Style(color=color, bold=bold)
-    console.print(Text(message, style=style))
+    get_console().print(Text(message, style=style))
 
 
 # --- Tags or Info Lists ---
 
-def format_tags(tags: list[str]) -> Text:
+def format_tags(tags: list[str]) -> "Text":
     """Return a comma-separated colored tag list."""
+    from rich.style import Style
+    from rich.text import Text
     tag_text = Text()
     for i, tag in enumerate(tags):
         tag_text.append(tag, style=Style(color="magenta"))
@@ -1,23 +1,27 @@
-from InquirerPy import inquirer
-from InquirerPy.base.control import Choice
+# InquirerPy (and prompt_toolkit) are imported inside each prompt so that
+# non-interactive command paths never load them.
 from typing import List
-from pathlib import Path
-import yaml
 import os
 
-from tracklet.data_access.tracker import collect_all_tags
+from tracklet.data_access.tags import get_tag_dictionary, load_tag_schema
+
+# Above this many tags the prompt completes from the tag trie instead of fuzzy-filtering every tag
+FUZZY_TAG_LIMIT = 2000
 
 def prompt_text(message: str, default: str = "") -> str:
     """Prompt a single line of text."""
+    from InquirerPy import inquirer
     return inquirer.text(message=message, default=default).execute()
 
 def prompt_text_list(message):
     """Prompt for comma-separated list and return list of trimmed strings."""
+    from InquirerPy import inquirer
     text = inquirer.text(message=message).execute()
     return [t.strip() for t in text.split(",") if t.strip()]
 
 def prompt_select(message: str, choices: List[str], default: str = None) -> str:
     """Prompt a single-select choice list."""
+    from InquirerPy import inquirer
     return inquirer.select(
         message=message,
         choices=choices,
@@ -28,6 +32,8 @@ def prompt_select(message: str, choices: List[str], default: str = None) -> str:
 
 def prompt_multi_select(message: str, choices: List[str], default: List[str] = []) -> List[str]:
     """Prompt a multi-select checkbox list."""
+    from InquirerPy import inquirer
+    from InquirerPy.base.control import Choice
     return inquirer.checkbox(
         message=message,
         choices=[Choice(name=ch, enabled=ch in default) for ch in choices],
@@ -36,56 +42,53 @@ def prompt_multi_select(message: str, choices: List[str], default: List[str] = [
 
 
 def prompt_tags_with_autocomplete(project_path: str = ".", mode: str = "Add") -> List[str]:
-    """Prompt user for tags with autocomplete suggestions."""
-    # Try to gather all tags from existing metadata or tag_schema
+    """Prompt user for tags, suggesting the workspace's and tag schema's tags (most used first)."""
+    from InquirerPy import inquirer
     try:
-        choices = collect_all_tags(project_path)
-        if choices is null:
-            choices=_load_all_tags(project_path)
-        choices = sorted(set(choices))  # Clean + deduplicate
+        dictionary = get_tag_dictionary(project_path)
     except Exception:
-        choices = []
+        dictionary = None
 
-    if not choices:
+    if not dictionary:
         # Fallback plain input if no tags
         print("⚠️ No existing tags found. Please enter tags manually (comma-separated):")
         tag_input = input("Tags: ").strip()
         return [tag.strip() for tag in tag_input.split(",") if tag.strip()]
 
-    # Normal fuzzy prompt
-    selected_tags = inquirer.fuzzy(
-        message="Select or type tags:",
-        choices=choices,
+    if len(dictionary) > FUZZY_TAG_LIMIT:
+        # The fuzzy prompt re-scores every choice on each keystroke; large
+        # dictionaries complete the word being typed from the tag trie instead.
+        text = inquirer.text(
+            message=f"{mode} tags (comma-separated, Tab to complete):",
+            completer=_tag_completer(dictionary),
+        ).execute()
+        return [tag.strip() for tag in text.split(",") if tag.strip()]
+
+    return inquirer.fuzzy(
+        message=f"{mode} tags (type to filter):",
+        choices=dictionary.ranked,
         multiselect=True,
         validate=lambda result: len(result) > 0,
         instruction="Use arrow keys or type to search (press space to select, enter to confirm)",
     ).execute()
-    return selected_tags
-    #tag_choices = _load_all_tags(project_path)
-    
-    inquirer.fuzzy(
-        message=f"{mode} Tags (type to filter):",
-        choices=tag_choices,
-        multiselect=True,
-        validate=lambda result: isinstance(result, list),
-        instruction="Use arrows and spacebar to select. Enter to confirm.",
-    ).execute()
+
+
+def _tag_completer(dictionary):
+    """prompt_toolkit completer suggesting tags for the last comma-separated word."""
+    from prompt_toolkit.completion import Completer, Completion
+
+    class TagCompleter(Completer):
+        def get_completions(self, document, complete_event):
+            word = document.text_before_cursor.rsplit(",", 1)[-1].lstrip()
+            for tag in dictionary.suggest(word):
+                yield Completion(tag, start_position=-len(word), display_meta=f"{dictionary.counts.get(tag, 0)} projects")
+
+    return TagCompleter()
 
 
 def _load_all_tags(project_path: str) -> List[str]:
-    """Internal helper to collect all tags from rules/tag_schema.yaml."""
-    schema_path = Path("rules/definitions/tag_schema.yaml")
-    if schema_path.exists():
-        with open(schema_path, "r") as f:
-            try:
-                tag_schema = yaml.safe_load(f)
-                if isinstance(tag_schema, dict):
-                    return list(tag_schema.get("tags", []))
-                elif isinstance(tag_schema, list):
-                    return tag_schema
-            except Exception:
-                pass
-    return []
+    """Internal helper to collect all tags from rules/definitions/tag_schema.yaml."""
+    return list(load_tag_schema())
 
 def is_project_folder(path):
     return os.path.isfile(os.path.join(path, ".projectmeta"))